@@ -0,0 +1,50 @@
+"""Benchmark of the per-round latency of big boards.
+
+To run the benchmark, enter 'python3 -m benchmarks.bench_big_board' in terminal,
+optionally followed by the board sizes, e.g. 'python3 -m benchmarks.bench_big_board 1000 10000'.
+"""
+import random
+import sys
+import time
+from typing import Dict, Sequence
+
+import numpy as np
+
+from graph_game.game.game_logic import GraphGame
+
+
+def play_round(size: int) -> Dict[str, float]:
+    """Time each stage of a round on a big board of the given size, in seconds."""
+    timings = {}
+    start = time.perf_counter()
+
+    game = GraphGame.random_start(size=size)
+    timings['generate'] = time.perf_counter() - start
+
+    game.prepare(layout=False)
+    game.set_base_score(10)
+    game.set_starting_node(random.randint(1, size))
+    game.generate_cutoff()
+    game.score_all_nodes()
+    timings['start node'] = time.perf_counter() - start - sum(timings.values())
+
+    game.set_ending_node(random.choice([node for node in (1, size) if node != game.starting_node]))
+    game.resolve_round()
+    timings['resolve'] = time.perf_counter() - start - sum(timings.values())
+
+    timings['total'] = time.perf_counter() - start
+    return timings
+
+
+def main(sizes: Sequence[int] = (1000, 10000, 100000), rounds: int = 3) -> None:
+    random.seed(0)
+    np.random.seed(0)
+    print(f'{"nodes":>8} {"generate":>10} {"start node":>11} {"resolve":>9} {"total":>9}  (median ms of {rounds} rounds)')
+    for size in sizes:
+        results = [play_round(size) for _ in range(rounds)]
+        medians = {stage: np.median([result[stage] for result in results]) * 1e3 for stage in results[0]}
+        print(f'{size:>8} {medians["generate"]:>10.1f} {medians["start node"]:>11.1f} {medians["resolve"]:>9.1f} {medians["total"]:>9.1f}')
+
+
+if __name__ == '__main__':
+    main([int(size) for size in sys.argv[1:]] or (1000, 10000, 100000))
@@ -0,0 +1,24 @@
+"""Micro-benchmark of the edge weight generation.
+
+To run the benchmark, enter 'python3 -m benchmarks.bench_edge_weights' in terminal.
+"""
+import timeit
+
+from graph_game.game.score_generation import EdgeWeightSampler, RandomScoreGenerator
+
+
+def main(number: int = 1_000_000) -> None:
+    scalar = timeit.timeit(lambda: RandomScoreGenerator.generate_random_edge(5, 3), number=number // 20) / (number // 20)
+    print(f'generate_random_edge:        {scalar * 1e9:8.1f} ns/weight')
+
+    sampler = EdgeWeightSampler(5, 3)
+    buffered = timeit.timeit(sampler, number=number) / number
+    print(f'EdgeWeightSampler():         {buffered * 1e9:8.1f} ns/weight')
+
+    vectorised = timeit.timeit(lambda: sampler.sample(number), number=1) / number
+    print(f'EdgeWeightSampler.sample(n): {vectorised * 1e9:8.1f} ns/weight')
+    print(f'speed-up of the buffer: {scalar / buffered:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""Benchmark of the latency of switching between the frames of the app, with a large leaderboard and history.
+
+The app runs on the in-memory backend with many registered players and a long history of the current player,
+and navigates from the main menu to every frame and back. The latency of each switch, from the call of
+switch_frame until the window has been redrawn, is recorded by the app in switch_latencies. Needs a display.
+
+To run the benchmark, enter 'python3 -m benchmarks.bench_frame_switch' in terminal,
+optionally followed by the number of players and of switches, e.g. 'python3 -m benchmarks.bench_frame_switch 10000 50'.
+"""
+from collections import defaultdict
+import os
+import sys
+
+# Keep the players in memory and run without audio, the config is read when the app is imported
+os.environ.setdefault('GRAPH_GAME_STORAGE_BACKEND', 'memory')
+os.environ.setdefault('GRAPH_GAME_AUDIO', '0')
+
+import tkinter as tk
+
+import numpy as np
+
+from graph_game.database import credentials
+
+ROUTES = (('menu', 'leaderboard'), ('leaderboard', 'menu'), ('menu', 'history'), ('history', 'menu'),
+          ('menu', 'play'), ('play', 'menu'))
+
+
+def main(players: int = 5000, switches: int = 20) -> None:
+    from graph_game.app import GraphGameGUI
+
+    # Hash the passwords cheaply, the benchmark measures the switches rather than the registrations
+    credentials.configure(scrypt_n=16)
+    try:
+        app = GraphGameGUI()
+    except tk.TclError:
+        print('frame switch: skipped, the app could not be started (no display?)')
+        return
+
+    for player in range(players):
+        app.backend.register_player(f'player{player}', 'password', player)
+    for game in range(1000):
+        app.backend.log_game('player0', 10, 1, 2, 'win', game)
+    app.current_player, app.current_balance = 'player0', 0
+
+    app.switch_frame('login', 'menu')
+    app.update()
+    latencies = defaultdict(list)
+    for _ in range(switches):
+        for current_frame, new_frame in ROUTES:
+            app.switch_frame(current_frame, new_frame)
+            # Process the redraw, after which the app records the latency of the switch
+            app.update()
+            latencies[current_frame, new_frame].append(app.switch_latencies[-1][2])
+
+    print(f'{players} players, {switches} switches per route')
+    print(f'{"switch":>22} {"mean":>8} {"p99":>8}  (ms)')
+    for (current_frame, new_frame), values in latencies.items():
+        mean, p99 = np.mean(values) * 1e3, np.percentile(values, 99) * 1e3
+        print(f'{current_frame + " -> " + new_frame:>22} {mean:>8.2f} {p99:>8.2f}')
+
+    app.service.round_pool.close()
+    app.destroy()
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:3]))
@@ -0,0 +1,52 @@
+"""Benchmark of the latency of redrawing the board of a round, with and without the render cache.
+
+To run the benchmark, enter 'python3 -m benchmarks.bench_redraw' in terminal,
+optionally followed by the board sizes, e.g. 'python3 -m benchmarks.bench_redraw 10 1000'.
+"""
+import random
+import sys
+import timeit
+from typing import Sequence
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+import numpy as np
+
+from graph_game.game.game_logic import GraphGame
+from graph_game.renderer import BoardRenderer
+
+
+def start_round(size: int) -> GraphGame:
+    """Generate a game of the given size with the starting and ending nodes chosen."""
+    game = GraphGame.random_start(size=size if size > 10 else None)
+    game.prepare()
+    game.set_base_score(10)
+    nodes = game.get_nodes()
+    game.set_starting_node(nodes[0])
+    game.set_ending_node(nodes[-1])
+    game.generate_cutoff()
+    return game
+
+
+def main(sizes: Sequence[int] = (10, 1000, 10000), number: int = 20) -> None:
+    random.seed(0)
+    np.random.seed(0)
+    print(f'{"nodes":>8} {"stage":>8} {"full redraw":>12} {"cached":>9} {"cache miss":>11}  (mean ms)')
+    for size in sizes:
+        game = start_round(size)
+        renderer = BoardRenderer()
+        canvas = FigureCanvasAgg(renderer.fig)
+        for stage, with_node_scores, result in (('board', False, False), ('scores', True, False), ('result', True, True)):
+            renderer.render(game, with_node_scores=with_node_scores, result=result)
+            full = timeit.timeit(canvas.draw, number=number) / number
+
+            def miss():
+                renderer.cache.bitmaps.clear()
+                renderer.draw(canvas)
+
+            cache_miss = timeit.timeit(miss, number=number) / number
+            cached = timeit.timeit(lambda: renderer.draw(canvas), number=number) / number
+            print(f'{size:>8} {stage:>8} {full * 1e3:>12.1f} {cached * 1e3:>9.1f} {cache_miss * 1e3:>11.1f}')
+
+
+if __name__ == '__main__':
+    main([int(size) for size in sys.argv[1:]] or (10, 1000, 10000))
@@ -0,0 +1,43 @@
+"""Micro-benchmark of RandomScoreGenerator.calculate_score.
+
+To run the benchmark, enter 'python3 -m benchmarks.bench_score_generation' in terminal.
+"""
+import timeit
+
+import numpy as np
+
+from graph_game.game.score_generation import RandomScoreGenerator
+
+
+def scipy_calculate_score(generator: RandomScoreGenerator, dist: int) -> int:
+    """The previous implementation of calculate_score, building a frozen scipy distribution per call."""
+    from scipy import stats
+
+    norm_distribution = stats.norm(generator._mean, generator._sd)
+    prob = 1 - norm_distribution.cdf(dist)
+    return int(np.exp(1 / prob) + generator.base_score / 2)
+
+
+def main(number: int = 2000) -> None:
+    generator = RandomScoreGenerator(base_score=100)
+    generator.set_mean(15)
+    generator.set_sd(12.5)
+    generator.calculate_score(0)
+
+    closed_form = timeit.timeit(lambda: generator.calculate_score(20), number=number) / number
+    print(f'calculate_score (closed form): {closed_form * 1e6:8.2f} us/call')
+
+    try:
+        import scipy  # noqa: F401
+    except ImportError:
+        print('scipy is not installed, skipping the scipy baseline')
+        return
+
+    scipy_calculate_score(generator, 20)
+    baseline = timeit.timeit(lambda: scipy_calculate_score(generator, 20), number=number) / number
+    print(f'calculate_score (scipy.stats): {baseline * 1e6:8.2f} us/call')
+    print(f'speed-up: {baseline / closed_form:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+"""Load test of the game server, reporting the p50 and p99 latency of a round played by many concurrent players.
+
+The server runs in its own process on an in-memory backend. Each player logs in on a keep-alive connection
+and plays its rounds back to back; the latency of a round spans its /rounds, /bet and /settle requests.
+
+To run the benchmark, enter 'python3 -m benchmarks.bench_server_load' in terminal,
+optionally followed by options, e.g. 'python3 -m benchmarks.bench_server_load --players 1000 --rounds 5'.
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import time
+from typing import List, Tuple
+
+import numpy as np
+
+from graph_game.database import credentials
+from graph_game.database.backends import InMemoryBackend
+from graph_game.game.round_pool import RoundPool
+from graph_game.game.service import GameService
+from graph_game.server import GameServer, serve
+
+PASSWORD = 'password'
+
+
+def run_server(players: int, processes: int, board_size: int, ports: multiprocessing.Queue) -> None:
+    """Register the players in memory and serve them on a free port, sent back through the queue."""
+    # Hash the passwords cheaply, the benchmark measures the rounds rather than the logins
+    credentials.configure(scrypt_n=16)
+    backend = InMemoryBackend()
+    backend.initialize()
+    for player in range(players):
+        backend.register_player(f'player{player}', PASSWORD, 10 ** 6)
+
+    # Serve until the benchmark terminates the process, which closes the server and its process pool
+    server = GameServer(GameService(backend, RoundPool(depth=0)), processes=processes, board_size=board_size)
+    asyncio.run(serve('127.0.0.1', 0, server, lambda listener: ports.put(listener.sockets[0].getsockname()[1])))
+
+
+async def request(reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                  path: str, body: dict, token: str | None = None) -> dict:
+    """Send a POST request on a keep-alive connection and return the JSON body of the response."""
+    data = json.dumps(body).encode()
+    auth = f"Authorization: Bearer {token}\r\n" if token else ''
+    writer.write(f"POST {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(data)}\r\n{auth}\r\n".encode() + data)
+
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while (line := await reader.readline()) != b'\r\n':
+        name, _, value = line.decode().partition(':')
+        if name.lower() == 'content-length':
+            length = int(value)
+    response = json.loads(await reader.readexactly(length))
+    if status != 200:
+        raise RuntimeError(f"POST {path} failed with {status}: {response}")
+    return response
+
+
+async def login(port: int, player: int) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter, str]:
+    """Open a keep-alive connection for a player and log in, returning the connection and the token."""
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    token = (await request(reader, writer, '/login', {'username': f'player{player}', 'password': PASSWORD}))['token']
+    return reader, writer, token
+
+
+async def play(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, token: str, rounds: int) -> List[float]:
+    """Play the rounds of a player back to back, returning the latency of each round in seconds."""
+    latencies = []
+    for _ in range(rounds):
+        began = time.perf_counter()
+        nodes = (await request(reader, writer, '/rounds', {}, token))['nodes']
+        await request(reader, writer, '/bet', {'bid': 1, 'starting_node': nodes[0]}, token)
+        await request(reader, writer, '/settle', {'ending_node': nodes[-1]}, token)
+        latencies.append(time.perf_counter() - began)
+    return latencies
+
+
+async def load(port: int, players: int, rounds: int) -> Tuple[np.ndarray, float]:
+    """Log all the players in, then let them play at once, returning the round latencies and the elapsed seconds."""
+    connections = await asyncio.gather(*(login(port, player) for player in range(players)))
+    began = time.perf_counter()
+    try:
+        results = await asyncio.gather(*(play(reader, writer, token, rounds) for reader, writer, token in connections))
+    finally:
+        for _, writer, _ in connections:
+            writer.close()
+    return np.array([latency for latencies in results for latency in latencies]), time.perf_counter() - began
+
+
+def main(players: int = 200, rounds: int = 5, processes: int = 1, board_size: int = 0) -> None:
+    ports = multiprocessing.Queue()
+    server = multiprocessing.Process(target=run_server, args=(players, processes, board_size, ports))
+    server.start()
+    try:
+        port = ports.get(timeout=60)
+        latencies, elapsed = asyncio.run(load(port, players, rounds))
+    finally:
+        server.terminate()
+        server.join()
+
+    p50, p99 = np.percentile(latencies, [50, 99]) * 1e3
+    print(f'{players} players x {rounds} rounds on {"classic" if not board_size else board_size} boards, '
+          f'{processes} game processes')
+    print(f'{len(latencies) / elapsed:.0f} rounds/s, p50 {p50:.1f} ms, p99 {p99:.1f} ms, max {latencies.max() * 1e3:.1f} ms')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Load test the game server.')
+    parser.add_argument('--players', type=int, default=200)
+    parser.add_argument('--rounds', type=int, default=5)
+    parser.add_argument('--processes', type=int, default=1, help='The processes generating the games, 0 uses the thread pool')
+    parser.add_argument('--board-size', type=int, default=0, help='The number of nodes of the boards, 0 for the classic game')
+    args = parser.parse_args()
+    main(args.players, args.rounds, args.processes, args.board_size)
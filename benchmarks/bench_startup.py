@@ -0,0 +1,60 @@
+"""Benchmark of the startup time of the app.
+
+Reports the slowest imports of 'python -X importtime -c "import graph_game.app"'
+and the wall clock time from launch to the first frame, which needs a display.
+
+To run the benchmark, enter 'python3 -m benchmarks.bench_startup' in terminal.
+"""
+import os
+import subprocess
+import sys
+from typing import List, Tuple
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Launch the app, show the first frame and exit, printing the elapsed seconds
+FIRST_FRAME_CODE = '''
+import time
+start = time.perf_counter()
+from graph_game.app import GraphGameGUI
+app = GraphGameGUI()
+app.update()
+print(time.perf_counter() - start)
+app.destroy()
+'''
+
+
+def import_times() -> List[Tuple[int, str]]:
+    """Import the app with -X importtime and get the cumulative microseconds of each module, slowest first."""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import graph_game.app'],
+                            cwd=PROJECT_ROOT, capture_output=True, text=True, check=True)
+    times = []
+    for line in result.stderr.splitlines():
+        # Lines look like 'import time:   self [us] |  cumulative | imported package'
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, module = line.split('|')
+        times.append((int(cumulative), module.rstrip()))
+    return sorted(times, reverse=True)
+
+
+def main(top: int = 10) -> None:
+    times = import_times()
+    total = next(cumulative for cumulative, module in times if module.strip() == 'graph_game.app')
+    print(f'import graph_game.app: {total / 1e3:8.1f} ms')
+    for cumulative, module in times[:top]:
+        print(f'  {cumulative / 1e3:8.1f} ms {module}')
+
+    heavy = [module for module in ('matplotlib', 'networkx', 'pygame', 'scipy')
+             if any(name.strip() == module for _, name in times)]
+    print(f'heavy libraries imported at startup: {", ".join(heavy) or "none"}')
+
+    result = subprocess.run([sys.executable, '-c', FIRST_FRAME_CODE], cwd=PROJECT_ROOT, capture_output=True, text=True)
+    if result.returncode:
+        print('launch to first frame: skipped, the app could not be started (no display?)')
+    else:
+        print(f'launch to first frame: {float(result.stdout) * 1e3:8.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
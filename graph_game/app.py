@@ -1,25 +1,64 @@
+from collections import deque
+from collections.abc import Mapping
+from functools import partial
+import logging
 import os
+import random
+import time
+from typing import Callable, Dict, Iterator
 
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from matplotlib.figure import Figure
-import networkx as nx
-import pygame
 import tkinter as tk
-from tkinter import ttk
-
-from .database.database import (
-    authenticate, 
-    get_player_history, 
-    initialize_database, 
-    log_game, 
-    registered,
-    register_player, 
-    update_balance
-)
+from tkinter import messagebox, ttk
+
+from . import config, events
+from .data_structures.paged_sequence import PagedSequence
+from .database.backends import get_backend
 from .game.game_logic import GraphGame
+from .game.round_pool import RoundPool
+from .game.service import GameService
 from .game.search_engine import SearchEngine
+from .sound import WIN_SOUNDS, AudioService
+from .table import VirtualTable
 
 # To run app.py, enter 'python3 -m graph_game.app' in terminal.
+# matplotlib and networkx are imported when they are first used, and pygame by the audio service on a background thread,
+# so the login screen shows without them.
+
+logger = logging.getLogger(__name__)
+
+
+class FrameRegistry(Mapping):
+    """The frames of the app, each constructed and gridded into the same cell of the parent on its first access.
+
+    The frames are stacked in the cell and the shown frame is raised above the others, so a new frame is
+    lowered beneath the shown one until it is raised itself.
+
+    Methods:
+        created: Get a frame only if it has already been constructed.
+    """
+    def __init__(self, parent: tk.Misc, factories: Dict[str, Callable[[tk.Misc], tk.Frame]]) -> None:
+        """Register the frame classes by name without constructing them."""
+        self.parent = parent
+        self.factories = factories
+        self._frames = {}
+
+    def __getitem__(self, name: str) -> tk.Frame:
+        if name not in self._frames:
+            frame = self.factories[name](self.parent)
+            frame.grid(row=0, column=0, sticky='nsew')
+            frame.lower()
+            self._frames[name] = frame
+        return self._frames[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.factories)
+
+    def __len__(self) -> int:
+        return len(self.factories)
+
+    def created(self, name: str) -> tk.Frame | None:
+        """Get a frame only if it has already been constructed, so updating a frame never shown is skipped."""
+        return self._frames.get(name)
 
 
 class GraphGameGUI(tk.Tk):
@@ -29,61 +68,120 @@ class GraphGameGUI(tk.Tk):
         self.title('Graph Game')
         self.geometry('800x600')
         self['bg'] = 'white'
+        # Stretch the cell holding the stacked frames over the whole window
+        self.grid_rowconfigure(0, weight=1)
+        self.grid_columnconfigure(0, weight=1)
 
-        # Initialize the database
-        initialize_database()
+        # Initialize the storage backend selected in the config
+        self.backend = get_backend()
+        self.backend.initialize()
 
         # Create a variable for storing the current player and their score
         self.current_player = None
         self.current_balance = None
+        # Follow the balance of the current player stored by the backend
+        events.bus.subscribe(events.BALANCE_CHANGED, self.on_balance_changed)
 
-        # Initialize pygame mixer for music
-        pygame.mixer.init()
-        self.soundtrack_path = os.path.dirname(__file__) + '/audio/Menu_Audio.mp3'
-        pygame.mixer.music.load(self.soundtrack_path)
-        # Change the voulme of music
-        pygame.mixer.music.set_volume(0.5)
-        # Loop
-        pygame.mixer.music.play(-1)
+        # Load the music and the sounds in the background once the first frame is shown
+        self.audio = AudioService(enabled=config.AUDIO)
+        self.after_idle(self.audio.start)
 
         # Create the variable for controlling the music (stop or play)
         self.soundtrack_state = tk.BooleanVar(value=True)
 
-        # Create a frame dict
-        self.frames = {
-            'menu': MainMenu(self),
-            'play': Play(self),
-            'win': Win(self),
-            'lose': Lose(self),
-            'login': Login(self),
-            'register': Register(self),
-            'leaderboard' : Leaderboard(self),
-            'history' : PlayerHistory(self)
-        }
-
-        # Show main menu frame
-        self.frames['login'].pack(fill='both', expand=True)
+        # The game service is started by the first login, so the login screen shows before networkx is imported
+        self._service = None
+
+        # Register the frames, which are constructed when they are first shown
+        self.frames = FrameRegistry(self, {
+            'menu': MainMenu,
+            'play': Play,
+            'win': Win,
+            'lose': Lose,
+            'login': Login,
+            'register': Register,
+            'leaderboard' : Leaderboard,
+            'history' : PlayerHistory
+        })
+
+        # The widget focused in each frame when the player left it, restored when the frame is shown again
+        self.frame_focus = {}
+        # The last frame switches and their latencies in seconds, measured until the window has been redrawn
+        self.switch_latencies = deque(maxlen=100)
+
+        # Show the login frame
+        self.frames['login'].tkraise()
+
+    @property
+    def service(self):
+        """The game service playing the rounds, started on its first use with a pool preparing the games in the background."""
+        if self._service is None:
+            # Prepare the games of the next rounds in the background, on a big board if one is configured
+            round_pool = RoundPool(factory=partial(GraphGame.random_start, size=config.BOARD_SIZE or None))
+            # Play the rounds through the game service, the same one served over HTTP by graph_game.server
+            self._service = GameService(self.backend, round_pool)
+        return self._service
 
     def switch_soundtrack(self):
         """The method that pauses and unpauses the music according to the soundtrack_state variable."""
-        if self.soundtrack_state.get():
-            pygame.mixer.music.unpause()
-        else:
-            pygame.mixer.music.pause()
+        self.audio.set_music(self.soundtrack_state.get())
+
+    def on_balance_changed(self, username, balance):
+        """Update the balance of the current player when the backend publishes a change of it."""
+        if username == self.current_player:
+            self.current_balance = balance
+
+    def refresh_player_frames(self):
+        """Start a new game and load the history of the current player in the frames which have been shown."""
+        # Start preparing the games of the player's rounds while the menu is shown
+        self.service
+        play = self.frames.created('play')
+        if play:
+            play.restart_game()
+            # Update the max bid and the balance in the Play Frame
+            play.update_max_bid()
+            play.update_balance_label()
+
+        # Load the player's history from the db
+        history = self.frames.created('history')
+        if history:
+            history.load_player_history()
 
     def switch_frame(self, current_frame, new_frame):
-        """The method for navigating between frames."""
-        # Hide the current frame
-        self.frames[current_frame].pack_forget()
-        # Minimize the window
-        self.geometry('1x1')
-        # Update the window
-        self.update_idletasks()
-        # Restore the window size
-        self.geometry('800x600')
-        # Show the main menu frame
-        self.frames[new_frame].pack(fill='both', expand=True)
-        
+        """The method for navigating between frames.
+
+        The frames stay gridded in the same cell and keep their widgets and state while hidden, so switching
+        raises the new frame without changing the geometry of the window or laying the frames out again.
+        """
+        started = time.perf_counter()
+
+        # Remember the widget focused in the current frame
+        try:
+            focus = self.focus_get()
+        except KeyError:
+            # The popdown of a combobox has no Tk widget
+            focus = None
+        if focus is not None and str(focus).startswith(str(self.frames[current_frame]) + '.'):
+            self.frame_focus[current_frame] = focus
+
+        # Show the new frame above the others
+        frame = self.frames[new_frame]
+        frame.tkraise()
+        # Let the frame apply the changes published while it was hidden
+        if hasattr(frame, 'on_show'):
+            frame.on_show()
+        # Give the focus back to the widget the player left, or to the frame so no hidden widget keeps it
+        self.frame_focus.get(new_frame, frame).focus_set()
+
+        # Measure the latency once the redraw queued by the switch has run
+        self.after_idle(self.record_switch, current_frame, new_frame, started)
+
+    def record_switch(self, current_frame, new_frame, started):
+        """Record the latency of a frame switch, from the call of switch_frame until the window has been redrawn."""
+        latency = time.perf_counter() - started
+        self.switch_latencies.append((current_frame, new_frame, latency))
+        logger.debug("Switched from %s to %s in %.1f ms", current_frame, new_frame, latency * 1e3)
+
 
 class Login(tk.Frame):
     """The login page."""
@@ -127,22 +225,18 @@ class Login(tk.Frame):
         # Get the password from the entry box   
         password = self.password_Entry.get()
         # Authenticate the player
-        user = authenticate(username, password)
+        user = self.parent.backend.authenticate(username, password)
         if user:
             # Fetch the name and balance from the database
             name, balance = user
             self.parent.current_player = name
             self.parent.current_balance = balance
-            self.parent.frames['play'].restart_game()
-            # Load the player's history from the db
-            self.parent.frames['history'].load_player_history()
-            # Update the max bid in the Play Frame
-            self.parent.frames['play'].update_max_bid()
+            self.parent.refresh_player_frames()
             # Switch the frame from login to the menu
             self.parent.switch_frame('login', 'menu')
         else:
             # Show the error if the player was not found
-            tk.messagebox.showinfo("Error", "The player is not found.")
+            messagebox.showinfo("Error", "The player is not found.")
 
 
 class Register(tk.Frame):
@@ -196,33 +290,25 @@ class Register(tk.Frame):
 
         # Check whether the entry boxes are filled in.
         if not username or not password or not password_repeat:
-            tk.messagebox.showinfo("Error", "Please fill in all the information.")
+            messagebox.showinfo("Error", "Please fill in all the information.")
             return
         
         # Check if the passwords in the two entry boxes are the same
         if password == password_repeat:
-            if registered(username):
-                tk.messagebox.showinfo("Error", "The account has been registered.")
+            if self.parent.backend.registered(username):
+                messagebox.showinfo("Error", "The account has been registered.")
                 return 
 
             # Register player with its username, password and starting balance 100
-            register_player(username, password, 100)
+            self.parent.backend.register_player(username, password, 100)
             self.parent.current_player = username
             self.parent.current_balance = 100
-
-            # Update the leaderboard
-            self.parent.frames['leaderboard'].search_engine.fetch_all_users_to_trie()
-            self.parent.frames['leaderboard'].update_all_players()
             self.parent.switch_frame('register', 'menu')
 
-            self.parent.frames['play'].restart_game()
-            # Load the player's history from the db
-            self.parent.frames['history'].load_player_history()
-            # Update the max bid in the Play Frame
-            self.parent.frames['play'].update_max_bid()
+            self.parent.refresh_player_frames()
         else:
             # Raise an error if the passwords do not match
-            tk.messagebox.showinfo("Error", "Passwords do not match.")
+            messagebox.showinfo("Error", "Passwords do not match.")
 
         
 class MainMenu(tk.Frame):
@@ -268,15 +354,53 @@ class MainMenu(tk.Frame):
         soundtrack_switch.place(relx=0.93, rely=0.95, anchor='center')
 
 
+def updated_leaders(leaders, balances, num_leaders, get_leaders):
+    """Apply the new balances of some players to the shown leaders.
+
+    Notes:
+        If the table is full and a leader drops below the lowest shown balance,
+        the player replacing them is unknown, so the leaders are queried again.
+
+    Args:
+        leaders (list): The list of the username and the balance of the shown leaders, highest balance first.
+        balances (dict): A hashmap mapping the username to the new balance.
+        num_leaders (int): The number of leaders shown in the table.
+        get_leaders (callable): A callable querying the given number of leaders.
+
+    Returns:
+        The list of the username and the balance of the leaders.
+    """
+    shown = dict(leaders)
+    full = len(shown) >= num_leaders
+    lowest = min(shown.values(), default=0)
+    if full and any(username in shown and balance < lowest for username, balance in balances.items()):
+        return get_leaders(num_leaders)
+
+    # Players outside a full table only join it with a balance above the lowest shown balance
+    shown.update({username: balance for username, balance in balances.items()
+                  if username in shown or not full or balance > lowest})
+    return sorted(shown.items(), key=lambda player: -player[1])[:num_leaders]
+
+
 class Leaderboard(tk.Frame):
     """The leaderboard page which displays the player rank and their balances."""
+
+    # The number of top players shown
+    NUM_LEADERS = 100
+
     def __init__(self, parent):
         super().__init__(parent)
         self.parent = parent
         # Create an instance of the SearchEngine class
-        self.search_engine = SearchEngine()
+        self.search_engine = SearchEngine(self.parent.backend)
         # Get 100 top players from the database
-        self.players = self.search_engine.get_leaders(100)  
+        self.players = self.search_engine.get_leaders(self.NUM_LEADERS)
+
+        # The balances and the players published while the leaderboard was hidden, applied when it is shown
+        self.pending_balances = {}
+        self.pending_players = []
+        events.bus.subscribe(events.BALANCE_CHANGED, self.record_balance)
+        events.bus.subscribe(events.PLAYER_REGISTERED, self.record_player)
 
         # Set the background color to white
         self.configure(bg="white")
@@ -304,9 +428,10 @@ class Leaderboard(tk.Frame):
         self.search_entry.bind("<KeyRelease>", self.searching)
         self.search_entry.pack(side="top", padx=20, pady=(40, 0))  
 
-        # Create a treeview widget for the table
-        self.tree = ttk.Treeview(self, columns=("Place", "Name", "Score"), show="headings")
-        self.tree.pack(side="top", pady=(30, 0))
+        # Create a virtualised table, showing 10 rows of the players at a time
+        self.table = VirtualTable(self, columns=("Place", "Name", "Score"))
+        self.tree = self.table.tree
+        self.table.pack(side="top", pady=(30, 0))
 
         # Add Column headings
         self.tree.heading("Place", text="Place", anchor=tk.CENTER)
@@ -324,29 +449,55 @@ class Leaderboard(tk.Frame):
         self.style.configure("Treeview.Heading", font=('Helvetica', 30),rowheight=40)
         self.style.configure("Treeview.Row", font=('Helvetica', 30), rowheight=40)
 
-        # Add scrollbars if there are too much columns
-        self.y_scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.tree.yview)
-        self.y_scrollbar.pack(side="right", fill="y")
+        # Add a horizontal scrollbar if there are too much columns, the table has its own vertical scrollbar
         self.x_scrollbar = ttk.Scrollbar(self, orient="horizontal", command=self.tree.xview)
         self.x_scrollbar.pack(side="bottom", fill="x")
-
-        # Set scrollbars to the table
-        self.tree.configure(yscrollcommand=self.y_scrollbar.set, xscrollcommand=self.x_scrollbar.set)
+        self.tree.configure(xscrollcommand=self.x_scrollbar.set)
 
         # Call the function to set the values in the table
         self.update_treeview()
 
     def update_all_players(self):
         # Update all players in the treeview
-        self.players = self.search_engine.get_leaders(100)
+        self.players = self.search_engine.get_leaders(self.NUM_LEADERS)
         self.update_treeview()
 
+    def record_balance(self, username, balance):
+        """Record a balance published by the backend, the leaderboard is marked dirty until it is shown."""
+        self.pending_balances[username] = balance
+
+    def record_player(self, username, balance):
+        """Record a player registered in the backend, the leaderboard is marked dirty until it is shown."""
+        self.pending_players.append(username)
+        self.pending_balances[username] = balance
+
+    def on_show(self):
+        """Apply the balances and the players published while the leaderboard was hidden, without querying all players again."""
+        if not self.pending_balances:
+            return
+
+        # Make the new players searchable
+        for username in self.pending_players:
+            self.search_engine.trie.insert(username)
+
+        if self.showing_leaders():
+            self.players = updated_leaders(self.players, self.pending_balances, self.NUM_LEADERS, self.search_engine.get_leaders)
+        else:
+            # Only update the balances of the players in the search results
+            self.players = [(username, self.pending_balances.get(username, balance)) for username, balance in self.players]
+
+        self.pending_balances = {}
+        self.pending_players = []
+        self.update_treeview()
+
+    def showing_leaders(self):
+        """Check whether the leaders are shown, rather than the results of a search."""
+        search_text = self.search_entry.get().strip()
+        return not search_text or search_text.lower() == "search"
+
     def update_treeview(self):
-        # Delete all previous data in the treeview
-        self.tree.delete(*self.tree.get_children())
-        # Populate the treeview with all players initially
-        for i, row in enumerate(self.players):
-            self.tree.insert("", "end", values=(i + 1, *row), tags=("Treeview.Row", "Treeview", "Treeview.Heading"))
+        # Show the players with their place, only the rows which changed are updated in the table
+        self.table.set_rows([(i + 1, *row) for i, row in enumerate(self.players)])
 
     def text_search_if_empty(self, event):
         # If the entry box is empty, put the search text
@@ -365,9 +516,9 @@ class Leaderboard(tk.Frame):
         self.words_for_autocompletion = self.search_engine.complete_search(search_text)
         self.search_entry.config(values=self.words_for_autocompletion[:5])
     
-        if not search_text or search_text == "search": 
+        if self.showing_leaders():
             # If the search is empty, show all players 
-            self.players = self.search_engine.get_leaders(100)
+            self.players = self.search_engine.get_leaders(self.NUM_LEADERS)
         else:
             # Show the only players whose name starts with the letters in the search_entry
             self.players = self.search_engine.search_results(search_text)   
@@ -397,9 +548,9 @@ class PlayerHistory(tk.Frame):
         self.history_label = tk.Label(self, text="History", font="Helvetica 60", background="white")
         self.history_label.place(relx=0.5, rely=0.05, anchor='center')
     
-        # Create the treeview for storing the history of the player
-        self.history_tree = ttk.Treeview(self, columns=("Bid", "Start Node", "End Node", "Outcome", "Score", "Date"), 
-                                         show="headings")
+        # Create the virtualised table for the history of the player, showing 10 records at a time
+        self.history_table = VirtualTable(self, columns=("Bid", "Start Node", "End Node", "Outcome", "Score", "Date"))
+        self.history_tree = self.history_table.tree
         
         # Set column headings
         self.history_tree.heading("Bid", text="Bid")
@@ -423,24 +574,38 @@ class PlayerHistory(tk.Frame):
         self.style.configure("Treeview.Heading", font=('Helvetica', 20))
         self.style.configure("Treeview.Row", font=('Helvetica', 20))
 
-        # Add scrollbar
-        self.history_tree_scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.history_tree.yview)
-        self.history_tree.configure(yscrollcommand=self.history_tree_scrollbar.set)
-        
-        self.history_tree.pack(side="top", padx=10, pady=10, fill="both", expand=True)
-        self.history_tree_scrollbar.pack(side="right", fill="y")
+        self.history_table.pack(side="top", padx=10, pady=10, fill="both", expand=True)
+
+        # The games logged while the history was hidden, newest last, applied when it is shown
+        self.history = PagedSequence(lambda offset, limit: [], length=0)
+        self.pending_games = []
+        events.bus.subscribe(events.GAME_LOGGED, self.record_game)
+
+        # Load the history of the logged in player
+        if self.parent.current_player:
+            self.load_player_history()
 
     def load_player_history(self):
-        # Clear existing data
-        for item in self.history_tree.get_children():
-            self.history_tree.delete(item)
-        
-        # Get player history
-        history = get_player_history(self.parent.current_player) 
-        if history:
-            # Insert history into treeview
-            for bid, start, end, outcome, score, date in history:
-                self.history_tree.insert("", "end", values=(bid, start, end, outcome, score, date))
+        """Show the history of the player, fetched from the storage one page at a time while scrolling."""
+        backend, player = self.parent.backend, self.parent.current_player
+        # The number of games is read from the summary statistics of the player, without counting the history
+        stats = backend.get_player_stats(player)
+        self.history = PagedSequence(lambda offset, limit: backend.get_player_history(player, limit, offset),
+                                     length=stats.games_played if stats else 0)
+        self.pending_games = []
+        self.history_table.set_rows(self.history)
+
+    def record_game(self, username, record):
+        """Record a game of the current player logged by the backend, the history is marked dirty until it is shown."""
+        if username == self.parent.current_player:
+            self.pending_games.append(record)
+
+    def on_show(self):
+        """Show the games logged while the history was hidden at its top, without fetching the history again."""
+        if self.pending_games:
+            self.history.prepend(self.pending_games[::-1])
+            self.pending_games = []
+            self.history_table.set_rows(self.history)
     
     
 class Play(tk.Frame):
@@ -463,7 +628,7 @@ class Play(tk.Frame):
     def __init__(self, parent):
         super().__init__(parent)
         self.parent = parent
-        self.game = GraphGame.random_start()
+        self.new_round()
 
         # The variable for new game
         self.game_started = True
@@ -487,6 +652,7 @@ class Play(tk.Frame):
         self.balance_label = tk.Label(self, text='', bg='white', fg='black', font='Helvetica, 20')
         self.balance_label.place(relx=0.8, rely=0.05, anchor='center')
         self.update_balance_label()
+        events.bus.subscribe(events.BALANCE_CHANGED, self.update_balance_label)
 
         # Label Bid before the scale
         self.bid_label = tk.Label(self, text = "Bid:", bg='white', fg='black',
@@ -506,12 +672,14 @@ class Play(tk.Frame):
         # Starting node combobox
         self.starting_node_combobox = ttk.Combobox(self, width=5, state='disabled')
         # Fill the combobox with the values of the graph
-        self.starting_node_combobox['values'] = self.game.get_nodes()
+        self.starting_node_combobox['values'] = self.game.search_nodes()
         self.starting_node_combobox.place(relx=0.94, rely=0.46, anchor='center')
         # Bind the method update_starting_ending_node_combobox_state to the combobox
         self.starting_node_combobox.bind("<<ComboboxSelected>>", self.update_starting_ending_node_combobox_state)
         # Bind the same method but as Focus Out to always check if the starting node combobox value was not deleted
         self.starting_node_combobox.bind("<FocusOut>", self.update_starting_ending_node_combobox_state)
+        # Filter the nodes in the dropdown by the typed index
+        self.starting_node_combobox.bind("<KeyRelease>", self.filter_node_combobox)
 
         # Starting node combobox label
         self.starting_node_combobox_label = tk.Label(self, text="Starting node:", bg='white', fg='black',
@@ -521,8 +689,9 @@ class Play(tk.Frame):
         # Ending node combobox
         self.ending_node_combobox = ttk.Combobox(self, width=5, state='disabled')
         # Fill the combobox with the values of the graph
-        self.ending_node_combobox['values'] = self.game.get_nodes()
+        self.ending_node_combobox['values'] = self.game.search_nodes()
         self.ending_node_combobox.place(relx=0.94, rely=0.57, anchor='center')
+        self.ending_node_combobox.bind("<KeyRelease>", self.filter_node_combobox)
 
         # Ending node combobox label
         self.Ending_node_combobox_Label = tk.Label(self, text="Ending node:", bg='white', fg='black',
@@ -539,14 +708,21 @@ class Play(tk.Frame):
                                command=self.bet_start_game)
         self.bet_button.pack(padx = (550,0), pady= (0,30), side = tk.BOTTOM)
 
-        self.canvas = tk.Canvas(self, width=530, height=480, bg="white")
-        self.canvas.place(relx=0.34, rely=0.59, anchor='center')
+        # Create the figure and its canvas once, every round is drawn on them
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from .renderer import BoardRenderer
+
+        self.renderer = BoardRenderer()
+        self.canvas = FigureCanvasTkAgg(self.renderer.fig, self)
+        self.canvas.get_tk_widget().place(relx=0.33, rely=0.60, anchor='center', width=600, height=500)
+        # Select the nodes by clicking them on the board
+        self.canvas.mpl_connect('button_press_event', self.select_clicked_node)
 
         self.update_plot()
 
-    def update_balance_label(self):
+    def update_balance_label(self, username=None, balance=None):
+        """Show the balance of the current player, called whenever the backend publishes a new balance."""
         self.balance_label.config(text="Balance: " + str(self.parent.current_balance))
-        self.balance_label.after(1000, self.update_balance_label)
 
     def update_bid_scale_combobox_state(self, event=None):
         """The method, which does not let the player choose the ending node if the starting was not chosen."""
@@ -561,10 +737,6 @@ class Play(tk.Frame):
             self.starting_node_combobox['state'] = 'normal'  
             # Disable bid_scale combobox
             self.bid_scale.configure(state='disabled')
-
-            # Set the base score for the score generator
-            base_score = self.bid_scale.get()
-            self.game.set_base_score(int(base_score))
     
     def update_starting_ending_node_combobox_state(self, event=None):
         """Method makes ending node combobox disabled if starting node combobox is not chosen."""
@@ -575,90 +747,75 @@ class Play(tk.Frame):
             # Disable the combobox
             self.ending_node_combobox['state'] = 'disabled'  
         else:
+            # Set the starting node for the graph game, if the typed index is a node of the graph
+            starting_node = self.starting_node_combobox.get()
+            if not self.is_node(starting_node):
+                self.starting_node_combobox_label.config(fg='red')
+                return
+            self.starting_node_combobox_label.config(fg='black')
+            # Place the bet once, the combobox also loses its focus after it has been disabled
+            if self.round.bid is None:
+                try:
+                    self.parent.service.place_bet(self.round, int(self.bid_scale.get()), int(starting_node))
+                except ValueError:
+                    self.bid_label.config(fg='red')
+                    return
+
             # Enable ending_node combobox
             self.ending_node_combobox['state'] = 'normal'  
             # Disable starting_node combobox
             self.starting_node_combobox['state'] = 'disable' 
 
-            # Set the starting node for the graph game
-            starting_node = self.starting_node_combobox.get()
-            self.game.set_starting_node(int(starting_node))
-
             # Update the plot with node scores
-            self.game.generate_cutoff()
             self.update_plot(with_node_scores=True)
 
-    def update_plot(self, with_node_scores=False, result=False):
-        """Update the graph each round of the game."""
-        # Create a matplotlib figure
-        self.fig = Figure(figsize=(3,3), dpi=200)
-        self.ax = self.fig.add_subplot(111)
-
-        # Drawing nodes of the graph
-        nx.draw_networkx_nodes(self.game.G, self.game.node_position, ax=self.ax, node_size=150)
-        nx.draw_networkx_labels(self.game.G, self.game.node_position, ax=self.ax, font_size=10)
-
-        # Draw edges of the nodes and set the width of each edge to be proportional to its weight
-        edge_width = list(nx.get_edge_attributes(self.game.G, 'weight').values())
-        nx.draw_networkx_edges(self.game.G, self.game.node_position, alpha=0.5, ax=self.ax, width=edge_width)
-
-        if with_node_scores:
-            if not self.game.starting_node or not self.game.score_generator:
-                raise NameError('The score_generator or the starting node have not been defined.')
-
-            # Get the shortest distances from the starting node to all other nodes
-            node_to_dist = self.game.shortest_path(starting_node=self.game.starting_node)
-
-            # Map the distance to each node to its score using the score_generator
-            for node, dist in node_to_dist.items():
-                node_to_dist[node] = self.game.score_generator.calculate_score(dist)
-
-            # Create score labels for the networkx graph visualization
-            label_pos = {}
-            for node, coords in self.game.node_position.items():
-                # Set the label to be 0.135 units above the original node position
-                label_pos[node] = (coords[0], coords[1] + 0.135)
-
-            nx.draw_networkx_labels(self.game.G, 
-                                    pos=label_pos,
-                                    ax=self.ax,
-                                    labels=node_to_dist,
-                                    font_size=4, 
-                                    font_weight='bold')
-            
-            # Expand the graph to accomodate the score labels
-            self.ax.set_ylim(tuple(i*1.2 for i in self.ax.get_ylim()))
-        
-        if result:
-            # Find the shortest distance between the starting node and the ending node
-            shortest_dist = self.game.shortest_path(self.game.starting_node, self.game.ending_node)
-        
-            # Find all the nodes between the shortest path using the nx library
-            path = nx.shortest_path(self.game.G, source=self.game.starting_node, target=self.game.ending_node)
-            path_edges = list(zip(path,path[1:]))
+    def filter_node_combobox(self, event):
+        """Show the nodes whose index starts with the typed text, or lies in a typed range such as 100-200, in the dropdown."""
+        event.widget['values'] = self.game.search_nodes(event.widget.get())
 
-            # Draw the edges between in green if the player wins, red otherwise
-            if shortest_dist < self.game.cutoff_distance:
-                nx.draw_networkx_edges(self.game.G, self.game.node_position, ax=self.ax, edgelist=path_edges, edge_color='g', width=3)
-            else:
-                nx.draw_networkx_edges(self.game.G, self.game.node_position, ax=self.ax, edgelist=path_edges, edge_color='r', width=3)
+    def select_clicked_node(self, event):
+        """Select the node clicked on the board in the starting node combobox, or else in the ending node combobox."""
+        node = self.renderer.node_at(event.x, event.y)
+        if node is None:
+            return
 
-            edge_labels = nx.get_edge_attributes(self.game.G, 'weight')
-            nx.draw_networkx_edge_labels(self.game.G, self.game.node_position, edge_labels, ax=self.ax, font_size=4)
-            
-        # Draw the figure on the canvas
-        self.canvas = FigureCanvasTkAgg(self.fig, self)
-        self.canvas.draw() 
-        self.canvas.get_tk_widget().place(relx=0.33, rely=0.60, anchor='center', width=600, height=500)
+        if str(self.starting_node_combobox['state']) == 'normal':
+            self.starting_node_combobox.set(node)
+            self.update_starting_ending_node_combobox_state()
+        elif str(self.ending_node_combobox['state']) == 'normal' and node != self.game.starting_node:
+            self.ending_node_combobox.set(node)
+
+    def is_node(self, text):
+        """Check whether the text selected or typed in a combobox is the index of a node in the graph."""
+        # Only decimal digits are parsed by int, e.g. '²' is a digit but not an index
+        return text.isdecimal() and int(text) in self.game.node_map
+
+    def update_plot(self, with_node_scores=False, result=False):
+        """Update the graph each round of the game.
+
+        The board is only redrawn when a new round starts, the node scores and the result path are
+        overlays updated in place on the same figure and drawn onto the cached bitmap of the board.
+        """
+        self.renderer.render(self.game, with_node_scores=with_node_scores, result=result)
+        self.renderer.draw(self.canvas)
 
     # Function to update the maximum value of the bid scale
     def update_max_bid(self):
         self.bid_scale.config(to=self.parent.current_balance)
 
+    def new_round(self):
+        """Start a new round of the current player on a game prepared by the round pool."""
+        self.round = self.parent.service.start_round(self.parent.current_player)
+        self.game = self.round.game
+        # The service gives extra points to a player whose balance is less than one
+        if self.round.topped_up:
+            # Raise an alert
+            messagebox.showinfo(title="Broke", message=f"Your balance is less than 1, here are {GameService.TOP_UP_BALANCE} extra score")
+
     def restart_game(self):
         """Re-generate a new game and clean up previous entries."""
-        # Start the new game
-        self.game = GraphGame.random_start()
+        # Start the new game prepared by the round pool
+        self.new_round()
         self.update_plot(result=False)  
         self.game_started = True
 
@@ -670,8 +827,8 @@ class Play(tk.Frame):
         self.bid_scale['state'] = 'normal' 
 
         # Update the values of starting end ending node comboboxes as there is a new graph  
-        self.starting_node_combobox['values'] = self.game.get_nodes()
-        self.ending_node_combobox['values'] = self.game.get_nodes()
+        self.starting_node_combobox['values'] = self.game.search_nodes()
+        self.ending_node_combobox['values'] = self.game.search_nodes()
 
         # Clear the values of the comboboxes
         self.starting_node_combobox.set('') 
@@ -685,14 +842,6 @@ class Play(tk.Frame):
         # Update the generated distance label of the game 
         self.generated_distance_variable.set('Generated distance: -')        
 
-        # Check if the player balance is less than one and give the player extra points
-        if(self.parent.current_balance < 1):
-            # Raise an alert
-            tk.messagebox.showinfo(title="Broke", message="Your balance is less than 1, here are 50 extra score")
-            # Update the new score in the database and in game
-            update_balance(self.parent.current_player, 50)
-            self.parent.current_balance = 50
-
     def bet_start_game(self):
         """A method that gets the input nodes and bid after the bet button was pressed and handle the play again button press."""
         if self.game_started:
@@ -709,44 +858,52 @@ class Play(tk.Frame):
             else:
                 self.bid_label.config(fg='black')
 
-            # Check if the starting noded was selected, if it not, paint the label red
+            # Get the selected nodes, compared by their indices so a node typed as '05' is the node '5'
             starting_node = self.starting_node_combobox.get()
-            if (not starting_node 
-                or self.starting_node_combobox.get() == self.ending_node_combobox):
+            ending_node = self.ending_node_combobox.get()
+            same_nodes = self.is_node(starting_node) and self.is_node(ending_node) and int(starting_node) == int(ending_node)
+
+            # Check if the starting noded was selected, if it not, paint the label red
+            if not starting_node or self.round.bid is None or same_nodes:
                 self.starting_node_combobox_label.config(fg='red')
                 all_inputs_valid = False
             else:
                 self.starting_node_combobox_label.config(fg='black')
 
-            # Check if the ending node was selected and get its value
-            ending_node = self.ending_node_combobox.get()
-
             # Check if the ending noded was selected, if it not, paint the label red
-            if( not ending_node 
-               or self.starting_node_combobox.get() == self.ending_node_combobox.get()):
+            if not self.is_node(ending_node) or same_nodes:
                 self.Ending_node_combobox_Label.config(fg='red')
                 all_inputs_valid = False
             else:
                 self.Ending_node_combobox_Label.config(fg='black')
-                self.game.set_ending_node(int(ending_node))
-
-            # If all inputs are valid -> proceed with the game logic
-            if all_inputs_valid:
-                score = self.game.get_player_score()
-
-                # Check if the player wins
-                if(self.game.check_player_wins()):
-                    # Set the amount of winning label
-                    self.parent.frames['win'].amount_of_winning_variable.set("Amount of winning: " + str(score))
-                    # Go to the winning frame
-                    self.parent.switch_frame('play', 'win')
-                else:
-                    score*=-1
-                    # Set the amount of losing label
-                    self.parent.frames['lose'].amount_of_lose_variable.set("You lost: " + str(score)) 
-                    score*=-1
-                    # Go to the losing frame
-                    self.parent.switch_frame('play', 'lose')
+
+            # Wait for the player to fix the highlighted inputs
+            if not all_inputs_valid:
+                return
+
+            # Resolve the round, then update the player's balance and record the game to the history in one transaction.
+            # The balance, the leaderboard and the history are updated by the events published by the backend
+            try:
+                round_result = self.parent.service.settle(self.round, int(ending_node)).result
+            except ValueError:
+                # The service rejected the ending node, e.g. a round which has already been settled
+                self.Ending_node_combobox_Label.config(fg='red')
+                return
+            score = round_result.score
+
+            # Check if the player wins
+            if round_result.won:
+                # Play a happy sound, if the sounds have been loaded
+                self.parent.audio.play(random.choice(WIN_SOUNDS))
+                # Set the amount of winning label
+                self.parent.frames['win'].amount_of_winning_variable.set("Amount of winning: " + str(score))
+                # Go to the winning frame
+                self.parent.switch_frame('play', 'win')
+            else:
+                # Set the amount of losing label
+                self.parent.frames['lose'].amount_of_lose_variable.set("You lost: " + str(-score)) 
+                # Go to the losing frame
+                self.parent.switch_frame('play', 'lose')
 
             # Update the graph to see the results
             self.update_plot(result=True, with_node_scores=True)
@@ -767,22 +924,7 @@ class Play(tk.Frame):
             self.bid_scale['state'] = 'disabled' 
 
             # Update the generated distance label of the game 
-            self.generated_distance_variable.set('Generated distance: ' + str(self.game.cutoff_distance))
-            
-            self.parent.current_balance += score
-            # Update player's balance in db ...
-            update_balance(self.parent.current_player, self.parent.current_balance)
-
-            # Update the leaderboard
-            self.parent.frames['leaderboard'].searching(event=None)
-        
-
-            # Record the game to the history
-            outcome = 'win' if self.game.check_player_wins() else 'loss'
-            log_game(self.parent.current_player, int(bid_amount), int(starting_node), int(ending_node), outcome, score)
-
-            # Update the player history
-            self.parent.frames['history'].load_player_history()
+            self.generated_distance_variable.set('Generated distance: ' + str(round_result.cutoff))
 
         else:
             self.restart_game()
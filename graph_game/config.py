@@ -0,0 +1,39 @@
+"""Runtime configuration of the Graph Game.
+
+Every setting can be overridden with an environment variable of the same name prefixed with 'GRAPH_GAME_',
+e.g. 'GRAPH_GAME_STORAGE_BACKEND=memory python -m graph_game.app'.
+"""
+import os
+
+
+def _env(name: str, default: str) -> str:
+    """Read a setting from the environment, falling back to its default value."""
+    return os.environ.get('GRAPH_GAME_' + name, default)
+
+
+# The storage backend of players, balances and game logs, either 'sqlite' or 'memory'
+STORAGE_BACKEND = _env('STORAGE_BACKEND', 'sqlite')
+
+# The key derivation function used for hashing passwords, either 'scrypt' or 'pbkdf2_sha256'
+PASSWORD_HASH = _env('PASSWORD_HASH', 'scrypt')
+
+# The cost parameters of the password hashing, lower them only for tests and simulations
+SCRYPT_N = int(_env('SCRYPT_N', str(2 ** 14)))
+SCRYPT_R = int(_env('SCRYPT_R', '8'))
+SCRYPT_P = int(_env('SCRYPT_P', '1'))
+PBKDF2_ITERATIONS = int(_env('PBKDF2_ITERATIONS', '600000'))
+
+# The number of prepared games kept ready by the round pool, 0 builds every game on demand
+ROUND_POOL_DEPTH = int(_env('ROUND_POOL_DEPTH', '2'))
+
+# The number of nodes of the big board mode, 0 plays the classic game of 8 to 10 nodes
+BOARD_SIZE = int(_env('BOARD_SIZE', '0'))
+
+# Whether the soundtrack and the sound clips are played, 0 never loads pygame, e.g. for headless runs and CI
+AUDIO = _env('AUDIO', '1') != '0'
+
+# The seconds a session of the server is kept after the last request of its player
+SESSION_TTL = float(_env('SESSION_TTL', '1800'))
+
+# The number of processes generating the games of the server, 0 generates them on its thread pool
+SERVER_PROCESSES = int(_env('SERVER_PROCESSES', str(os.cpu_count() or 1)))
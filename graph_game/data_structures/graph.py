@@ -1,25 +1,41 @@
-from typing import Dict
+from typing import TYPE_CHECKING, Dict, Tuple
 
-import matplotlib.pyplot as plt
-import networkx as nx
 import random as rand
 
-from ..game.score_generation import RandomScoreGenerator as RSG
+import numpy as np
+
+from ..game.score_generation import EdgeWeightSampler
+from . import graph_io
 from .heap import MinHeap
 from .node import Node
 from .randomised_set import RandomisedSet
 
+if TYPE_CHECKING:
+    import networkx as nx
+
+
+# Graphs initialized with more nodes than this sample new edges by rejection instead of keeping the O(V²) set of unconnected edges
+RANDOMISED_SET_MAX_NODES = 256
+
+# Graphs with more nodes than this are laid out at random, as the spring layout does not scale to big boards
+SPRING_LAYOUT_MAX_NODES = 500
+
 
 class Graph:
     """A randomly generated undirected and fully connected graph data structure.
 
     Notes:
         Class attributes should not be directed accessed.
+        networkx and matplotlib are only imported when G, node_position or graph_visualize
+        are first used, so the graph can be generated and searched without them.
+        Graphs initialized with more than RANDOMISED_SET_MAX_NODES nodes are sparse: new edges are sampled
+        by rejection, so generating thousands of nodes takes O(V + E) time and memory.
 
     Attributes:
-        G: An instance of the Graph class of the networkx module.
-        node_position: The positions of each nodes in the networkx graph.
-        unconnected_edges: An instance of the RandomisedSet class storing all unconnected edges.
+        G: An instance of the Graph class of the networkx module, built on first access.
+        node_position: The positions of each nodes in the networkx graph, computed on first access.
+        sparse: Whether new edges are sampled by rejection instead of from the unconnected edges set.
+        unconnected_edges: An instance of the RandomisedSet class storing all unconnected edges, None for sparse graphs.
         node_map: A hashmap mapping the index of the node to its Node object.
         node_idx_count: An integer count for indexing new nodes.
         num_nodes: The total number of nodes in the graph.
@@ -32,6 +48,8 @@ class Graph:
         generate_random_edges: Generate a random number of weighted edges.
         add_edge_to_graph: Add an edge with random weight to the graph.
         shortest_path: Find the shortest path between 2 nodes.
+        save: Save the graph to a compact binary file.
+        load: A classmethod for loading a graph saved to a file.
         graph_visualize: Graphical visualization of the graph using matplotlib libary for testing.
     """
 
@@ -67,15 +85,17 @@ class Graph:
                edge_sd) < 0:
             raise ValueError("All input parameters must be non-negative")
         
-        self.G = nx.Graph()
-        self.node_position = None
-        self.unconnected_edges = RandomisedSet()
+        self._nx_graph = None
+        self._node_position = None
+        self.sparse = init_num_nodes > RANDOMISED_SET_MAX_NODES
+        self.unconnected_edges = None if self.sparse else RandomisedSet()
         self.node_map = {}
         self.node_idx_count = 1
         self.num_nodes = 0
         self.num_edges = 0
         self.edge_mean = edge_mean
         self.edge_sd = edge_sd
+        self._edge_weights = EdgeWeightSampler(edge_mean, edge_sd)
 
         self.generate_random_nodes(init_num_nodes)
         self.__randomly_connect_all_nodes()
@@ -90,6 +110,61 @@ class Graph:
         """
         return f'Graph: |E| = {self.num_edges}, |V| = {self.num_nodes}, E.x̄ = {self.edge_mean}, E.σ = {self.edge_sd}'
 
+    def __getstate__(self) -> Dict:
+        """Pickle the graph without its networkx graph, which is rebuilt on first access.
+
+        The linked Node objects are replaced by the neighbour indices and weights of each node, as pickling
+        them would recurse along the edges and exceed the recursion limit on big boards.
+        """
+        state = self.__dict__.copy()
+        state['_nx_graph'] = None
+        state['node_map'] = [(idx, [(neighbour.get_index(), weight) for neighbour, weight in node.get_neighbours()])
+                             for idx, node in self.node_map.items()]
+        return state
+
+    def __setstate__(self, state: Dict) -> None:
+        """Unpickle the graph, relinking its Node objects in their original neighbour order."""
+        adjacency = state.pop('node_map')
+        self.__dict__.update(state)
+        self.node_map = {idx: Node(idx) for idx, _ in adjacency}
+        for idx, neighbours in adjacency:
+            node = self.node_map[idx]
+            node.neighbours = {self.node_map[neighbour]: weight for neighbour, weight in neighbours}
+
+    @property
+    def G(self) -> 'nx.Graph':
+        """The networkx graph used for visualization, built from the node map on first access."""
+        if self._nx_graph is None:
+            import networkx as nx
+
+            self._nx_graph = nx.Graph()
+            self._nx_graph.add_nodes_from(self.node_map)
+            for idx, node in self.node_map.items():
+                for neighbour, weight in node.get_neighbours():
+                    # Each undirected edge is stored in both neighbour dictionaries
+                    if idx < neighbour.get_index():
+                        self._nx_graph.add_edge(idx, neighbour.get_index(), weight=weight)
+        return self._nx_graph
+
+    @property
+    def node_position(self) -> Dict[int, np.ndarray]:
+        """The positions of the nodes, assigned by the spring layout algorithm on first access.
+
+        Graphs with more than SPRING_LAYOUT_MAX_NODES nodes are laid out uniformly at random in the same square.
+        """
+        if self._node_position is None:
+            if self.num_nodes > SPRING_LAYOUT_MAX_NODES:
+                self._node_position = dict(zip(self.node_map, np.random.uniform(-1, 1, size=(self.num_nodes, 2))))
+            else:
+                import networkx as nx
+
+                self._node_position = nx.spring_layout(self.G)
+        return self._node_position
+
+    @node_position.setter
+    def node_position(self, position: Dict[int, np.ndarray] | None) -> None:
+        self._node_position = position
+
     def generate_random_nodes(self, 
                               num: int | None = None,
                               low: int = 10,
@@ -129,17 +204,20 @@ class Graph:
 
         # Generate nodes
         while num:
-            # Add the new node to the node map and the networkx graph
+            # Add the new node to the node map
             self.node_map[self.node_idx_count] = Node(self.node_idx_count)
-            self.G.add_node(self.node_idx_count)
 
             # Add all possible edges to the unconnected edges set
-            node_indices = list(self.node_map.keys())
-            self.unconnected_edges.add_edges_from_node(self.node_idx_count, node_indices)
+            if not self.sparse:
+                node_indices = list(self.node_map.keys())
+                self.unconnected_edges.add_edges_from_node(self.node_idx_count, node_indices)
 
             self.node_idx_count += 1
             num -= 1
 
+        # Rebuild the networkx visualization and the layout on their next access
+        self.__clear_visualization()
+
     def generate_random_edges(self,
                               num: int | None = None,
                               low: int = 5,
@@ -182,7 +260,7 @@ class Graph:
         # Generate edges while the number of edges in the graph has not reached the maximum
         while num and self.num_edges < max_num_edges:
             # Get the start and end node of the random edge
-            start, end = self.unconnected_edges.get_random_edge()
+            start, end = self.__get_random_unconnected_edge()
 
             # Add an edges between the 2 nodes
             self.add_edge_to_graph(start, end)
@@ -190,9 +268,6 @@ class Graph:
             # Decrease the remaining num of edges to be generated
             num -= 1
 
-        # Assigning a position for each node of the graph using the srping layout algorithm
-        self.node_position = nx.spring_layout(self.G)
-
     def add_edge_to_graph(self, idx1: int, idx2: int) -> None:
         """Add an edge to the graph with random integer weight from 1 to 10.
 
@@ -221,17 +296,17 @@ class Graph:
         end_node = self.node_map[idx2]
 
         # Randomly generate weight for the new edge
-        weight = RSG.generate_random_edge(mean=self.edge_mean, sd=self.edge_sd)
+        weight = self._edge_weights()
 
         # Set the nodes as their neighors
         start_node.add_neighbour(end_node, weight)
         end_node.add_neighbour(start_node, weight)
 
-        # Add the edge to the networkx visualization
-        self.G.add_edge(idx1, idx2, weight=weight)
+        # Rebuild the networkx visualization and the layout on their next access
+        self.__clear_visualization()
 
         # Remove the edge from the unconnected edges set
-        if (idx1, idx2) in self.unconnected_edges:
+        if not self.sparse and (idx1, idx2) in self.unconnected_edges:
             self.unconnected_edges.remove_edge_from_set(idx1, idx2)
 
         # Increase the num of edges in the graph
@@ -294,6 +369,59 @@ class Graph:
         del paths[starting_node]
         return paths
 
+    def save(self, path: str, with_positions: bool = True) -> None:
+        """Save the graph to a compact binary file, see graph_io for the layout.
+
+        Args:
+            path (str): The path of the file.
+            with_positions (bool): If True, the layout is saved too if it has been computed (default = True).
+        """
+        # Collect each undirected edge once, from the node with the lower index
+        edges = np.array([(idx, neighbour.get_index(), weight)
+                          for idx, node in self.node_map.items()
+                          for neighbour, weight in node.get_neighbours()
+                          if idx < neighbour.get_index()], dtype=np.int32).reshape(-1, 3)
+
+        positions = None
+        if with_positions and self._node_position is not None:
+            positions = np.array([self._node_position[idx] for idx in range(1, self.node_idx_count)])
+
+        graph_io.write_graph(path, self.node_idx_count - 1, edges, self.edge_mean, self.edge_sd, positions)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> 'Graph':
+        """Load a graph saved to a file.
+
+        Notes:
+            The edges are memory-mapped and the Node objects are only created when they are first accessed,
+            so loading takes no per-edge Python work. The loaded graph samples new edges by rejection.
+
+        Args:
+            path (str): The path of the file.
+            mmap (bool): If True, the edges are memory-mapped instead of read into memory (default = True).
+
+        Returns:
+            An object of the class with the nodes, edges and layout stored in the file.
+
+        Raises:
+            ValueError: Error caused by a file which is not a graph file.
+
+        To load:
+            graph = Graph.load('round.graph')
+        """
+        data = graph_io.read_graph(path, mmap=mmap)
+        graph = cls(edge_mean=data.edge_mean, edge_sd=int(data.edge_sd) if data.edge_sd.is_integer() else data.edge_sd)
+
+        graph.sparse = True
+        graph.unconnected_edges = None
+        graph.node_map = graph_io.LazyNodeMap(data.num_nodes, data.edges)
+        graph.node_idx_count = data.num_nodes + 1
+        graph.num_nodes = data.num_nodes
+        graph.num_edges = len(data.edges)
+        if data.positions is not None:
+            graph.node_position = dict(zip(range(1, data.num_nodes + 1), data.positions))
+        return graph
+
     def __get_max_num_edges(self) -> int:
         """Calculate the maximum number of edges can be connected in the graph.
 
@@ -303,6 +431,25 @@ class Graph:
         n = self.num_nodes
         return n * (n - 1) // 2
     
+    def __get_random_unconnected_edge(self) -> Tuple[int, int]:
+        """Get a random pair of unconnected nodes.
+
+        Notes:
+            Sparse graphs draw random pairs of nodes until an unconnected pair is found,
+            which takes O(1) expected draws while the graph is far from complete.
+
+        Returns:
+            A tuple of the indices of the 2 nodes.
+        """
+        if not self.sparse:
+            return self.unconnected_edges.get_random_edge()
+
+        while True:
+            idx1 = rand.randint(1, self.node_idx_count - 1)
+            idx2 = rand.randint(1, self.node_idx_count - 1)
+            if idx1 != idx2 and self.node_map[idx2] not in self.node_map[idx1].neighbours:
+                return idx1, idx2
+
     def __randomly_connect_all_nodes(self) -> None:
         """Randomly shuffle the list of nodes and connect them."""
         # Get the all the node indicies in the graph and shuffle them
@@ -316,20 +463,23 @@ class Graph:
             node2 = self.node_map[node_indices[i - 1]]
 
             # Generate the edge weight based on a normal distribution
-            weight = RSG.generate_random_edge(mean=self.edge_mean, sd=self.edge_sd)
+            weight = self._edge_weights()
 
             # Add the nodes to their neighbour dictionaries
             node1.add_neighbour(node2, weight=weight)
             node2.add_neighbour(node1, weight=weight)
 
-            # Add an edge in the networkx graph
-            self.G.add_edge(node_indices[i], node_indices[i - 1], weight=weight)
-
             # Remove the edge from the unconnected edges set
-            self.unconnected_edges.remove_edge_from_set(node_indices[i], node_indices[i - 1])
+            if not self.sparse:
+                self.unconnected_edges.remove_edge_from_set(node_indices[i], node_indices[i - 1])
             
             self.num_edges += 1
-            
+
+    def __clear_visualization(self) -> None:
+        """Clear the networkx graph and the layout after the graph changed."""
+        self._nx_graph = None
+        self._node_position = None
+
     def graph_visualize(self, with_labels=True, node_size=700) -> None:
         """Graphical visualization of the graph using matplotlib libary for testing.
 
@@ -337,6 +487,9 @@ class Graph:
             with_labels (bool): If True, nodes will show their ID as label.
             node_size (int): The size of the nodes.
         """
+        import matplotlib.pyplot as plt
+        import networkx as nx
+
         # Drawing nodes of the graph
         nx.draw_networkx_nodes(self.G, self.node_position, node_size=node_size)
         nx.draw_networkx_labels(self.G, self.node_position, font_size=12)
@@ -0,0 +1,193 @@
+"""A compact binary file format for graphs, loaded without per-edge Python work.
+
+Layout (little-endian):
+    header      64 bytes: magic, version, flags, number of nodes, number of edges, edge mean and edge sd
+    edges       int32 array of shape (num_edges, 3), one row (idx1, idx2, weight) per undirected edge
+    positions   float64 array of shape (num_nodes, 2), the layout of nodes 1..num_nodes (if FLAG_POSITIONS is set)
+
+The nodes of a graph are always indexed 1..num_nodes, so only their count is stored.
+"""
+from collections.abc import Mapping
+import struct
+from typing import Dict, Iterator, List, NamedTuple, Tuple
+
+import numpy as np
+
+from .node import Node
+
+
+MAGIC = b'GRAPHGM\0'
+VERSION = 1
+
+# The flag set when the file stores the positions of the nodes
+FLAG_POSITIONS = 1
+
+_HEADER = struct.Struct('<8sIIQQqd')
+HEADER_SIZE = 64
+
+
+class GraphData(NamedTuple):
+    """The contents of a graph file."""
+    num_nodes: int
+    edge_mean: int
+    edge_sd: float
+    edges: np.ndarray
+    positions: np.ndarray | None
+
+
+def write_graph(path: str,
+                num_nodes: int,
+                edges: np.ndarray,
+                edge_mean: int,
+                edge_sd: int | float,
+                positions: np.ndarray | None = None) -> None:
+    """Write a graph to a file.
+
+    Args:
+        path (str): The path of the file.
+        num_nodes (int): The number of nodes, indexed 1..num_nodes.
+        edges (np.ndarray): An integer array of shape (num_edges, 3) of the nodes and weight of each edge.
+        edge_mean (int): The mean weight of the generated edges.
+        edge_sd (int, float): The standard deviation of the weight of the generated edges.
+        positions (np.ndarray): A float array of shape (num_nodes, 2) of the node positions (optional).
+    """
+    edges = np.ascontiguousarray(edges, dtype='<i4').reshape(-1, 3)
+    flags = FLAG_POSITIONS if positions is not None else 0
+    header = _HEADER.pack(MAGIC, VERSION, flags, num_nodes, len(edges), edge_mean, float(edge_sd))
+
+    with open(path, 'wb') as file:
+        file.write(header.ljust(HEADER_SIZE, b'\0'))
+        file.write(edges.tobytes())
+        if positions is not None:
+            # Align the positions to 8 bytes so they can be memory-mapped as float64
+            file.write(b'\0' * (-file.tell() % 8))
+            file.write(np.ascontiguousarray(positions, dtype='<f8').reshape(num_nodes, 2).tobytes())
+
+
+def read_graph(path: str, mmap: bool = True) -> GraphData:
+    """Read a graph from a file.
+
+    Args:
+        path (str): The path of the file.
+        mmap (bool): If True, the edges and positions are memory-mapped instead of read into memory (default = True).
+
+    Returns:
+        A GraphData tuple of the graph.
+
+    Raises:
+        ValueError: Error caused by a file which is not a graph file of a supported version.
+    """
+    with open(path, 'rb') as file:
+        header = file.read(HEADER_SIZE)
+    if len(header) < HEADER_SIZE or header[:len(MAGIC)] != MAGIC:
+        raise ValueError(f"{path!r} is not a graph file")
+
+    _, version, flags, num_nodes, num_edges, edge_mean, edge_sd = _HEADER.unpack_from(header)
+    if version != VERSION:
+        raise ValueError(f"Unsupported graph file version {version}")
+
+    edges = _read_array(path, '<i4', HEADER_SIZE, (num_edges, 3), mmap)
+    positions = None
+    if flags & FLAG_POSITIONS:
+        offset = HEADER_SIZE + edges.nbytes
+        positions = _read_array(path, '<f8', offset + (-offset % 8), (num_nodes, 2), mmap)
+    return GraphData(num_nodes, edge_mean, edge_sd, edges, positions)
+
+
+def _read_array(path: str, dtype: str, offset: int, shape: Tuple[int, int], mmap: bool) -> np.ndarray:
+    """Memory-map or read an array stored at an offset of the file."""
+    if not shape[0]:
+        return np.empty(shape, dtype=dtype)
+    if mmap:
+        return np.memmap(path, dtype=dtype, mode='r', offset=offset, shape=shape)
+    return np.fromfile(path, dtype=dtype, count=shape[0] * shape[1], offset=offset).reshape(shape)
+
+
+class LazyNode(Node):
+    """A node of a loaded graph, whose neighbours are read from the edge arrays on first access."""
+
+    def __init__(self, idx: int, node_map: 'LazyNodeMap') -> None:
+        super().__init__(idx)
+        self._node_map = node_map
+        self._neighbours = None
+
+    @property
+    def neighbours(self) -> Dict[Node, int | float]:
+        """The dictionary mapping each neighbour to the weight of the edge, built on first access."""
+        if self._neighbours is None:
+            self._neighbours = self._node_map.neighbours_of(self.idx)
+        return self._neighbours
+
+    @neighbours.setter
+    def neighbours(self, neighbours: Dict[Node, int | float] | None) -> None:
+        self._neighbours = neighbours
+
+
+class LazyNodeMap(Mapping):
+    """The node map of a loaded graph, creating the Node object of an index on first access.
+
+    Notes:
+        The edge array is only turned into a compressed adjacency list, in vectorised numpy operations,
+        when the neighbours of a node are first needed. Nodes added after loading are stored as usual.
+
+    Methods:
+        neighbours_of: Build the neighbour dictionary of a node from the adjacency list.
+    """
+
+    def __init__(self, num_nodes: int, edges: np.ndarray) -> None:
+        """Construct the node map of nodes 1..num_nodes connected by the edges."""
+        self._num_nodes = num_nodes
+        self._edges = edges
+        self._nodes = {}
+        self._offsets = None
+        self._targets = None
+        self._weights = None
+
+    def __getitem__(self, idx: int) -> Node:
+        node = self._nodes.get(idx)
+        if node is None:
+            if not self.__is_stored(idx):
+                raise KeyError(idx)
+            node = self._nodes[idx] = LazyNode(int(idx), self)
+        return node
+
+    def __setitem__(self, idx: int, node: Node) -> None:
+        self._nodes[idx] = node
+
+    def __contains__(self, idx: object) -> bool:
+        return idx in self._nodes or self.__is_stored(idx)
+
+    def __iter__(self) -> Iterator[int]:
+        yield from range(1, self._num_nodes + 1)
+        yield from (idx for idx in self._nodes if not self.__is_stored(idx))
+
+    def __len__(self) -> int:
+        return self._num_nodes + sum(1 for idx in self._nodes if not self.__is_stored(idx))
+
+    def neighbours_of(self, idx: int) -> Dict[Node, int]:
+        """Build the neighbour dictionary of a stored node from the adjacency list.
+
+        Args:
+            idx (int): The index of the node.
+
+        Returns:
+            A dictionary mapping each neighbour node to the weight of the edge.
+        """
+        if self._offsets is None:
+            self.__build_adjacency()
+        start, end = self._offsets[idx], self._offsets[idx + 1]
+        neighbours: List[int] = self._targets[start:end].tolist()
+        return dict(zip(map(self.__getitem__, neighbours), self._weights[start:end].tolist()))
+
+    def __build_adjacency(self) -> None:
+        """Sort both directions of every edge by their source node into a compressed adjacency list."""
+        sources = np.concatenate([self._edges[:, 0], self._edges[:, 1]])
+        order = np.argsort(sources, kind='stable')
+        self._targets = np.concatenate([self._edges[:, 1], self._edges[:, 0]])[order]
+        self._weights = np.concatenate([self._edges[:, 2], self._edges[:, 2]])[order]
+        self._offsets = np.zeros(self._num_nodes + 2, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=self._num_nodes + 1), out=self._offsets[1:])
+
+    def __is_stored(self, idx: object) -> bool:
+        """Check whether the index is one of the nodes stored in the file."""
+        return isinstance(idx, (int, np.integer)) and 1 <= idx <= self._num_nodes
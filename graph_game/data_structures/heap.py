@@ -61,7 +61,7 @@ class MinHeap:
         parent = self.__get_parent_idx(curr)
         
         #Compare the new element with its parent to check if it is not bigger that its parent and swap if it is
-        while self.__heap[curr] < self.__heap[parent]:
+        while parent != -1 and self.__heap[curr] < self.__heap[parent]:
             self.__swap(curr, parent)
             curr = parent
             parent = self.__get_parent_idx(parent)
@@ -156,7 +156,7 @@ class MinHeap:
         Returns:
             An integer representing the index of the parent, or -1 if no parent is found.
         """
-        return idx // 2
+        return (idx - 1) // 2 if idx > 0 else -1
     
     def __get_left_child_idx(self, idx: int) -> int:
         """Get the left child of the element with index idx.
@@ -0,0 +1,108 @@
+from typing import Hashable, List, Sequence, Tuple
+
+import numpy as np
+
+
+class KDTree:
+    """A static k-d tree over points, finding the point nearest to a query point in O(log n) on average.
+
+    Notes:
+        The tree is implicit: the points are reordered so the median of every subrange along its splitting axis
+        is stored in the middle of the subrange, and no node objects are allocated. Subranges of at most
+        LEAF_SIZE points are scanned instead of split further.
+
+    Attributes:
+        dimensions: The number of coordinates of each point.
+        points: A list of the coordinates of the points, in the order of the tree.
+        ids: The identifiers of the points, in the order of the tree.
+
+    Methods:
+        nearest: Get the identifier of the point nearest to a query point and its distance.
+    """
+
+    # The maximum number of points scanned in a leaf of the tree
+    LEAF_SIZE = 8
+
+    def __init__(self, points: Sequence[Sequence[float]] | np.ndarray, ids: Sequence[Hashable] | None = None) -> None:
+        """Build the tree.
+
+        Args:
+            points (array-like): The n x k coordinates of the points.
+            ids (sequence): The identifiers of the points (default = None for the positions of the points).
+
+        Raises:
+            ValueError: Errors caused by points which are not a 2-dimensional array, or a number of ids
+                        different from the number of points.
+        """
+        points = np.asarray(points, dtype=float)
+        if points.ndim != 2:
+            raise ValueError("The points must be an n x k array")
+        ids = list(range(len(points))) if ids is None else list(ids)
+        if len(ids) != len(points):
+            raise ValueError("The number of ids must match the number of points")
+
+        self.dimensions = points.shape[1]
+        order = np.arange(len(points))
+        self.__build(points, order, 0, len(points), 0)
+        self.points: List[List[float]] = points[order].tolist()
+        self.ids = [ids[idx] for idx in order.tolist()]
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    def nearest(self, point: Sequence[float]) -> Tuple[Hashable, float]:
+        """Get the point nearest to a query point.
+
+        Args:
+            point (sequence): The k coordinates of the query point.
+
+        Returns:
+            A tuple of the identifier of the nearest point and its Euclidean distance to the query point.
+
+        Raises:
+            ValueError: Errors caused by an empty tree or a query point with the wrong number of coordinates.
+        """
+        if not self.points:
+            raise ValueError("The tree has no points")
+        query = [float(coord) for coord in point]
+        if len(query) != self.dimensions:
+            raise ValueError(f"The query point must have {self.dimensions} coordinates")
+
+        # The squared distance and the position of the nearest point found so far
+        best = [float('inf'), -1]
+        self.__search(query, 0, len(self.points), 0, best)
+        return self.ids[best[1]], best[0] ** 0.5
+
+    def __build(self, points: np.ndarray, order: np.ndarray, lo: int, hi: int, depth: int) -> None:
+        """Partition order[lo:hi] around the median of its points along the axis of the depth, then both halves."""
+        if hi - lo <= self.LEAF_SIZE:
+            return
+        axis = depth % self.dimensions
+        mid = (lo + hi) // 2
+        subrange = order[lo:hi]
+        order[lo:hi] = subrange[np.argpartition(points[subrange, axis], mid - lo)]
+        self.__build(points, order, lo, mid, depth + 1)
+        self.__build(points, order, mid + 1, hi, depth + 1)
+
+    def __search(self, query: List[float], lo: int, hi: int, depth: int, best: List) -> None:
+        """Update best with the points of the subrange nearer to the query, skipping the halves which cannot be nearer."""
+        if hi - lo <= self.LEAF_SIZE:
+            for idx in range(lo, hi):
+                distance = sum((a - b) * (a - b) for a, b in zip(self.points[idx], query))
+                if distance < best[0]:
+                    best[0], best[1] = distance, idx
+            return
+
+        axis = depth % self.dimensions
+        mid = (lo + hi) // 2
+        median = self.points[mid]
+        distance = sum((a - b) * (a - b) for a, b in zip(median, query))
+        if distance < best[0]:
+            best[0], best[1] = distance, mid
+
+        # Search the half of the query point first, then the other half if the splitting plane is nearer than the best point
+        offset = query[axis] - median[axis]
+        near, far = ((lo, mid), (mid + 1, hi)) if offset < 0 else ((mid + 1, hi), (lo, mid))
+        self.__search(query, *near, depth + 1, best)
+        if offset * offset < best[0]:
+            self.__search(query, *far, depth + 1, best)
@@ -0,0 +1,114 @@
+from collections import OrderedDict
+from collections.abc import Sequence
+from typing import Any, Callable, List
+
+
+class PagedSequence(Sequence):
+    """A read-only sequence of rows fetched from the storage one page at a time, when a row of the page is first accessed.
+
+    Notes:
+        At most max_pages pages are kept, the least recently used page is evicted first,
+        so scrolling through a long history costs one query per page and bounded memory.
+        Rows stored at the front after the pages were fetched, e.g. newly logged games, are prepended
+        to the head without fetching the pages again. A page shorter than page_size is the last page
+        of the storage, so the length is clamped to its end if it was overcounted.
+
+    Attributes:
+        fetch: A function returning the list of at most 'limit' rows after the first 'offset' rows.
+        length: The total number of rows.
+        page_size: The number of rows fetched by each query.
+        max_pages: The maximum number of pages kept in memory.
+        pages: A hashmap mapping the index of a page to its rows, ordered from the least to the most recently used.
+        head: The rows prepended since the pages were fetched.
+
+    Methods:
+        prepend: Add the rows stored at the front of the sequence since the pages were fetched.
+        invalidate: Drop the fetched pages and update the number of rows, after the stored rows changed.
+    """
+
+    def __init__(self, fetch: Callable[[int, int], List[Any]], length: int, page_size: int = 100, max_pages: int = 8) -> None:
+        """Construct the sequence without fetching any page.
+
+        Args:
+            fetch (callable): A function called with (offset, limit), returning the rows of the page.
+            length (int): The total number of rows.
+            page_size (int): The number of rows fetched by each query (default = 100).
+            max_pages (int): The maximum number of pages kept in memory (default = 8).
+
+        Raises:
+            ValueError: Error caused by a non-positive page size or number of pages.
+        """
+        if page_size < 1 or max_pages < 1:
+            raise ValueError("The page size and the number of pages must be positive")
+        self.fetch = fetch
+        self.length = length
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.pages = OrderedDict()
+        self.head = []
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __getitem__(self, idx: int | slice) -> Any:
+        """Get a row, or the list of rows of a slice, fetching the pages which are not in memory.
+
+        Raises:
+            IndexError: Error caused by an index out of range.
+        """
+        if isinstance(idx, slice):
+            # The length may be clamped while the pages of the slice are fetched, the rows past it are left out
+            rows = []
+            for i in range(*idx.indices(self.length)):
+                try:
+                    rows.append(self[i])
+                except IndexError:
+                    if i < self.length:
+                        raise
+            return rows
+
+        if idx < 0:
+            idx += self.length
+        if not 0 <= idx < self.length:
+            raise IndexError("PagedSequence index out of range")
+
+        if idx < len(self.head):
+            return self.head[idx]
+
+        # The pages are indexed from the first row after the head, their rows are shifted by the head in the storage
+        page_idx, row_idx = divmod(idx - len(self.head), self.page_size)
+        page = self.pages.get(page_idx)
+        if page is None:
+            page = self.pages[page_idx] = self.fetch(page_idx * self.page_size + len(self.head), self.page_size)
+            # Evict the least recently used page
+            if len(self.pages) > self.max_pages:
+                self.pages.popitem(last=False)
+            if len(page) < self.page_size:
+                # The storage ends within the page, e.g. the length was counted from outdated statistics
+                self.length = min(self.length, idx - row_idx + len(page))
+        else:
+            self.pages.move_to_end(page_idx)
+
+        if row_idx >= len(page):
+            # The storage returned fewer rows than expected, e.g. rows were deleted after the length was counted
+            raise IndexError("PagedSequence index out of range")
+        return page[row_idx]
+
+    def prepend(self, rows: List[Any]) -> None:
+        """Add the rows stored at the front of the sequence since the pages were fetched.
+
+        Args:
+            rows (list): The new rows, in the order of the sequence.
+        """
+        self.head[0:0] = rows
+        self.length += len(rows)
+
+    def invalidate(self, length: int) -> None:
+        """Drop the fetched pages and update the number of rows, after the stored rows changed.
+
+        Args:
+            length (int): The new total number of rows.
+        """
+        self.pages.clear()
+        self.head = []
+        self.length = length
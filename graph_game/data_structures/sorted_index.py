@@ -0,0 +1,92 @@
+from bisect import bisect_left, bisect_right
+from collections.abc import Sequence
+from typing import Iterable, Iterator, List
+
+
+class SortedIndex(Sequence):
+    """An immutable sorted sequence of non-negative integers, filtered by range or by the prefix of their digits.
+
+    Notes:
+        The integers starting with the digits of a prefix p are the ranges [p * 10^k, (p + 1) * 10^k) for k = 0, 1, 2, ...,
+        so a prefix search is one binary search per digit of the largest value instead of a scan of every value.
+
+    Attributes:
+        values: The sorted list of the values.
+
+    Methods:
+        position: Get the position of a value in the index.
+        between: Get the values between a lower and an upper bound.
+        prefix: Get the values whose decimal digits start with a prefix.
+    """
+
+    def __init__(self, values: Iterable[int]) -> None:
+        """Sort the values into the index."""
+        self.values = sorted(values)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __getitem__(self, idx):
+        return self.values[idx]
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.values)
+
+    def __contains__(self, value: object) -> bool:
+        idx = bisect_left(self.values, value)
+        return idx < len(self.values) and self.values[idx] == value
+
+    def position(self, value: int) -> int:
+        """Get the position of a value in the index.
+
+        Raises:
+            ValueError: Error caused by a value which is not in the index.
+        """
+        idx = bisect_left(self.values, value)
+        if idx == len(self.values) or self.values[idx] != value:
+            raise ValueError(f"{value} is not in the index")
+        return idx
+
+    def between(self, low: int, high: int, limit: int | None = None) -> List[int]:
+        """Get the values between a lower and an upper bound, both inclusive.
+
+        Args:
+            low (int): The lower bound.
+            high (int): The upper bound.
+            limit (int): The maximum number of values returned (default = None for no limit).
+
+        Returns:
+            The sorted list of the matching values.
+        """
+        start = bisect_left(self.values, low)
+        stop = bisect_right(self.values, high)
+        if limit is not None:
+            stop = min(stop, start + max(limit, 0))
+        return self.values[start:stop]
+
+    def prefix(self, prefix: str, limit: int | None = None) -> List[int]:
+        """Get the values whose decimal digits start with a prefix.
+
+        Args:
+            prefix (str): The typed beginning of the values, '' for all values.
+            limit (int): The maximum number of values returned (default = None for no limit).
+
+        Returns:
+            The sorted list of the matching values.
+        """
+        prefix = prefix.strip()
+        if not prefix:
+            return self.values[:limit]
+        if not (prefix.isascii() and prefix.isdigit()):
+            return []
+        # Only zero itself is written with a leading zero
+        if prefix[0] == '0':
+            return [0] if prefix == '0' and 0 in self else []
+
+        matches = []
+        low, high = int(prefix), int(prefix) + 1
+        largest = self.values[-1] if self.values else -1
+        while low <= largest and (limit is None or len(matches) < limit):
+            matches.extend(self.between(low, high - 1, None if limit is None else limit - len(matches)))
+            low, high = low * 10, high * 10
+        return matches
@@ -0,0 +1,345 @@
+from abc import ABC, abstractmethod
+from bisect import bisect_left, insort
+from datetime import datetime, timezone
+import threading
+from typing import Dict, List, NamedTuple, Tuple
+
+from .. import config, events
+from . import credentials, database
+
+
+class PlayerStats(NamedTuple):
+    """The summary statistics of the games played by a player."""
+    games_played: int
+    wins: int
+    total_bid: int
+    total_score: int
+    best_score: int
+
+    @property
+    def win_rate(self) -> float:
+        """The fraction of the games won by the player."""
+        return self.wins / self.games_played if self.games_played else 0.0
+
+    @property
+    def average_score(self) -> float:
+        """The mean score of the games played by the player."""
+        return self.total_score / self.games_played if self.games_played else 0.0
+
+
+def timestamp() -> str:
+    """Get the current UTC time in the same format as SQLite's CURRENT_TIMESTAMP."""
+    return datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+
+
+class StorageBackend(ABC):
+    """The interface of the storage of players, balances, game logs and leaderboard queries.
+
+    Notes:
+        Registrations, balance changes and logged games are published to the event bus of graph_game.events.
+
+    Methods:
+        initialize: Prepare the storage for use.
+        registered: Check whether the player has registered an account.
+        register_player: Register a new player.
+        authenticate: Authenticate the player with their username and password.
+        get_balance: Get the balance of a player.
+        update_balance: Overwrite the balance of a player.
+        log_game: Log a game played by a player.
+        settle_round: Apply the score of a round to the balance and log the game atomically.
+        get_player_history: Get the game history of a player, newest first, optionally one page of it.
+        get_player_stats: Get the summary statistics of a player in O(1) time.
+        backfill_player_stats: Rebuild the summary statistics of all players from the game history.
+        get_leaders: Get the players with the highest balance.
+        get_players: Get the balance of the given players.
+        get_usernames: Get the usernames of all registered players.
+    """
+
+    @abstractmethod
+    def initialize(self) -> None:
+        """Prepare the storage for use."""
+
+    @abstractmethod
+    def registered(self, username: str) -> bool:
+        """Check whether the player has registered an account."""
+
+    @abstractmethod
+    def register_player(self, username: str, password: str, initial_balance: int) -> None:
+        """Register a new player."""
+
+    @abstractmethod
+    def authenticate(self, username: str, password: str) -> Tuple[str, int] | bool:
+        """Authenticate the player, returning their username and balance or False if the credentials are invalid."""
+
+    @abstractmethod
+    def get_balance(self, username: str) -> int | None:
+        """Get the balance of a player, or None if the player is not registered."""
+
+    @abstractmethod
+    def update_balance(self, username: str, new_balance: int) -> None:
+        """Overwrite the balance of a player."""
+
+    @abstractmethod
+    def log_game(self, username: str, bid: int, start: int, end: int, outcome: str, score: int) -> None:
+        """Log a game played by a player."""
+
+    @abstractmethod
+    def settle_round(self, username: str, bid: int, start: int, end: int, outcome: str, score: int) -> int | None:
+        """Add the score to the balance and log the game atomically, returning the new balance."""
+
+    @abstractmethod
+    def get_player_history(self, username: str, limit: int | None = None, offset: int = 0) -> List[Tuple[int, int, int, str, int, str]]:
+        """Get the (bid, start, end, outcome, score, entry_date) records of a player, newest first.
+
+        Only the page of at most limit records after the first offset records is returned, all of them if limit is None.
+        """
+
+    @abstractmethod
+    def get_player_stats(self, username: str) -> PlayerStats | None:
+        """Get the summary statistics of a player, or None if they have not played."""
+
+    @abstractmethod
+    def backfill_player_stats(self) -> int:
+        """Rebuild the summary statistics of all players from the game history, returning the number of players."""
+
+    @abstractmethod
+    def get_leaders(self, n: int) -> List[Tuple[str, int]]:
+        """Get the username and balance of the n players with the highest balance."""
+
+    @abstractmethod
+    def get_players(self, usernames: List[str]) -> List[Tuple[str, int]]:
+        """Get the username and balance of the given players, in the order of the input usernames."""
+
+    @abstractmethod
+    def get_usernames(self) -> List[str]:
+        """Get the usernames of all registered players."""
+
+
+class SQLiteBackend(StorageBackend):
+    """The storage backend of the SQLite database in graph_game/database/db."""
+
+    def initialize(self) -> None:
+        database.initialize_database()
+
+    def registered(self, username: str) -> bool:
+        return database.registered(username)
+
+    def register_player(self, username: str, password: str, initial_balance: int) -> None:
+        database.register_player(username, password, initial_balance)
+        events.bus.publish(events.PLAYER_REGISTERED, username=username, balance=initial_balance)
+
+    def authenticate(self, username: str, password: str) -> Tuple[str, int] | bool:
+        return database.authenticate(username, password)
+
+    def get_balance(self, username: str) -> int | None:
+        return database.get_balance(username)
+
+    def update_balance(self, username: str, new_balance: int) -> None:
+        database.update_balance(username, new_balance)
+        events.bus.publish(events.BALANCE_CHANGED, username=username, balance=new_balance)
+
+    def log_game(self, username: str, bid: int, start: int, end: int, outcome: str, score: int) -> None:
+        entry_date = database.log_game(username, bid, start, end, outcome, score)
+        if entry_date is not None:
+            events.bus.publish(events.GAME_LOGGED, username=username, record=(bid, start, end, outcome, score, entry_date))
+
+    def settle_round(self, username: str, bid: int, start: int, end: int, outcome: str, score: int) -> int | None:
+        settled = database.settle_round(username, bid, start, end, outcome, score)
+        if settled is None:
+            return None
+        # Publish the game with the entry date stored in the history, so it sorts with the fetched records
+        new_balance, entry_date = settled
+        events.bus.publish(events.BALANCE_CHANGED, username=username, balance=new_balance)
+        events.bus.publish(events.GAME_LOGGED, username=username, record=(bid, start, end, outcome, score, entry_date))
+        return new_balance
+
+    def get_player_history(self, username: str, limit: int | None = None, offset: int = 0) -> List[Tuple[int, int, int, str, int, str]]:
+        return database.get_player_history(username, limit, offset)
+
+    def get_player_stats(self, username: str) -> PlayerStats | None:
+        stats = database.get_player_stats(username)
+        return PlayerStats(*stats) if stats else None
+
+    def backfill_player_stats(self) -> int:
+        return database.backfill_player_stats()
+
+    def get_leaders(self, n: int) -> List[Tuple[str, int]]:
+        return database.get_leaders(n)
+
+    def get_players(self, usernames: List[str]) -> List[Tuple[str, int]]:
+        return database.get_players(usernames)
+
+    def get_usernames(self) -> List[str]:
+        return database.get_usernames()
+
+
+class InMemoryBackend(StorageBackend):
+    """A storage backend keeping all data in process memory, used for load tests and simulations.
+
+    Notes:
+        The leaderboard is a list of (-balance, username) keys kept sorted with bisect,
+        so balance updates take O(log n) comparisons and get_leaders(n) takes O(n) time.
+
+    Attributes:
+        players: A hashmap mapping the username to a list of [balance, password hash].
+        history: A hashmap mapping the username to the list of game records, oldest first.
+        stats: A hashmap mapping the username to the list of [games_played, wins, total_bid, total_score, best_score].
+        leaderboard: A sorted list of (-balance, username) tuples.
+        sessions: The cache of credentials verified by this backend.
+    """
+
+    def __init__(self) -> None:
+        """Construct the empty storage."""
+        self.players: Dict[str, list] = {}
+        self.history: Dict[str, list] = {}
+        self.stats: Dict[str, list] = {}
+        self.leaderboard: List[Tuple[int, str]] = []
+        self.sessions = credentials.SessionCache()
+        self._lock = threading.Lock()
+
+    def initialize(self) -> None:
+        pass
+
+    def registered(self, username: str) -> bool:
+        return username in self.players
+
+    def register_player(self, username: str, password: str, initial_balance: int) -> None:
+        password = credentials.hash_password(password)
+        with self._lock:
+            if username in self.players:
+                return
+            self.players[username] = [initial_balance, password]
+            self.history[username] = []
+            insort(self.leaderboard, (-initial_balance, username))
+        events.bus.publish(events.PLAYER_REGISTERED, username=username, balance=initial_balance)
+
+    def authenticate(self, username: str, password: str) -> Tuple[str, int] | bool:
+        player = self.players.get(username)
+        if player is None:
+            return False
+        if self.sessions.lookup(username, password) is None:
+            if not credentials.verify_password(password, player[1]):
+                return False
+            if credentials.needs_rehash(player[1]):
+                # Hash outside the lock, the key derivation is slow
+                password_hash = credentials.hash_password(password)
+                with self._lock:
+                    player[1] = password_hash
+            self.sessions.issue(username, password)
+        return username, player[0]
+
+    def get_balance(self, username: str) -> int | None:
+        player = self.players.get(username)
+        return player[0] if player else None
+
+    def update_balance(self, username: str, new_balance: int) -> None:
+        with self._lock:
+            if username not in self.players:
+                return
+            self.__set_balance(username, new_balance)
+        events.bus.publish(events.BALANCE_CHANGED, username=username, balance=new_balance)
+
+    def log_game(self, username: str, bid: int, start: int, end: int, outcome: str, score: int) -> None:
+        with self._lock:
+            record = self.__append_record(username, bid, start, end, outcome, score)
+        events.bus.publish(events.GAME_LOGGED, username=username, record=record)
+
+    def settle_round(self, username: str, bid: int, start: int, end: int, outcome: str, score: int) -> int | None:
+        with self._lock:
+            if username not in self.players:
+                return None
+            new_balance = self.players[username][0] + score
+            self.__set_balance(username, new_balance)
+            record = self.__append_record(username, bid, start, end, outcome, score)
+        # Publish outside the lock, so the subscribers can query the backend
+        events.bus.publish(events.BALANCE_CHANGED, username=username, balance=new_balance)
+        events.bus.publish(events.GAME_LOGGED, username=username, record=record)
+        return new_balance
+
+    def get_player_history(self, username: str, limit: int | None = None, offset: int = 0) -> List[Tuple[int, int, int, str, int, str]]:
+        # Slice the page from the end of the records, which are stored oldest first
+        records = self.history.get(username, [])
+        end = len(records) - offset
+        start = 0 if limit is None else max(end - limit, 0)
+        return records[start:end][::-1] if end > 0 else []
+
+    def get_player_stats(self, username: str) -> PlayerStats | None:
+        stats = self.stats.get(username)
+        return PlayerStats(*stats) if stats else None
+
+    def backfill_player_stats(self) -> int:
+        with self._lock:
+            self.stats = {}
+            for username, records in self.history.items():
+                for bid, _, _, outcome, score, _ in records:
+                    self.__update_stats(username, bid, outcome, score)
+        return len(self.stats)
+
+    def get_leaders(self, n: int) -> List[Tuple[str, int]]:
+        return [(username, -neg_balance) for neg_balance, username in self.leaderboard[:n]]
+
+    def get_players(self, usernames: List[str]) -> List[Tuple[str, int]]:
+        return [(username, self.players[username][0]) for username in usernames if username in self.players]
+
+    def get_usernames(self) -> List[str]:
+        return list(self.players)
+
+    def __set_balance(self, username: str, new_balance: int) -> None:
+        """Update the balance of a registered player and move them to their new place in the leaderboard."""
+        player = self.players[username]
+        del self.leaderboard[bisect_left(self.leaderboard, (-player[0], username))]
+        player[0] = new_balance
+        insort(self.leaderboard, (-new_balance, username))
+
+    def __append_record(self, username: str, bid: int, start: int, end: int, outcome: str, score: int) -> Tuple[int, int, int, str, int, str]:
+        """Append a game record with the current UTC time in the same format as SQLite's CURRENT_TIMESTAMP, returning the record."""
+        record = (bid, start, end, outcome, score, timestamp())
+        self.history.setdefault(username, []).append(record)
+        self.__update_stats(username, bid, outcome, score)
+        return record
+
+    def __update_stats(self, username: str, bid: int, outcome: str, score: int) -> None:
+        """Fold a game into the summary statistics of the player."""
+        stats = self.stats.get(username)
+        if stats is None:
+            self.stats[username] = [1, int(outcome == 'win'), bid, score, score]
+        else:
+            stats[0] += 1
+            stats[1] += outcome == 'win'
+            stats[2] += bid
+            stats[3] += score
+            stats[4] = max(stats[4], score)
+
+
+# The storage backends selectable with config.STORAGE_BACKEND
+BACKENDS = {
+    'sqlite': SQLiteBackend,
+    'memory': InMemoryBackend,
+}
+
+_backend = None
+
+
+def create_backend(name: str) -> StorageBackend:
+    """Create a new storage backend by its name.
+
+    Raises:
+        ValueError: Error caused by an unknown backend name.
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown storage backend '{name}', expected one of {sorted(BACKENDS)}")
+    return BACKENDS[name]()
+
+
+def get_backend() -> StorageBackend:
+    """Get the storage backend of the process, creating the one selected by config.STORAGE_BACKEND on first use."""
+    global _backend
+    if _backend is None:
+        _backend = create_backend(config.STORAGE_BACKEND)
+    return _backend
+
+
+def set_backend(backend: StorageBackend) -> None:
+    """Replace the storage backend of the process."""
+    global _backend
+    _backend = backend
@@ -0,0 +1,167 @@
+from collections import OrderedDict
+import hashlib
+import hmac
+import os
+import secrets
+import threading
+from typing import Dict, Tuple
+
+from .. import config
+
+
+# The parameters of newly created password hashes, initialized from the config
+HASH_PARAMS = {
+    'method': config.PASSWORD_HASH,
+    'scrypt_n': config.SCRYPT_N,
+    'scrypt_r': config.SCRYPT_R,
+    'scrypt_p': config.SCRYPT_P,
+    'pbkdf2_iterations': config.PBKDF2_ITERATIONS,
+}
+
+HASH_METHODS = ('scrypt', 'pbkdf2_sha256')
+SALT_SIZE = 16
+
+
+def configure(**params: int | str) -> None:
+    """Change the method or the cost parameters used for hashing new passwords.
+
+    Args:
+        params: Any of 'method', 'scrypt_n', 'scrypt_r', 'scrypt_p' and 'pbkdf2_iterations'.
+
+    Raises:
+        ValueError: Error caused by an unknown parameter or hashing method.
+    """
+    unknown = set(params) - set(HASH_PARAMS)
+    if unknown:
+        raise ValueError(f"Unknown hashing parameters: {sorted(unknown)}")
+    if params.get('method', HASH_PARAMS['method']) not in HASH_METHODS:
+        raise ValueError(f"The hashing method must be one of {HASH_METHODS}")
+    HASH_PARAMS.update(params)
+
+
+def hash_password(password: str) -> str:
+    """Hash a password with a random salt using the configured method and cost.
+
+    Returns:
+        A string encoding the method, the cost parameters, the salt and the hash, separated by '$'.
+        For example: 'scrypt$16384$8$1$<salt hex>$<hash hex>'.
+    """
+    salt = os.urandom(SALT_SIZE)
+    if HASH_PARAMS['method'] == 'scrypt':
+        params = (HASH_PARAMS['scrypt_n'], HASH_PARAMS['scrypt_r'], HASH_PARAMS['scrypt_p'])
+    else:
+        params = (HASH_PARAMS['pbkdf2_iterations'],)
+    digest = _derive(HASH_PARAMS['method'], params, password, salt)
+    return '$'.join([HASH_PARAMS['method'], *map(str, params), salt.hex(), digest.hex()])
+
+
+def is_hashed(stored: str) -> bool:
+    """Check whether a stored password is a hash created by hash_password rather than legacy plaintext."""
+    return stored.split('$', 1)[0] in HASH_METHODS and stored.count('$') >= 3
+
+
+def verify_password(password: str, stored: str) -> bool:
+    """Check a password against a stored hash, or against a legacy plaintext password.
+
+    Notes:
+        The comparison runs in constant time, and the cost parameters are read from the stored hash,
+        so passwords hashed with an older configuration still verify.
+    """
+    if not is_hashed(stored):
+        return hmac.compare_digest(stored.encode(), password.encode())
+    method, *params, salt, digest = stored.split('$')
+    derived = _derive(method, tuple(map(int, params)), password, bytes.fromhex(salt))
+    return hmac.compare_digest(derived, bytes.fromhex(digest))
+
+
+def needs_rehash(stored: str) -> bool:
+    """Check whether a stored password is plaintext or was hashed with different parameters than the current ones."""
+    if not is_hashed(stored):
+        return True
+    method, *params, _, _ = stored.split('$')
+    if method != HASH_PARAMS['method']:
+        return True
+    if method == 'scrypt':
+        return tuple(map(int, params)) != (HASH_PARAMS['scrypt_n'], HASH_PARAMS['scrypt_r'], HASH_PARAMS['scrypt_p'])
+    return tuple(map(int, params)) != (HASH_PARAMS['pbkdf2_iterations'],)
+
+
+def _derive(method: str, params: Tuple[int, ...], password: str, salt: bytes) -> bytes:
+    """Run the key derivation function of the method over the password."""
+    if method == 'scrypt':
+        n, r, p = params
+        # Allow twice the memory the parameters need, as the default OpenSSL limit of 32 MiB rejects the default cost
+        return hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p, maxmem=256 * n * r + 1024 * 1024, dklen=32)
+    if method == 'pbkdf2_sha256':
+        iterations, = params
+        return hashlib.pbkdf2_hmac('sha256', password.encode(), salt, iterations)
+    raise ValueError(f"Unknown hashing method '{method}'")
+
+
+class SessionCache:
+    """An in-process cache of verified credentials and the session tokens issued for them.
+
+    Notes:
+        Credentials are cached by an HMAC fingerprint under a random per-process key, so the plaintext
+        password is never kept in memory and a repeated login costs one HMAC instead of the key derivation.
+        The oldest sessions are evicted once the cache holds maxsize sessions.
+
+    Methods:
+        lookup: Get the session token of previously verified credentials.
+        issue: Cache verified credentials and return a new session token.
+        validate: Get the username of a session token.
+        invalidate: Remove all sessions of a player.
+    """
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        """Construct the empty cache.
+
+        Args:
+            maxsize (int): The maximum number of cached sessions.
+        """
+        self.maxsize = maxsize
+        self._key = secrets.token_bytes(32)
+        self._sessions: OrderedDict[bytes, Tuple[str, str]] = OrderedDict()
+        self._tokens: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+    def lookup(self, username: str, password: str) -> str | None:
+        """Get the session token of previously verified credentials, or None if they are not cached."""
+        session = self._sessions.get(self.__fingerprint(username, password))
+        return session[1] if session else None
+
+    def issue(self, username: str, password: str) -> str:
+        """Cache verified credentials and return the session token issued for them."""
+        fingerprint = self.__fingerprint(username, password)
+        with self._lock:
+            if fingerprint in self._sessions:
+                return self._sessions[fingerprint][1]
+            token = secrets.token_urlsafe(32)
+            self._sessions[fingerprint] = (username, token)
+            self._tokens[token] = fingerprint
+            if len(self._sessions) > self.maxsize:
+                _, (_, evicted_token) = self._sessions.popitem(last=False)
+                del self._tokens[evicted_token]
+        return token
+
+    def validate(self, token: str) -> str | None:
+        """Get the username of a session token without touching the database, or None if the token is unknown."""
+        fingerprint = self._tokens.get(token)
+        session = self._sessions.get(fingerprint) if fingerprint else None
+        return session[0] if session else None
+
+    def invalidate(self, username: str) -> None:
+        """Remove all cached sessions of a player."""
+        with self._lock:
+            for fingerprint, (name, token) in list(self._sessions.items()):
+                if name == username:
+                    del self._sessions[fingerprint]
+                    del self._tokens[token]
+
+    def __fingerprint(self, username: str, password: str) -> bytes:
+        """Compute the keyed fingerprint of the credentials."""
+        return hmac.new(self._key, f'{username}\0{password}'.encode(), hashlib.sha256).digest()
+
+
+# The session cache of the process
+sessions = SessionCache()
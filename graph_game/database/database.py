@@ -1,10 +1,60 @@
+import logging
 import sqlite3
 import os
+import time
+
+from . import credentials
+
+logger = logging.getLogger(__name__)
+
+# Queries taking at least this many seconds are logged as warnings, None disables the check
+slow_query_threshold = None
+
+
+def set_slow_query_threshold(seconds):
+    """Set the duration in seconds above which a query is logged as slow, or None to disable the check."""
+    global slow_query_threshold
+    if seconds is not None and (not isinstance(seconds, (int, float)) or seconds < 0):
+        raise ValueError("The slow query threshold must be a non-negative number or None")
+    slow_query_threshold = seconds
+
+
+class QuerySpan:
+    """A context manager timing a query and logging its name, duration and the number of rows returned.
+
+    Notes:
+        The timer is only started if debug logging or the slow query check is enabled,
+        so a disabled span costs a single level check.
+    """
+
+    __slots__ = ('name', 'rows', 'start')
+
+    def __init__(self, name):
+        """Initialize the QuerySpan object."""
+        self.name = name
+        self.rows = 0
+        self.start = None
+
+    def __enter__(self):
+        """Enter method for the context manager."""
+        if slow_query_threshold is not None or logger.isEnabledFor(logging.DEBUG):
+            self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Exit method for the context manager."""
+        if self.start is None:
+            return
+        duration = time.perf_counter() - self.start
+        if slow_query_threshold is not None and duration >= slow_query_threshold:
+            logger.warning("Slow query %s: %.3f ms, %d rows", self.name, duration * 1000, self.rows)
+        else:
+            logger.debug("Query %s: %.3f ms, %d rows", self.name, duration * 1000, self.rows)
 
 
 class DatabaseConnection:
     """A context manager class for handling database connections."""
-    
+
     def __init__(self, db_name):
         """Initialize the DatabaseConnection object."""
         self.db_name = db_name
@@ -13,106 +63,291 @@ class DatabaseConnection:
     def __enter__(self):
         """Enter method for the context manager."""
         try:
-            self.connection = sqlite3.connect(os.path.dirname(__file__) + '/' + self.db_name)
+            self.connection = sqlite3.connect(os.path.join(os.path.dirname(__file__), self.db_name))
             return self.connection
         except sqlite3.Error as e:
-            print(f"Error connecting to database: {e}")
+            logger.error("Error connecting to database: %s", e)
             raise
-       
+
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Exit method for the context manager."""
         if self.connection:
             try:
-                self.connection.commit()
+                # Roll back the whole transaction if the block raised, so multi-statement writes stay atomic
+                if exc_type is not None:
+                    self.connection.rollback()
+                else:
+                    self.connection.commit()
             except sqlite3.Error as e:
-                print(f"Error committing changes to database: {e}")
+                logger.error("Error committing changes to database: %s", e)
             finally:
                 self.connection.close()
 
 
+# Summarize the games of each player into the player_stats table
+_SUMMARIZE_GAMES = ("INSERT INTO player_stats (username, games_played, wins, total_bid, total_score, best_score) "
+                    "SELECT username, COUNT(*), SUM(outcome = 'win'), SUM(bid), SUM(score), MAX(score) FROM games GROUP BY username")
+
+
 def initialize_database():
-    """Initialize the database with necessary tables."""
+    """Initialize the database with necessary tables.
+
+    Notes:
+        The player_stats table is filled from the games history when it is created, so a database
+        created before the statistics were kept counts the games logged until then.
+    """
     try:
-        with DatabaseConnection('db') as connection:
+        with QuerySpan('initialize_database'), DatabaseConnection('db') as connection:
             cursor = connection.cursor()
             cursor.execute("CREATE TABLE IF NOT EXISTS players (id INTEGER PRIMARY KEY, balance INTEGER, username TEXT UNIQUE, password TEXT)")
             cursor.execute("CREATE TABLE IF NOT EXISTS games (id INTEGER PRIMARY KEY, username TEXT, bid INTEGER, start INTEGER, end INTEGER, outcome TEXT, score INTEGER, entry_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP)")
-        print("Database initialized successfully.")
+            # Fetch the pages of a player's history, newest first, by a range scan of the index
+            cursor.execute("CREATE INDEX IF NOT EXISTS games_by_player ON games (username, entry_date, id)")
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'player_stats'")
+            stats_missing = cursor.fetchone() is None
+            cursor.execute("CREATE TABLE IF NOT EXISTS player_stats (username TEXT PRIMARY KEY, games_played INTEGER, wins INTEGER, total_bid INTEGER, total_score INTEGER, best_score INTEGER)")
+            if stats_missing:
+                cursor.execute(_SUMMARIZE_GAMES)
     except sqlite3.Error as e:
-        print(f"Error initializing database: {e}")
+        logger.error("Error initializing database: %s", e)
 
 
 def registered(username):
     """Check whether the player has registered an account."""
     try:
-        with DatabaseConnection('db') as connection:
+        with QuerySpan('registered') as span, DatabaseConnection('db') as connection:
             cursor = connection.cursor()
             cursor.execute("SELECT * FROM players WHERE username = ?", (username,))
             player = cursor.fetchone()
+            span.rows = int(bool(player))
         return bool(player)
     except sqlite3.Error as e:
-        print(f"Error validating player's registration status: {e}")
+        logger.error("Error validating player's registration status: %s", e)
 
 
 def register_player(username, password, initial_balance):
-    """Register a new player in the database."""
+    """Register a new player in the database with a salted hash of their password."""
+    password = credentials.hash_password(password)
     try:
-        with DatabaseConnection('db') as connection:
+        with QuerySpan('register_player') as span, DatabaseConnection('db') as connection:
             cursor = connection.cursor()
             cursor.execute("INSERT INTO players (balance, username, password) VALUES (?, ?, ?)", (initial_balance, username, password))
-        print("Player registered successfully.")
+            span.rows = cursor.rowcount
+        # Drop the sessions and the cached balance of an earlier account of the same name, e.g. in a replaced database
+        credentials.sessions.invalidate(username)
     except sqlite3.Error as e:
-        print(f"Error registering player: {e}")
-    
+        logger.error("Error registering player: %s", e)
+
+
+def _insert_game(cursor, username, bid, start, end, outcome, score):
+    """Insert a game record and fold it into the player's summary statistics using the cursor's transaction, returning its entry date."""
+    cursor.execute("INSERT INTO games (username, bid, start, end, outcome, score) VALUES (?, ?, ?, ?, ?, ?)", (username, bid, start, end, outcome, score))
+    game_id = cursor.lastrowid
+    cursor.execute("INSERT INTO player_stats (username, games_played, wins, total_bid, total_score, best_score) VALUES (?, 1, ?, ?, ?, ?) "
+                   "ON CONFLICT(username) DO UPDATE SET games_played = games_played + 1, wins = wins + excluded.wins, "
+                   "total_bid = total_bid + excluded.total_bid, total_score = total_score + excluded.total_score, "
+                   "best_score = MAX(best_score, excluded.best_score)",
+                   (username, int(outcome == 'win'), bid, score, score))
+    cursor.execute("SELECT entry_date FROM games WHERE id = ?", (game_id,))
+    entry_date, = cursor.fetchone()
+    return entry_date
+
 
 def log_game(username, bid, start, end, outcome, score):
-    """Log a game played by a player in the database."""
+    """Log a game played by a player in the database.
+
+    Returns:
+        The entry date stored with the game, or None if the game could not be logged.
+    """
+    try:
+        with QuerySpan('log_game') as span, DatabaseConnection('db') as connection:
+            cursor = connection.cursor()
+            entry_date = _insert_game(cursor, username, bid, start, end, outcome, score)
+            span.rows = 1
+        return entry_date
+    except sqlite3.Error as e:
+        logger.error("Error logging game: %s", e)
+
+
+def settle_round(username, bid, start, end, outcome, score):
+    """Apply the score of a round to the player's balance and log the game in a single transaction.
+
+    Returns:
+        A tuple of the new balance of the player and the entry date stored with the game, or None if the transaction failed.
+    """
     try:
-        with DatabaseConnection('db') as connection:
+        with QuerySpan('settle_round') as span, DatabaseConnection('db') as connection:
             cursor = connection.cursor()
-            cursor.execute("INSERT INTO games (username, bid, start, end, outcome, score) VALUES (?, ?, ?, ?, ?, ?)", (username, bid, start, end, outcome, score))
-        print("Game logged successfully.")
+            # Increment the balance in SQL so concurrent rounds of the same player cannot overwrite each other
+            cursor.execute("UPDATE players SET balance = balance + ? WHERE username = ?", (score, username))
+            if not cursor.rowcount:
+                logger.warning("Cannot settle round, player %r not found", username)
+                return None
+            entry_date = _insert_game(cursor, username, bid, start, end, outcome, score)
+            cursor.execute("SELECT balance FROM players WHERE username = ?", (username,))
+            new_balance, = cursor.fetchone()
+            span.rows = 1
+        return new_balance, entry_date
     except sqlite3.Error as e:
-        print(f"Error logging game: {e}")
+        logger.error("Error settling round: %s", e)
 
 
-def get_player_history(username):
-    """Extract the game history of a player."""
+def get_player_stats(username):
+    """Get the (games_played, wins, total_bid, total_score, best_score) summary of a player, or None if they have not played."""
     try:
-        with DatabaseConnection('db') as connection:
+        with QuerySpan('get_player_stats') as span, DatabaseConnection('db') as connection:
             cursor = connection.cursor()
-            cursor.execute("SELECT bid, start, end, outcome, score, entry_date FROM games WHERE username = ? ORDER BY entry_date DESC", (username,))
+            cursor.execute("SELECT games_played, wins, total_bid, total_score, best_score FROM player_stats WHERE username = ?", (username,))
+            stats = cursor.fetchone()
+            span.rows = int(bool(stats))
+        return stats
+    except sqlite3.Error as e:
+        logger.error("Error fetching player statistics: %s", e)
+
+
+def backfill_player_stats():
+    """Rebuild the player_stats table from the whole games history in one transaction.
+
+    Returns:
+        The number of players whose statistics were rebuilt.
+    """
+    try:
+        with QuerySpan('backfill_player_stats') as span, DatabaseConnection('db') as connection:
+            cursor = connection.cursor()
+            cursor.execute("DELETE FROM player_stats")
+            cursor.execute(_SUMMARIZE_GAMES)
+            span.rows = cursor.rowcount
+        return span.rows
+    except sqlite3.Error as e:
+        logger.error("Error backfilling player statistics: %s", e)
+
+
+def get_player_history(username, limit=None, offset=0):
+    """Extract the game history of a player, newest first, optionally one page of at most limit records after offset records."""
+    try:
+        with QuerySpan('get_player_history') as span, DatabaseConnection('db') as connection:
+            cursor = connection.cursor()
+            # Games logged within the same second are ordered by their id, so the pages do not overlap
+            cursor.execute("SELECT bid, start, end, outcome, score, entry_date FROM games WHERE username = ? "
+                           "ORDER BY entry_date DESC, id DESC LIMIT ? OFFSET ?", (username, -1 if limit is None else limit, offset))
             records = cursor.fetchall()
-        print("Fetch records successfully.")
+            span.rows = len(records)
         return records
     except sqlite3.Error as e:
-        print(f"Error fetching records: {e}")
+        logger.error("Error fetching records: %s", e)
 
 
 def authenticate(username, password):
-    """Authenticate the user based on provided username and password."""
+    """Authenticate the user based on provided username and password.
+
+    Notes:
+        Credentials verified before in the process skip the key derivation, but the balance is always read
+        from the database, which other processes may have changed. Plaintext or outdated password hashes
+        are rehashed on the first successful login.
+    """
+    verified = credentials.sessions.lookup(username, password) is not None
     try:
-        with DatabaseConnection('db') as connection:
+        with QuerySpan('authenticate') as span, DatabaseConnection('db') as connection:
             cursor = connection.cursor()
-            cursor.execute("SELECT username, balance FROM players WHERE username = ? AND password = ?", (username, password))
-            user = cursor.fetchone()
-        if user:
-            print("Authentication successful.")
-            return user
+            cursor.execute("SELECT password, balance FROM players WHERE username = ?", (username,))
+            player = cursor.fetchone()
+            span.rows = int(bool(player))
+            if player and not verified:
+                stored_password, _ = player
+                verified = credentials.verify_password(password, stored_password)
+                # Migrate plaintext passwords and hashes with outdated parameters
+                if verified and credentials.needs_rehash(stored_password):
+                    cursor.execute("UPDATE players SET password = ? WHERE username = ?", (credentials.hash_password(password), username))
+                    logger.info("Rehashed the password of %r", username)
+        if player and verified:
+            credentials.sessions.issue(username, password)
+            return username, player[1]
         else:
-            print("Invalid username or password.")
+            logger.info("Invalid username or password for %r", username)
             return False
     except sqlite3.Error as e:
-        print(f"Error authenticating user: {e}")
+        logger.error("Error authenticating user: %s", e)
         return False
-    
-    
+
+
+def get_balance(username):
+    """Get the balance of a player, or None if the player is not registered."""
+    try:
+        with QuerySpan('get_balance') as span, DatabaseConnection('db') as connection:
+            cursor = connection.cursor()
+            cursor.execute("SELECT balance FROM players WHERE username = ?", (username,))
+            row = cursor.fetchone()
+            span.rows = int(bool(row))
+        return row[0] if row else None
+    except sqlite3.Error as e:
+        logger.error("Error fetching balance: %s", e)
+
+
+def get_leaders(n):
+    """Get the n players with the highest balance."""
+    try:
+        with QuerySpan('get_leaders') as span, DatabaseConnection('db') as connection:
+            cursor = connection.cursor()
+            cursor.execute("SELECT username, balance FROM players ORDER BY balance DESC LIMIT ?", (n,))
+            leaders = cursor.fetchall()
+            span.rows = len(leaders)
+        return leaders
+    except sqlite3.Error as e:
+        logger.error("Error fetching leaders: %s", e)
+        return []
+
+
+def get_players(usernames):
+    """Get the username and balance of the given players, in the order of the input usernames."""
+    if not usernames:
+        return []
+    try:
+        with QuerySpan('get_players') as span, DatabaseConnection('db') as connection:
+            cursor = connection.cursor()
+            placeholders = ', '.join('?' * len(usernames))
+            cursor.execute(f"SELECT username, balance FROM players WHERE username IN ({placeholders})", tuple(usernames))
+            balances = dict(cursor.fetchall())
+            span.rows = len(balances)
+        return [(username, balances[username]) for username in usernames if username in balances]
+    except sqlite3.Error as e:
+        logger.error("Error fetching players: %s", e)
+        return []
+
+
+def get_usernames():
+    """Get the usernames of all registered players."""
+    try:
+        with QuerySpan('get_usernames') as span, DatabaseConnection('db') as connection:
+            cursor = connection.cursor()
+            cursor.execute("SELECT username FROM players")
+            usernames = [username for username, in cursor.fetchall()]
+            span.rows = len(usernames)
+        return usernames
+    except sqlite3.Error as e:
+        logger.error("Error fetching usernames: %s", e)
+        return []
+
+
 def update_balance(username, new_balance):
     """Update the balance of a player."""
     try:
-        with DatabaseConnection('db') as connection:
+        with QuerySpan('update_balance') as span, DatabaseConnection('db') as connection:
             cursor = connection.cursor()
             cursor.execute("UPDATE players SET balance = ? WHERE username = ?", (new_balance, username))
-        print("Balance updated successfully.")
+            span.rows = cursor.rowcount
     except sqlite3.Error as e:
-        print(f"Error updating balance: {e}")
\ No newline at end of file
+        logger.error("Error updating balance: %s", e)
+
+
+if __name__ == '__main__':
+    # To rebuild the player statistics from the games history, enter 'python3 -m graph_game.database.database backfill-stats' in terminal.
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Maintenance commands of the Graph Game database.')
+    parser.add_argument('command', choices=['backfill-stats'])
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    initialize_database()
+    if args.command == 'backfill-stats':
+        logger.info("Rebuilt the statistics of %s players", backfill_player_stats())
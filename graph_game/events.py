@@ -0,0 +1,71 @@
+"""A lightweight in-process event bus, which the storage backends publish changes of the players' data to.
+
+Views subscribe to the events instead of reloading their data after every round: they record the change,
+mark themselves dirty and apply the recorded changes when they are next shown.
+
+Events and their keyword arguments:
+    balance_changed: username, balance
+    game_logged: username, record, the (bid, start, end, outcome, score, entry_date) tuple of the game
+    player_registered: username, balance
+"""
+import logging
+import threading
+from typing import Callable, Dict, List
+
+logger = logging.getLogger(__name__)
+
+BALANCE_CHANGED = 'balance_changed'
+GAME_LOGGED = 'game_logged'
+PLAYER_REGISTERED = 'player_registered'
+
+
+class EventBus:
+    """Delivers the published events to the callbacks subscribed to them, in the thread of the publisher.
+
+    Attributes:
+        subscribers: A hashmap mapping the name of an event to the list of its callbacks.
+
+    Methods:
+        subscribe: Call the callback with the keyword arguments of every published event of the name.
+        unsubscribe: Stop calling the callback for the event.
+        publish: Call the callbacks subscribed to the event.
+    """
+
+    def __init__(self) -> None:
+        """Construct the bus without subscribers."""
+        self.subscribers: Dict[str, List[Callable[..., None]]] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, event: str, callback: Callable[..., None]) -> None:
+        """Call the callback with the keyword arguments of every published event of the name.
+
+        Args:
+            event (str): The name of the event.
+            callback (callable): The function called with the keyword arguments of the event.
+        """
+        with self._lock:
+            # Copy the list, so events published concurrently iterate over an unchanged list
+            self.subscribers[event] = self.subscribers.get(event, []) + [callback]
+
+    def unsubscribe(self, event: str, callback: Callable[..., None]) -> None:
+        """Stop calling the callback for the event, if it was subscribed to it."""
+        with self._lock:
+            callbacks = self.subscribers.get(event, [])
+            self.subscribers[event] = [subscribed for subscribed in callbacks if subscribed != callback]
+
+    def publish(self, event: str, **payload) -> None:
+        """Call the callbacks subscribed to the event with its keyword arguments.
+
+        Notes:
+            An exception raised by a callback is logged, so it cannot stop the other callbacks
+            or the storage operation which published the event.
+        """
+        for callback in self.subscribers.get(event, ()):
+            try:
+                callback(**payload)
+            except Exception:
+                logger.exception("Error handling the %s event", event)
+
+
+# The event bus of the process
+bus = EventBus()
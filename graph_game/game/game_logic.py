@@ -1,14 +1,42 @@
 from __future__ import annotations
-from typing import List
+from dataclasses import dataclass
+import heapq
+from typing import Dict, List, Tuple
 
-import networkx as nx
 import numpy as np
 import random as rand
 
 from ..data_structures.graph import Graph
+from ..data_structures.sorted_index import SortedIndex
 from .score_generation import RandomScoreGenerator 
 
 
+# Graphs up to this number of nodes, or at least this fraction of all possible edges, use Floyd–Warshall for the distance matrix
+FLOYD_WARSHALL_MAX_NODES = 64
+FLOYD_WARSHALL_MIN_DENSITY = 0.25
+
+# Graphs with more nodes than this never build the distance matrix, computing the distances from a node on demand instead
+DISTANCE_MATRIX_MAX_NODES = 256
+
+
+@dataclass(frozen=True)
+class RoundResult:
+    """The outcome of a round, resolved once after the player has chosen the ending node.
+
+    Attributes:
+        distance: The length of the shortest path between the starting node and the ending node.
+        path: The node indices along the shortest path, from the starting node to the ending node.
+        won: Whether the shortest distance is below the cutoff distance.
+        score: The score awarded for the player, the negative base score for a loss.
+        cutoff: The cutoff distance of the round.
+    """
+    distance: int | float
+    path: Tuple[int, ...]
+    won: bool
+    score: int
+    cutoff: int
+
+
 class GraphGame(Graph):
     """A subclass inherited from the Graph class which handles the operation and the winning conditions of the game.
 
@@ -18,42 +46,80 @@ class GraphGame(Graph):
         ending_node: An integer index of the ending node defined by the user.
         cutoff_distance: The random distance generated by RandomScoreGenerator to determine the game outcome.
         base_score: An integer base score of the game.
+        cutoff_sd_multiplier: The factor applied to the standard deviation of the shortest distances
+                              when generating the cutoff distance.
 
     Methods:
         get_nodes: A getter method for all node indcies in the graph.
+        node_index: The sorted index of the nodes, built once per board.
         set_base_score: A setter method for the base_score attribute.
         set_starting_node: A setter method for the starting node.
         set_ending_node: A setter method for the ending node.
         generate_cutoff: Generate and store the random distance in the cutoff_distance variable.
+        resolve_round: Resolve the outcome of the round once the ending node has been chosen.
         check_player_wins: Check whether the player wins.
         get_player_score: Get the score awarded for the player for the current round.
+        score_all_nodes: Get the scores of all nodes from the starting node in one vectorised pass.
+        distance_matrix: Get the shortest distances between all pairs of nodes, computed once per round.
+        distances_from: Get the shortest distances from a node to all nodes.
+        has_distances_from: Check whether the distances from a node are computed, so distances_from is a lookup.
+        set_distances_from: Store the distances from a node computed on a copy of the game, e.g. in a worker process.
+        distance_statistics: Get the mean and standard deviation of the distances from a node to the reachable nodes.
+        search_nodes: Get the nodes whose index starts with a prefix or lies in a range, for selecting nodes on big boards.
+        shortest_path: Find the shortest path between nodes with a lookup in the distance matrix.
+        prepare: Precompute the layout and the distances between all pairs of nodes.
         random_start: A classmethod for generating a random game.
     """
 
+    # The default spread of the cutoff distance relative to the spread of the shortest distances
+    CUTOFF_SD_MULTIPLIER = 2.2
+
     def __init__(self,
                  init_num_nodes: int = 0, 
-                 init_num_edges: int = 0) -> None:
+                 init_num_edges: int = 0,
+                 edge_mean: int = 5,
+                 edge_sd: int | float = 3,
+                 cutoff_sd_multiplier: int | float | None = None) -> None:
         """Construct the attributes of the graph.
 
         Args:
             init_num_nodes (int): Number of randomly generated nodes during initialization.
             add_num_edges (int): Number of additional randomly generated edges, after 
                            generating n - 1 edges to connect all nodes, n = init_num_nodes.
+            edge_mean (int): The mean weight of the generated edges (default = 5).
+            edge_sd (int, float): The standard deviation of the weight of the generated edges (default = 3).
+            cutoff_sd_multiplier (int, float): The spread of the cutoff distance relative to the
+                                               shortest distances (default = CUTOFF_SD_MULTIPLIER).
         """
-        super().__init__(init_num_nodes, init_num_edges)
+        super().__init__(init_num_nodes, init_num_edges, edge_mean, edge_sd)
         self.score_generator = None
         self.starting_node = None
         self.ending_node = None
         self.cutoff_distance = None
         self.base_score = None
+        self.cutoff_sd_multiplier = self.CUTOFF_SD_MULTIPLIER if cutoff_sd_multiplier is None else cutoff_sd_multiplier
+        self._node_scores = None
+        self._round_result = None
+        self._distance_matrix = None
+        self._distance_stats = None
+        self._distance_rows = {}
+        self._node_rows = {}
+        self._node_index = None
 
     def get_nodes(self) -> List[int]:
         """The method for getting the list of nodes in the graph which is needed for tkinter combobox.
 
         Returns: 
-            The list of nodes in the graph.
+            The sorted list of nodes in the graph, copied from the cached node index.
         """
-        return sorted(list(self.node_map.keys()))
+        return list(self.node_index)
+
+    @property
+    def node_index(self) -> SortedIndex:
+        """The sorted index of the nodes, rebuilt only after nodes have been added to the graph."""
+        if self._node_index is None or len(self._node_index) != len(self.node_map):
+            self._node_index = SortedIndex(self.node_map.keys())
+        return self._node_index
 
     def set_base_score(self, score: int) -> None:
         """A setter method for the base_score attribute.
@@ -69,6 +135,8 @@ class GraphGame(Graph):
         
         self.base_score = score
         self.score_generator = RandomScoreGenerator(base_score=score)
+        self._node_scores = None
+        self._round_result = None
 
     def set_starting_node(self, idx: int) -> None:
         """A setter method for the starting_node attribute.
@@ -86,6 +154,8 @@ class GraphGame(Graph):
             raise ValueError("The node with index 'idx' does not exist in the graph") 
 
         self.starting_node = idx
+        self._node_scores = None
+        self._round_result = None
 
     def set_ending_node(self, idx: int) -> None:
         """A setter method for the ending_node attribute.
@@ -103,6 +173,7 @@ class GraphGame(Graph):
             raise ValueError("The node with index 'idx' does not exist in the graph") 
         
         self.ending_node = idx
+        self._round_result = None
 
     def generate_cutoff(self) -> None: 
         """ Generate and store the random distance in the cutoff_distance variable.
@@ -113,26 +184,30 @@ class GraphGame(Graph):
         if not self.score_generator:
             raise NameError('The score_generator has not been defined')
 
-        # Get the shortest distances from the starting node to all other nodes
-        node_to_dist = self.shortest_path(starting_node=self.starting_node)
-        dist_values = list(node_to_dist.values())
-
-        # Calculate the mean and sd of the shortest distances using the numpy library
-        mean_dist = int(np.mean(dist_values))
-        sd_dist = np.std(dist_values)
+        # Look up the mean and sd of the shortest distances from the starting node to the reachable nodes
+        mean_dist, sd_dist = self.distance_statistics(self.starting_node)
+        mean_dist = int(mean_dist)
 
         # Configure the mean and sd of the score_generator
         self.score_generator.set_mean(mean_dist)
-        self.score_generator.set_sd(sd_dist*2.2)
+        self.score_generator.set_sd(sd_dist*self.cutoff_sd_multiplier)
 
         # Generate a random distance
         self.cutoff_distance = self.score_generator.generate_random_distance()
+
+        # The node scores and the outcome depend on the new mean, sd and cutoff
+        self._node_scores = None
+        self._round_result = None
         
-    def check_player_wins(self) -> bool:
-        """Check whether the player wins.
-        
+    def resolve_round(self) -> RoundResult:
+        """Resolve the outcome of the round once the ending node has been chosen.
+
+        Notes:
+            The result is cached until the nodes, the base score or the cutoff change. The score of a win
+            is the score shown on the ending node by score_all_nodes.
+
         Returns:
-            True if the player wins, false otherwise.
+            A RoundResult of the shortest distance and path, whether the player wins and the score.
 
         Raises:
             NameError: Error raised if the starting_node, ending_node or cutoff_distance have not been defined.
@@ -141,12 +216,32 @@ class GraphGame(Graph):
             raise NameError('The starting node and ending node have not been defined')
         if self.cutoff_distance is None:
             raise NameError('The generate_cutoff method has to be called before this method')
+
+        if self._round_result is None:
+            # Look up the shortest distance between the starting node and the ending node
+            shortest_dist = self.shortest_path(self.starting_node, self.ending_node)
+            won = shortest_dist < self.cutoff_distance
+
+            # Award the score of the ending node if the player wins, otherwise the negative base score which indicates a loss
+            score = int(self.score_all_nodes()[self._node_rows[self.ending_node]]) if won else -self.base_score
+
+            self._round_result = RoundResult(distance=shortest_dist,
+                                             path=self.__reconstruct_path(self.starting_node, self.ending_node),
+                                             won=won,
+                                             score=score,
+                                             cutoff=self.cutoff_distance)
+        return self._round_result
+
+    def check_player_wins(self) -> bool:
+        """Check whether the player wins.
         
-        # Find the shortest distance between the starting node and the ending node
-        shortest_dist = self.shortest_path(self.starting_node, self.ending_node)
+        Returns:
+            True if the player wins, false otherwise.
 
-        # Return a boolean of whether the player wins
-        return shortest_dist < self.cutoff_distance
+        Raises:
+            NameError: Error raised if the starting_node, ending_node or cutoff_distance have not been defined.
+        """
+        return self.resolve_round().won
     
     def get_player_score(self) -> int:
         """Get the score awarded for the player for the current round.
@@ -157,32 +252,324 @@ class GraphGame(Graph):
         Raises:
             NameError: Error raised if the starting_node, ending_node or cutoff_distance have not been defined.
         """
-        if (not self.starting_node or not self.ending_node):
-            raise NameError('The starting node and ending node have not been defined')
-        if self.cutoff_distance is None:
-            raise NameError('The generate_cutoff method has to be called before this method')
+        return self.resolve_round().score
+
+    def score_all_nodes(self) -> np.ndarray:
+        """Get the scores of all nodes from the starting node in one vectorised pass.
+
+        Notes:
+            The scores are cached until the starting node, the base score or the cutoff changes,
+            so redrawing the same round does not recompute them.
+
+        Returns:
+            An int64 array of the scores, aligned with the node indices returned by get_nodes.
+
+        Raises:
+            NameError: Error raised if the starting_node or score_generator have not been defined.
+        """
+        if not self.starting_node or not self.score_generator:
+            raise NameError('The score_generator or the starting node have not been defined')
+
+        if self._node_scores is None:
+            # Score the row of the starting node in the distance matrix
+            self._node_scores = self.score_generator.calculate_scores(self.distances_from(self.starting_node))
+
+        return self._node_scores
+
+    def generate_random_nodes(self, *args, **kwargs) -> None:
+        """Generate a random number of nodes in the graph and clear the cached distances and node index."""
+        super().generate_random_nodes(*args, **kwargs)
+        self._node_index = None
+        self.__clear_distances()
+
+    def add_edge_to_graph(self, idx1: int, idx2: int) -> None:
+        """Add an edge with random weight to the graph and clear the cached distances."""
+        super().add_edge_to_graph(idx1, idx2)
+        self.__clear_distances()
+
+    def distance_matrix(self) -> np.ndarray:
+        """Get the shortest distances between all pairs of nodes, computed once per round.
+
+        Notes:
+            Small or dense graphs use a vectorised Floyd–Warshall in O(V³) numpy operations,
+            sparse graphs run Dijkstra from every node in O(V * E * log V) time.
+
+        Returns:
+            A V x V float array whose rows and columns are aligned with get_nodes(),
+            holding inf for pairs of unconnected nodes.
+        """
+        if self._distance_matrix is None:
+            self.__index_nodes()
+            n = len(self._node_rows)
+            if n <= FLOYD_WARSHALL_MAX_NODES or self.num_edges >= FLOYD_WARSHALL_MIN_DENSITY * n * (n - 1) / 2:
+                self._distance_matrix = self.__floyd_warshall()
+            else:
+                self._distance_matrix = self.__repeated_dijkstra()
+        return self._distance_matrix
+
+    def distances_from(self, starting_node: int) -> np.ndarray:
+        """Get the shortest distances from the starting node to all nodes, aligned with get_nodes().
+
+        Notes:
+            Graphs with more than DISTANCE_MATRIX_MAX_NODES nodes run Dijkstra's algorithm from the node
+            on the first call and cache the row, instead of building the V x V distance matrix.
+
+        Raises:
+            ValueError: Error caused by a non-existing node.
+        """
+        if starting_node not in self.node_map:
+            raise ValueError("The input nodes does not exist in the graph")
+
+        if self.num_nodes > DISTANCE_MATRIX_MAX_NODES or starting_node in self._distance_rows:
+            if starting_node not in self._distance_rows:
+                self.__index_nodes()
+                self._distance_rows[starting_node] = self.__dijkstra(starting_node)
+            return self._distance_rows[starting_node]
 
-        # Find the shortest distance between the starting node and the ending node
-        shortest_dist = self.shortest_path(self.starting_node, self.ending_node)
+        matrix = self.distance_matrix()
+        return matrix[self._node_rows[starting_node]]
 
-        # Generate the potential score of the player based on the distance
-        score = self.score_generator.calculate_score(shortest_dist)
+    def has_distances_from(self, starting_node: int) -> bool:
+        """Check whether the distances from a node are already computed, so distances_from is a lookup."""
+        if self.num_nodes > DISTANCE_MATRIX_MAX_NODES:
+            return starting_node in self._distance_rows
+        return self._distance_matrix is not None
 
-        # Return the calculated score if the player wins, otherwise return negative base score which indicates a loss
-        return score if self.check_player_wins() else -self.base_score
+    def set_distances_from(self, starting_node: int, distances: np.ndarray) -> None:
+        """Store the distances from a node computed by distances_from on a copy of the game, e.g. in a worker process.
+
+        Raises:
+            ValueError: Errors caused by a non-existing node or distances which are not aligned with get_nodes().
+        """
+        if starting_node not in self.node_map:
+            raise ValueError("The input nodes does not exist in the graph")
+        distances = np.asarray(distances, dtype=float)
+        if distances.shape != (self.num_nodes,):
+            raise ValueError("The distances must be aligned with the nodes of the graph")
+
+        self.__index_nodes()
+        self._distance_rows[starting_node] = distances
+        self._node_scores = None
+        self._round_result = None
+
+    def distance_statistics(self, starting_node: int) -> Tuple[float, float]:
+        """Get the mean and standard deviation of the shortest distances from a node to the other reachable nodes.
+
+        Notes:
+            The statistics of every row of the distance matrix are computed together in one vectorised pass
+            on the first call, so generating the cutoff of each round is a lookup. Big boards without a distance
+            matrix compute the statistics of the row of the node only.
+            Unreachable nodes and the node itself are excluded, and a node without reachable nodes has mean and sd 0.
+
+        Args:
+            starting_node (int): Index of the starting node.
+
+        Returns:
+            A tuple of the mean and the population standard deviation of the distances.
+
+        Raises:
+            ValueError: Error caused by a non-existing node.
+        """
+        if starting_node not in self.node_map:
+            raise ValueError("The input nodes does not exist in the graph")
+
+        if self.num_nodes > DISTANCE_MATRIX_MAX_NODES:
+            means, sds = self.__row_statistics(self.distances_from(starting_node)[None, :], [self._node_rows[starting_node]])
+            return float(means[0]), float(sds[0])
+
+        if self._distance_stats is None:
+            matrix = self.distance_matrix()
+            self._distance_stats = self.__row_statistics(matrix, np.arange(len(matrix)))
+
+        means, sds = self._distance_stats
+        row = self._node_rows[starting_node]
+        return float(means[row]), float(sds[row])
+
+    def search_nodes(self, prefix: str = '', limit: int = 100) -> List[int]:
+        """Get the nodes whose index starts with a prefix, or lies in a range typed as 'low-high', for selecting nodes on big boards.
+
+        Notes:
+            Both searches are binary searches in the sorted node index, so they do not scan the nodes of the board.
+
+        Args:
+            prefix (str): The typed beginning of the node index or range of indices (default = '' for all nodes).
+            limit (int): The maximum number of nodes returned (default = 100).
+
+        Returns:
+            The sorted list of at most limit matching node indices.
+        """
+        low, dash, high = prefix.partition('-')
+        if dash and low.strip().isdigit() and high.strip().isdigit():
+            return self.node_index.between(int(low), int(high), limit)
+        return self.node_index.prefix(prefix, limit)
+
+    def shortest_path(self, starting_node: int, ending_node: int | None = None) -> int | Dict[int, int]:
+        """Find the shortest path between nodes in the graph.
+
+        Notes:
+            Every call is a lookup in the distance matrix of the round, which is computed on the first call.
+
+        Args:
+            starting_node (int): Index of the starting node.
+            ending_node (int): Index of the ending node (optional).
+
+        Returns:
+            The length of the shortest path or a dictionary containing the shortest paths to all nodes.
+        """
+        if ending_node is not None and ending_node not in self.node_map:
+            raise ValueError("The input nodes does not exist in the graph")
+        row = self.distances_from(starting_node)
+
+        if ending_node is not None:
+            return self.__to_distance(row[self._node_rows[ending_node]])
+        return {node: self.__to_distance(dist) for node, dist in zip(self.node_index, row.tolist()) if node != starting_node}
+
+    def prepare(self, layout: bool = True) -> None:
+        """Precompute the layout and the distances between all pairs of nodes, so the round can start without further work.
+
+        Notes:
+            Big boards without a distance matrix only index their nodes, their distances are computed
+            once the starting node is chosen.
+
+        Args:
+            layout (bool): If False, only the distances are computed and networkx is not imported (default = True).
+        """
+        if layout:
+            # Accessing the property computes the layout
+            self.node_position
+        if self.num_nodes > DISTANCE_MATRIX_MAX_NODES:
+            self.__index_nodes()
+        else:
+            self.distance_matrix()
+
+    def __floyd_warshall(self) -> np.ndarray:
+        """Compute the all-pairs distances with the Floyd–Warshall algorithm, relaxing a whole matrix per intermediate node."""
+        n = len(self._node_rows)
+        matrix = np.full((n, n), np.inf)
+        np.fill_diagonal(matrix, 0)
+        for node_idx, node in self.node_map.items():
+            row = self._node_rows[node_idx]
+            for neighbour, weight in node.get_neighbours():
+                matrix[row, self._node_rows[neighbour.get_index()]] = weight
+
+        for k in range(n):
+            np.minimum(matrix, matrix[:, k, None] + matrix[None, k, :], out=matrix)
+        return matrix
+
+    def __repeated_dijkstra(self) -> np.ndarray:
+        """Compute the all-pairs distances by running Dijkstra's algorithm from every node."""
+        return np.stack([self.__dijkstra(node_idx) for node_idx in self._node_rows])
+
+    def __dijkstra(self, starting_node: int) -> np.ndarray:
+        """Compute the distances from a node to all nodes with Dijkstra's algorithm on a binary heap of node indices.
+
+        Returns:
+            A float array aligned with get_nodes(), holding inf for unreachable nodes.
+        """
+        # Bind the lookups of the inner loop to local names, which is the hot path of big boards
+        node_map, heappush, heappop = self.node_map, heapq.heappush, heapq.heappop
+        distances = {starting_node: 0}
+        queue = [(0, starting_node)]
+        while queue:
+            dist, node_idx = heappop(queue)
+            # Skip the stale entries of nodes already reached by a shorter path
+            if dist > distances[node_idx]:
+                continue
+
+            # Relax the edges to the neighbours
+            for neighbour, weight in node_map[node_idx].neighbours.items():
+                neighbour_idx = neighbour.idx
+                new_dist = dist + weight
+                if neighbour_idx not in distances or new_dist < distances[neighbour_idx]:
+                    distances[neighbour_idx] = new_dist
+                    heappush(queue, (new_dist, neighbour_idx))
+
+        row = np.full(len(self._node_rows), np.inf)
+        row[[self._node_rows[node_idx] for node_idx in distances]] = list(distances.values())
+        return row
+
+    @staticmethod
+    def __row_statistics(rows: np.ndarray, own_columns: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Compute the mean and the population sd of each row of distances in one vectorised pass.
+
+        Args:
+            rows (np.ndarray): A 2D array of distances.
+            own_columns (np.ndarray): The column of the node of each row, excluded with the unreachable nodes.
+
+        Returns:
+            A tuple of the arrays of the means and the standard deviations, 0 for rows without reachable nodes.
+        """
+        # Mask out the unreachable nodes and the nodes themselves
+        reachable = np.isfinite(rows)
+        reachable[np.arange(len(rows)), own_columns] = False
+        counts = np.maximum(reachable.sum(axis=1), 1)
+
+        means = np.add.reduce(rows, axis=1, where=reachable) / counts
+        deviations = np.subtract(rows, means[:, None], where=reachable, out=np.zeros_like(rows))
+        sds = np.sqrt(np.add.reduce(deviations * deviations, axis=1) / counts)
+        return means, sds
+
+    def __index_nodes(self) -> None:
+        """Map each node to its position in get_nodes(), the row or column of its distances."""
+        if not self._node_rows:
+            self._node_rows = {node: row for row, node in enumerate(self.node_index)}
+
+    def __reconstruct_path(self, starting_node: int, ending_node: int) -> Tuple[int, ...]:
+        """Walk back from the ending node along the edges lying on a shortest path from the starting node.
+
+        Returns:
+            The node indices along the path, or an empty tuple if the ending node cannot be reached.
+        """
+        row = self.distances_from(starting_node)
+        if row[self._node_rows[ending_node]] == np.inf:
+            return ()
+
+        path = [ending_node]
+        while path[-1] != starting_node:
+            dist = row[self._node_rows[path[-1]]]
+            # The previous node is a neighbour whose distance plus the edge weight gives the distance of the current node
+            for neighbour, weight in self.node_map[path[-1]].get_neighbours():
+                if row[self._node_rows[neighbour.get_index()]] + weight == dist:
+                    path.append(neighbour.get_index())
+                    break
+        return tuple(reversed(path))
+
+    @staticmethod
+    def __to_distance(dist: float) -> int | float:
+        """Convert a distance in the matrix to an integer, keeping inf for unconnected nodes."""
+        return int(dist) if dist != np.inf else dist
+
+    def __clear_distances(self) -> None:
+        """Clear the cached distances, node scores and outcome after the graph changed."""
+        self._distance_matrix = None
+        self._distance_stats = None
+        self._distance_rows = {}
+        self._node_rows = {}
+        self._node_scores = None
+        self._round_result = None
 
     @classmethod
-    def random_start(cls) -> type[GraphGame]:
+    def random_start(cls, size: int | None = None, **kwargs) -> type[GraphGame]:
         """An alternative initization method which generates a new game with a random graph.
 
+        Args:
+            size (int): The number of nodes of a big board, or None for a game of 8 to 10 nodes (default = None).
+            **kwargs: The edge_mean, edge_sd and cutoff_sd_multiplier passed to the constructor.
+
+        Raises:
+            ValueError: Error caused by a non-positive size.
+
         Returns:
             A GraphGame object with random nodes and weighted edges.
 
         To instantiate:
             game = GraphGame.random_start()
         """
-        init_num_nodes = rand.randint(8, 10)
+        if size is not None and (not isinstance(size, int) or size < 1):
+            raise ValueError("Input parameter 'size' must be a positive integer")
+
+        init_num_nodes = rand.randint(8, 10) if size is None else size
         add_num_edges = init_num_nodes // rand.randint(2, 3)
-        return cls(init_num_nodes, add_num_edges)
+        return cls(init_num_nodes, add_num_edges, **kwargs)
 
     
\ No newline at end of file
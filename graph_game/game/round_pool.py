@@ -0,0 +1,117 @@
+from collections import deque
+import logging
+import threading
+from typing import Callable, Dict
+
+from .. import config
+from .game_logic import GraphGame
+
+
+logger = logging.getLogger(__name__)
+
+
+class RoundPool:
+    """A bounded pool of prepared games, refilled by a background worker so a new round can start instantly.
+
+    Attributes:
+        depth: The maximum number of prepared games kept in the pool.
+        factory: A callable creating a new game.
+        hits: The number of games taken from the pool.
+        misses: The number of games built on demand because the pool was empty.
+
+    Methods:
+        get: Take a prepared game from the pool, or build one if the pool is empty.
+        stats: Get the depth, size, hits and misses of the pool.
+        close: Stop the background worker.
+    """
+
+    # The seconds waited by the worker before retrying after a game could not be prepared
+    RETRY_DELAY = 1.0
+
+    def __init__(self,
+                 depth: int | None = None,
+                 factory: Callable[[], GraphGame] = GraphGame.random_start) -> None:
+        """Construct the pool and start the background worker.
+
+        Args:
+            depth (int): The maximum number of prepared games (default = config.ROUND_POOL_DEPTH).
+            factory (callable): A callable creating a new game (default = GraphGame.random_start).
+
+        Raises:
+            ValueError: Error caused by a negative depth.
+        """
+        depth = config.ROUND_POOL_DEPTH if depth is None else depth
+        if not isinstance(depth, int) or depth < 0:
+            raise ValueError("Input parameter 'depth' must be a non-negative integer")
+
+        self.depth = depth
+        self.factory = factory
+        self.hits = 0
+        self.misses = 0
+        self._games = deque()
+        self._condition = threading.Condition()
+        self._closed = False
+        self._worker = threading.Thread(target=self.__refill, name='round-pool', daemon=True)
+        if depth:
+            self._worker.start()
+
+    def get(self) -> GraphGame:
+        """Take a prepared game from the pool, or build one if the pool is empty.
+
+        Returns:
+            A GraphGame object with its layout and distances precomputed.
+        """
+        with self._condition:
+            if self._games:
+                self.hits += 1
+                game = self._games.popleft()
+                # Wake up the worker to replace the game
+                self._condition.notify()
+            else:
+                self.misses += 1
+                game = None
+            logger.debug("Round pool %s: %d hits, %d misses", 'hit' if game else 'miss', self.hits, self.misses)
+
+        return game if game is not None else self.__build()
+
+    def stats(self) -> Dict[str, int]:
+        """Get the depth, the current size, the hits and the misses of the pool."""
+        with self._condition:
+            return {'depth': self.depth, 'size': len(self._games), 'hits': self.hits, 'misses': self.misses}
+
+    def close(self) -> None:
+        """Stop the background worker after the game it is building, if any."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if self._worker.is_alive():
+            self._worker.join()
+
+    def __build(self) -> GraphGame:
+        """Create and prepare a new game."""
+        game = self.factory()
+        game.prepare()
+        return game
+
+    def __refill(self) -> None:
+        """Keep the pool filled up to its depth until the pool is closed."""
+        while True:
+            with self._condition:
+                while not self._closed and len(self._games) >= self.depth:
+                    self._condition.wait()
+                if self._closed:
+                    return
+
+            # Build the game outside the lock so get() is never blocked by the worker
+            try:
+                game = self.__build()
+            except Exception:
+                logger.exception("Error preparing a game for the round pool, retrying in %.1f s", self.RETRY_DELAY)
+                # Back off without holding up close(), which wakes up the worker
+                with self._condition:
+                    if not self._closed:
+                        self._condition.wait(self.RETRY_DELAY)
+                continue
+
+            with self._condition:
+                self._games.append(game)
@@ -1,7 +1,17 @@
-from typing import List
+import math
 
 import numpy as np
-from scipy import stats
+
+
+# 1 / sqrt(2), used for standardizing the argument of the error function
+_SQRT1_2 = math.sqrt(0.5)
+
+# The error functions of math applied to each element, so the scores of an array equal those of calculate_score
+_erf = np.vectorize(math.erf, otypes=[float])
+_erfc = np.vectorize(math.erfc, otypes=[float])
+
+# The largest score returned by calculate_scores, the maximum integer which can be stored in the database
+MAX_SCORE = np.iinfo(np.int64).max
 
 
 class RandomScoreGenerator:
@@ -15,7 +25,9 @@ class RandomScoreGenerator:
         set_sd: Set the standard deviation for generating random distances.
         generate_random_distance: Generates a random distance using a normal distribution.
         calculate_score: Calculates a score based on the given distance and base score.
-        generate_random_edge: Generates a random weight using a normal distribution.
+        calculate_scores: Calculates the scores of an array of distances in one vectorised pass.
+        generate_random_edge: Generates a random weight using a normal distribution,
+                              see EdgeWeightSampler for generating many weights.
     """
     def __init__(self, base_score: int = 100) -> None:
         """Construct the attributes of the random score generator.
@@ -96,14 +108,74 @@ class RandomScoreGenerator:
         if self._generated_distance is None:
             self._generated_distance = self.generate_random_distance()
             
-        # Calculate score
-        norm_distribution = stats.norm(self._mean, self._sd)
         # Calculate the probability that the node dist > a random generated distance
-        prob = 1 - norm_distribution.cdf(dist)
+        prob = 1 - self._normal_cdf(dist)
         # Take the inverse of prob so the longer the node distance (the lower the prob), the higher the score
         # Use expononential to exaggerate the difference
         return int(np.exp(1 / prob) + self.base_score / 2)
-    
+
+    def calculate_scores(self, distances: np.ndarray) -> np.ndarray:
+        """Calculates the scores of an array of distances in one vectorised pass.
+
+        Notes:
+            The normal distribution takes the same erf / erfc branches as _normal_cdf, so the scores shown for the nodes
+            equal those of calculate_score, except that scores beyond the range of a 64-bit integer,
+            including the infinite score of a distance with zero probability, are capped at MAX_SCORE.
+
+        Args:
+            distances (np.ndarray): A one-dimensional array of non-negative distances.
+
+        Returns:
+            np.ndarray: An int64 array of the scores, aligned with the input distances.
+
+        Raises:
+            ValueError: If the distances are not a one-dimensional array of non-negative numbers.
+        """
+        distances = np.asarray(distances, dtype=float)
+        if distances.ndim != 1 or not (distances >= 0).all():
+            raise ValueError("Distances must be a one-dimensional array of non-negative numbers.")
+
+        # If generated distance is not already set, generate it
+        if self._generated_distance is None:
+            self._generated_distance = self.generate_random_distance()
+
+        # Evaluate the normal CDF with the same operations as _normal_cdf
+        if not self._sd:
+            cdf = (distances >= self._mean).astype(float)
+        else:
+            z = (distances - self._mean) / self._sd * _SQRT1_2
+            central = np.abs(z) < _SQRT1_2
+            cdf = np.empty_like(z)
+            cdf[central] = 0.5 + 0.5 * _erf(z[central])
+            tail = 0.5 * _erfc(np.abs(z[~central]))
+            cdf[~central] = np.where(z[~central] > 0, 1 - tail, tail)
+        prob = 1 - cdf
+        with np.errstate(divide='ignore', over='ignore'):
+            scores = np.exp(1 / prob) + self.base_score / 2
+
+        # Cap the scores which overflow a 64-bit integer before the conversion
+        overflow = scores >= 2.0 ** 63
+        scores[overflow] = 0
+        scores = scores.astype(np.int64)
+        scores[overflow] = MAX_SCORE
+        return scores
+
+    def _normal_cdf(self, x: int | float) -> float:
+        """The cumulative distribution function of the normal distribution with the generator's mean and sd.
+
+        Notes:
+            Computed in closed form with the error function, taking the same erf / erfc branches as scipy's ndtr
+            so the scores match those of scipy.stats.norm without constructing a distribution object per call.
+        """
+        # A zero standard deviation degenerates to a step at the mean
+        if not self._sd:
+            return float(x >= self._mean)
+        z = (x - self._mean) / self._sd * _SQRT1_2
+        if abs(z) < _SQRT1_2:
+            return 0.5 + 0.5 * math.erf(z)
+        tail = 0.5 * math.erfc(abs(z))
+        return 1 - tail if z > 0 else tail
+
     @staticmethod
     def generate_random_edge(mean: int, sd: int | float) -> int:
         """Generates a random weight using a normal distribution.
@@ -122,3 +194,80 @@ class RandomScoreGenerator:
             raise ValueError("Standard deviation must be a non-negative numeric value.")
         # Generate random weight, ensuring it's at least 1
         return max(int(np.random.normal(loc=mean, scale=sd)), 1)
+
+
+class EdgeWeightSampler:
+    """A buffered sampler of edge weights, drawing the same weights as generate_random_edge in vectorised blocks.
+
+    Notes:
+        The parameters are validated once, and the blocks grow geometrically from min_block to max_block,
+        so small graphs do not draw weights they never use while large graphs pay for very few numpy calls.
+
+    Attributes:
+        mean: The mean weight of the edges.
+        sd: The standard deviation of the weight of the edges.
+        rng: The numpy Generator drawing the weights, or None for the global numpy random state.
+
+    Methods:
+        __call__: Get the next weight from the buffer.
+        sample: Draw an array of weights in one vectorised call.
+    """
+    def __init__(self,
+                 mean: int = 5,
+                 sd: int | float = 3,
+                 rng: np.random.Generator | None = None,
+                 min_block: int = 64,
+                 max_block: int = 65536) -> None:
+        """Construct the sampler bound to a mean, a standard deviation and a random generator.
+
+        Args:
+            mean (int): The mean weight of the edges (default = 5).
+            sd (int | float): The standard deviation of the weight of the edges (default = 3).
+            rng (np.random.Generator): The random generator, the global numpy random state if None (default = None).
+            min_block (int): The size of the first block of weights (default = 64).
+            max_block (int): The maximum size of a block of weights (default = 65536).
+
+        Raises:
+            ValueError: If mean is not a non-negative integer, sd is not a non-negative number
+                        or the block sizes are not positive.
+        """
+        if not isinstance(mean, int) or mean < 0:
+            raise ValueError("Mean must be a non-negative integer.")
+        if not isinstance(sd, (int, float)) or sd < 0:
+            raise ValueError("Standard deviation must be a non-negative numeric value.")
+        if not 0 < min_block <= max_block:
+            raise ValueError("Block sizes must be positive and min_block must not exceed max_block.")
+
+        self.mean = mean
+        self.sd = sd
+        self.rng = rng
+        self._block_size = min_block
+        self._max_block = max_block
+        self._buffer = iter(())
+
+    def __call__(self) -> int:
+        """Get the next weight from the buffer, drawing a new block when it runs out.
+
+        Returns:
+            int: A randomly generated weight of at least 1.
+        """
+        try:
+            return next(self._buffer)
+        except StopIteration:
+            self._buffer = iter(self.sample(self._block_size).tolist())
+            self._block_size = min(self._block_size * 2, self._max_block)
+            return next(self._buffer)
+
+    def sample(self, size: int) -> np.ndarray:
+        """Draw an array of weights in one vectorised call, bypassing the buffer.
+
+        Args:
+            size (int): The number of weights.
+
+        Returns:
+            np.ndarray: An int64 array of weights of at least 1.
+        """
+        rng = np.random if self.rng is None else self.rng
+        # Truncate towards zero like int() and ensure every weight is at least 1
+        weights = rng.normal(loc=self.mean, scale=self.sd, size=size).astype(np.int64)
+        return np.maximum(weights, 1, out=weights)
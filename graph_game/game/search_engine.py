@@ -1,15 +1,19 @@
 from typing import List, Tuple
 
-from ..database.database import DatabaseConnection
+from ..database.backends import StorageBackend, get_backend
 from ..data_structures.trie import Trie
 
 
 class SearchEngine:
-    def __init__(self) -> None:
+    def __init__(self, backend: StorageBackend | None = None) -> None:
         """A search engine that provides searching functionality for the leaderboard in the Graph Game.
 
+        Args:
+            backend (StorageBackend): The storage of the players (default = the configured backend).
+
         Attributes:
             trie: An instance of the trie data structure.
+            backend: The storage backend which the players are fetched from.
         
         Methods:
             complete_search: Complete a word based on the input and return the list of word combinations ordered by their length.
@@ -18,6 +22,7 @@ class SearchEngine:
             fetch_all_users_to_trie: Fetch all the players from the database to the trie.
         """
         self.trie = None
+        self.backend = backend if backend is not None else get_backend()
         self.fetch_all_users_to_trie()
         
     def complete_search(self, input_str: str) -> List[str]:
@@ -43,19 +48,8 @@ class SearchEngine:
         # Get at most 10 users with at most 5 Levenshtein distance away from the name input
         players = self.trie.fizzy_search(name, threshold=5, num_return=10)
 
-        res = []
-
-        with DatabaseConnection('db') as conn:
-            for player in players:
-                # Fetch the player name and score from the database
-                player_name_score = conn.cursor().execute(
-                    'SELECT username, balance FROM players WHERE username = ?', (player,)
-                ).fetchone()
-
-                # Append the records of the players to the res list
-                res.append(player_name_score)
-
-        return res
+        # Fetch the player names and balances from the storage
+        return self.backend.get_players(players)
 
     def get_leaders(self, n: int) -> List[Tuple[str, int]]:
         """Get the n players with the highest balance.
@@ -72,23 +66,15 @@ class SearchEngine:
         if not isinstance(n, int) or n < 1:
             raise ValueError("Input parameter 'n' must be a postive integer")
 
-        with DatabaseConnection('db') as conn:
-            leaders_name_score = conn.cursor().execute(
-                'SELECT username, balance FROM players ORDER BY balance DESC'
-            ).fetchall()
-            
-        return leaders_name_score[:n]
+        return self.backend.get_leaders(n)
 
     def fetch_all_users_to_trie(self) -> None:  
         """Fetch all the players from the database to the trie."""
-        with DatabaseConnection('db') as conn:
-            # Get a list of all players
-            players = conn.cursor().execute(
-                'SELECT username FROM players'
-            ).fetchall()
+        # Get a list of all players
+        players = self.backend.get_usernames()
         
         self.trie = Trie()
 
         # Insert every player into the trie
         for player in players:
-            self.trie.insert(*player)
+            self.trie.insert(player)
@@ -0,0 +1,168 @@
+"""The game flow of a round, independent of any user interface.
+
+A round is played with three calls: start_round deals a new board, place_bet fixes the bid and the starting node
+and reveals the scores of the nodes, and settle resolves the round for the ending node, applying the score to the
+balance and logging the game. The Tk app and the HTTP server in graph_game.server are both clients of the service.
+"""
+from dataclasses import dataclass
+from typing import NamedTuple
+
+import numpy as np
+
+from ..database.backends import StorageBackend, get_backend
+from .game_logic import GraphGame, RoundResult
+from .round_pool import RoundPool
+
+
+def build_game(size: int | None = None) -> GraphGame:
+    """Generate a game and precompute its distances, without the layout drawn by the app.
+
+    The function is importable by a worker process, so the games of the server are generated in a process pool.
+
+    Args:
+        size (int): The number of nodes of a big board, or None for a game of 8 to 10 nodes (default = None).
+    """
+    game = GraphGame.random_start(size=size)
+    game.prepare(layout=False)
+    return game
+
+
+def distances_from(game: GraphGame, starting_node: int) -> np.ndarray:
+    """Compute the shortest distances from the starting node of a game, stored back with game.set_distances_from.
+
+    The function is importable by a worker process, so the server runs Dijkstra's algorithm of big boards in its process pool.
+    """
+    return game.distances_from(starting_node)
+
+
+@dataclass
+class Round:
+    """The state of a round played by a player.
+
+    Attributes:
+        username: The player of the round.
+        game: The game of the round.
+        bid: The bid of the player, None until the bet is placed.
+        result: The outcome of the round, None until it is settled.
+        topped_up: Whether the balance of the player was topped up when the round started.
+    """
+    username: str
+    game: GraphGame
+    bid: int | None = None
+    result: RoundResult | None = None
+    topped_up: bool = False
+
+
+class Settlement(NamedTuple):
+    """The outcome of a settled round and the new balance of the player, None if the storage failed."""
+    result: RoundResult
+    balance: int | None
+
+
+class GameService:
+    """Validates the moves of the players, resolves their rounds and stores the outcomes.
+
+    Attributes:
+        backend: The storage of the players, their balances and their games.
+        round_pool: The pool of prepared games dealt to the rounds.
+
+    Methods:
+        start_round: Start a new round of a player, topping up an empty balance.
+        place_bet: Place the bid on a starting node and get the scores of the nodes.
+        settle: Resolve the round for the ending node and apply its score to the balance.
+    """
+
+    # The balance given to a player who has nothing left to bid
+    TOP_UP_BALANCE = 50
+
+    def __init__(self, backend: StorageBackend | None = None, round_pool: RoundPool | None = None) -> None:
+        """Construct the service.
+
+        Args:
+            backend (StorageBackend): The storage of the players (default = the configured backend).
+            round_pool (RoundPool): The pool of prepared games (default = a new RoundPool of classic games).
+        """
+        self.backend = backend if backend is not None else get_backend()
+        self.round_pool = round_pool if round_pool is not None else RoundPool()
+
+    def start_round(self, username: str, game: GraphGame | None = None) -> Round:
+        """Start a new round of a player on a prepared game.
+
+        Notes:
+            A player whose balance is below 1 is topped up to TOP_UP_BALANCE, so they can keep playing.
+
+        Args:
+            username (str): The player of the round.
+            game (GraphGame): The prepared game of the round, e.g. built in another process (default = a game of the round pool).
+
+        Returns:
+            The new Round.
+
+        Raises:
+            ValueError: Error caused by a player who is not registered.
+        """
+        balance = self.backend.get_balance(username)
+        if balance is None:
+            raise ValueError(f"The player {username!r} is not registered")
+
+        topped_up = balance < 1
+        if topped_up:
+            self.backend.update_balance(username, self.TOP_UP_BALANCE)
+        return Round(username, game if game is not None else self.round_pool.get(), topped_up=topped_up)
+
+    def place_bet(self, round: Round, bid: int, starting_node: int) -> np.ndarray:
+        """Place the bid of the round on a starting node, generating the cutoff distance.
+
+        Args:
+            round (Round): The round started by start_round.
+            bid (int): The bid, between 1 and the balance of the player.
+            starting_node (int): The index of the starting node.
+
+        Returns:
+            The scores of the nodes, in the order of round.game.get_nodes().
+
+        Raises:
+            TypeError: Error caused by a non-integer bid or node.
+            ValueError: Errors caused by a bet placed twice, a bid out of range or a node not in the graph.
+        """
+        if round.bid is not None:
+            raise ValueError("The bet of the round has already been placed")
+        if not isinstance(bid, int) or isinstance(bid, bool):
+            raise TypeError("The bid must be an integer")
+        balance = self.backend.get_balance(round.username)
+        if bid < 1 or balance is None or bid > balance:
+            raise ValueError(f"The bid must be between 1 and the balance of the player ({balance})")
+
+        round.game.set_starting_node(starting_node)
+        round.game.set_base_score(bid)
+        round.game.generate_cutoff()
+        round.bid = bid
+        return round.game.score_all_nodes()
+
+    def settle(self, round: Round, ending_node: int) -> Settlement:
+        """Resolve the round for the ending node, apply its score to the balance and log the game.
+
+        Args:
+            round (Round): The round whose bet has been placed.
+            ending_node (int): The index of the ending node, other than the starting node.
+
+        Returns:
+            A Settlement of the outcome of the round and the new balance of the player.
+
+        Raises:
+            TypeError: Error caused by a non-integer node.
+            ValueError: Errors caused by a round without a bet, a round settled twice or an invalid ending node.
+        """
+        if round.bid is None:
+            raise ValueError("The bet of the round has not been placed")
+        if round.result is not None:
+            raise ValueError("The round has already been settled")
+        game = round.game
+        if ending_node == game.starting_node:
+            raise ValueError("The ending node must differ from the starting node")
+
+        game.set_ending_node(ending_node)
+        round.result = game.resolve_round()
+        outcome = 'win' if round.result.won else 'loss'
+        balance = self.backend.settle_round(round.username, round.bid, game.starting_node, ending_node, outcome, round.result.score)
+        return Settlement(round.result, balance)
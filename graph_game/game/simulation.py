@@ -0,0 +1,215 @@
+"""Headless Monte-Carlo simulation of the game economics.
+
+Rounds are played with GraphGame exactly as in the app, without importing tkinter, matplotlib or networkx,
+so candidate values of the edge weights, the cutoff spread and the scoring formula can be compared
+over millions of rounds.
+
+To run a simulation, enter 'python3 -m graph_game.game.simulation --rounds 1000000 --strategy safest' in terminal.
+"""
+import multiprocessing
+import os
+import random as rand
+from typing import Callable, Dict, List, NamedTuple, Tuple
+
+import numpy as np
+
+from .game_logic import GraphGame
+
+
+class SimulationConfig(NamedTuple):
+    """The parameters of a simulation."""
+    rounds: int = 100_000
+    strategy: str = 'random'
+    bid: int = 10
+    edge_mean: int = 5
+    edge_sd: int | float = 3
+    cutoff_sd_multiplier: int | float = GraphGame.CUTOFF_SD_MULTIPLIER
+    seed: int = 0
+    workers: int | None = None
+    chunk_size: int = 10_000
+
+
+class SimulationReport(NamedTuple):
+    """The aggregated outcome of the simulated rounds."""
+    rounds: int
+    wins: int
+    total_bid: int
+    total_payout: int
+    score_percentiles: Dict[int, float]
+    mean_score: float
+    max_score: int
+
+    @property
+    def win_rate(self) -> float:
+        """The fraction of the rounds won by the player."""
+        return self.wins / self.rounds if self.rounds else 0.0
+
+    @property
+    def house_edge(self) -> float:
+        """The expected loss of the player per unit of bid, negative if the game favours the player."""
+        return -self.total_payout / self.total_bid if self.total_bid else 0.0
+
+    def __str__(self) -> str:
+        """Return the report as a human readable table."""
+        percentiles = ', '.join(f'p{q} = {value:.0f}' for q, value in self.score_percentiles.items())
+        return (f'rounds:     {self.rounds}\n'
+                f'win rate:   {self.win_rate:.4f}\n'
+                f'house edge: {self.house_edge:.4f}\n'
+                f'mean score: {self.mean_score:.2f} (max = {self.max_score})\n'
+                f'scores:     {percentiles}')
+
+
+# A strategy chooses the ending node from the scores and the distances shown to the player,
+# returning its position in the arrays; the starting node is at position 'start'
+Strategy = Callable[[np.ndarray, np.ndarray, int, np.random.Generator], int]
+
+
+def random_strategy(scores: np.ndarray, distances: np.ndarray, start: int, rng: np.random.Generator) -> int:
+    """Choose any node other than the starting node uniformly at random."""
+    choice = int(rng.integers(len(scores) - 1))
+    return choice + (choice >= start)
+
+
+def safest_strategy(scores: np.ndarray, distances: np.ndarray, start: int, rng: np.random.Generator) -> int:
+    """Choose the nearest node, which is the most likely to win the lowest score."""
+    distances = distances.copy()
+    distances[start] = np.inf
+    return int(np.argmin(distances))
+
+
+def riskiest_strategy(scores: np.ndarray, distances: np.ndarray, start: int, rng: np.random.Generator) -> int:
+    """Choose the node with the highest score, which is the least likely to win."""
+    scores = scores.copy()
+    scores[start] = -1
+    return int(np.argmax(scores))
+
+
+STRATEGIES: Dict[str, Strategy] = {
+    'random': random_strategy,
+    'safest': safest_strategy,
+    'riskiest': riskiest_strategy,
+}
+
+# The percentiles of the scores included in the report
+PERCENTILES = (1, 5, 25, 50, 75, 95, 99)
+
+
+def play_round(config: SimulationConfig, strategy: Strategy, rng: np.random.Generator) -> Tuple[bool, int]:
+    """Play one round of the game with a random graph and starting node.
+
+    Args:
+        config (SimulationConfig): The parameters of the game.
+        strategy (callable): The strategy choosing the ending node.
+        rng (np.random.Generator): The random generator of the player.
+
+    Returns:
+        A tuple of whether the player won and the score of the round, the negative bid for a loss.
+    """
+    game = GraphGame.random_start(edge_mean=config.edge_mean,
+                                  edge_sd=config.edge_sd,
+                                  cutoff_sd_multiplier=config.cutoff_sd_multiplier)
+    game.set_base_score(config.bid)
+
+    # The player picks a random starting node, then sees the scores of the other nodes
+    nodes = game.get_nodes()
+    start = int(rng.integers(len(nodes)))
+    game.set_starting_node(nodes[start])
+    game.generate_cutoff()
+    scores = game.score_all_nodes()
+    distances = game.distances_from(nodes[start])
+
+    game.set_ending_node(nodes[strategy(scores, distances, start, rng)])
+    result = game.resolve_round()
+    return result.won, result.score
+
+
+def _run_chunk(task: Tuple[SimulationConfig, np.random.SeedSequence, int]) -> Tuple[int, int, np.ndarray]:
+    """Play a chunk of rounds in a worker process.
+
+    Notes:
+        The global generators used by GraphGame are reseeded from the chunk's own seed sequence,
+        so the results do not depend on which worker plays the chunk.
+
+    Returns:
+        A tuple of the number of wins, the total payout and the float array of the scores.
+    """
+    config, seed_sequence, rounds = task
+    game_seed, player_seed = seed_sequence.spawn(2)
+    rand.seed(int(game_seed.generate_state(1)[0]))
+    np.random.seed(game_seed.generate_state(1))
+    rng = np.random.default_rng(player_seed)
+    strategy = STRATEGIES[config.strategy]
+
+    wins = 0
+    total_payout = 0
+    scores = np.empty(rounds)
+    for i in range(rounds):
+        won, score = play_round(config, strategy, rng)
+        wins += won
+        total_payout += score
+        scores[i] = score
+    return wins, total_payout, scores
+
+
+def simulate(config: SimulationConfig = SimulationConfig()) -> SimulationReport:
+    """Play the configured number of rounds across a pool of worker processes.
+
+    Args:
+        config (SimulationConfig): The parameters of the simulation.
+
+    Returns:
+        A SimulationReport of the house edge, the win rate and the distribution of the scores.
+
+    Raises:
+        ValueError: Errors caused by an unknown strategy or non-positive numbers of rounds, workers or chunk size.
+    """
+    if config.strategy not in STRATEGIES:
+        raise ValueError(f"Unknown strategy {config.strategy!r}, expected one of {sorted(STRATEGIES)}")
+    if config.rounds <= 0 or config.chunk_size <= 0 or config.workers is not None and config.workers <= 0:
+        raise ValueError("The number of rounds, the workers and the chunk size must be positive")
+
+    # Split the rounds into chunks, each with an independent seed
+    num_chunks = -(-config.rounds // config.chunk_size)
+    chunk_rounds = [config.chunk_size] * (num_chunks - 1) + [config.rounds - config.chunk_size * (num_chunks - 1)]
+    seeds = np.random.SeedSequence(config.seed).spawn(num_chunks)
+    tasks = [(config, seed, rounds) for seed, rounds in zip(seeds, chunk_rounds)]
+
+    workers = min(config.workers or os.cpu_count() or 1, num_chunks)
+    if workers == 1:
+        results = list(map(_run_chunk, tasks))
+    else:
+        with multiprocessing.Pool(workers) as pool:
+            results = pool.map(_run_chunk, tasks)
+
+    return _merge(config, results)
+
+
+def _merge(config: SimulationConfig, results: List[Tuple[int, int, np.ndarray]]) -> SimulationReport:
+    """Aggregate the results of the chunks into a report."""
+    scores = np.concatenate([chunk_scores for _, _, chunk_scores in results])
+    return SimulationReport(rounds=len(scores),
+                            wins=sum(wins for wins, _, _ in results),
+                            total_bid=config.bid * len(scores),
+                            total_payout=sum(payout for _, payout, _ in results),
+                            score_percentiles=dict(zip(PERCENTILES, np.percentile(scores, PERCENTILES).tolist())),
+                            mean_score=float(scores.mean()),
+                            max_score=int(scores.max()))
+
+
+if __name__ == '__main__':
+    import argparse
+
+    defaults = SimulationConfig()
+    parser = argparse.ArgumentParser(description='Simulate rounds of the Graph Game without the GUI.')
+    parser.add_argument('--rounds', type=int, default=defaults.rounds)
+    parser.add_argument('--strategy', choices=sorted(STRATEGIES), default=defaults.strategy)
+    parser.add_argument('--bid', type=int, default=defaults.bid)
+    parser.add_argument('--edge-mean', type=int, default=defaults.edge_mean)
+    parser.add_argument('--edge-sd', type=float, default=defaults.edge_sd)
+    parser.add_argument('--cutoff-sd-multiplier', type=float, default=defaults.cutoff_sd_multiplier)
+    parser.add_argument('--seed', type=int, default=defaults.seed)
+    parser.add_argument('--workers', type=int, default=defaults.workers)
+    parser.add_argument('--chunk-size', type=int, default=defaults.chunk_size)
+    args = parser.parse_args()
+
+    print(simulate(SimulationConfig(**vars(args))))
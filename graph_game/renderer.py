@@ -0,0 +1,319 @@
+"""Drawing of the game board on a persistent matplotlib figure.
+
+The renderer owns one figure whose artists are created once and updated in place every round,
+so redrawing never allocates new figures, canvases or widgets. It does not depend on Tk:
+the app attaches the figure to a FigureCanvasTkAgg, tests and scripts to any other canvas.
+
+The static board is rasterised once per round and kept in an LRU cache, the node scores and
+the result path are then drawn onto a copy of the cached bitmap.
+"""
+from collections import OrderedDict
+from typing import Dict, Hashable, Iterable, List, Tuple
+
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
+from matplotlib.text import Text
+import numpy as np
+
+from .data_structures.kd_tree import KDTree
+from .game.game_logic import GraphGame
+
+
+# Boards with more nodes than this are drawn without node labels, scores and edge labels off the result path
+DETAILED_DRAWING_MAX_NODES = 100
+
+# The default colors of the networkx drawing functions
+NODE_COLOR = '#1f78b4'
+EDGE_COLOR = 'k'
+
+# The distance in pixels within which a click selects the nearest node
+HIT_RADIUS = 20
+
+
+class TextPool:
+    """A growing pool of text artists reused across redraws, hiding the artists which are not needed.
+
+    Methods:
+        update: Show the texts at their positions, reusing the existing artists.
+    """
+    def __init__(self, ax, **text_kwargs) -> None:
+        """Construct an empty pool of texts drawn on the axes with the same style."""
+        self.ax = ax
+        self.text_kwargs = text_kwargs
+        self.texts: List[Text] = []
+
+    def update(self, items: Iterable[Tuple[float, float, str]]) -> None:
+        """Show the texts at their positions, reusing the existing artists.
+
+        Args:
+            items (iterable): Tuples of the x and y coordinates and the string of each text.
+        """
+        count = 0
+        for count, (x, y, string) in enumerate(items, start=1):
+            if count > len(self.texts):
+                self.texts.append(self.ax.text(x, y, string, **self.text_kwargs))
+            text = self.texts[count - 1]
+            text.set_position((x, y))
+            text.set_text(string)
+            text.set_visible(True)
+
+        # Hide the texts left over from a previous redraw
+        for text in self.texts[count:]:
+            text.set_visible(False)
+
+
+class RenderCache:
+    """A least recently used cache of the rasterised static boards.
+
+    Attributes:
+        maxsize: The maximum number of bitmaps kept.
+        bitmaps: A hashmap mapping the key of a board to its bitmap, ordered from the least to the most recently used.
+
+    Methods:
+        get: Get the bitmap of a key, or None if it is not cached.
+        put: Cache the bitmap of a key, evicting the least recently used bitmap if the cache is full.
+    """
+    def __init__(self, maxsize: int = 4) -> None:
+        """Construct an empty cache of at most maxsize bitmaps."""
+        self.maxsize = maxsize
+        self.bitmaps = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.bitmaps)
+
+    def get(self, key: Hashable):
+        """Get the bitmap of a key, or None if it is not cached."""
+        bitmap = self.bitmaps.get(key)
+        if bitmap is not None:
+            self.bitmaps.move_to_end(key)
+        return bitmap
+
+    def put(self, key: Hashable, bitmap) -> None:
+        """Cache the bitmap of a key, evicting the least recently used bitmap if the cache is full."""
+        self.bitmaps[key] = bitmap
+        self.bitmaps.move_to_end(key)
+        if len(self.bitmaps) > self.maxsize:
+            self.bitmaps.popitem(last=False)
+
+
+class BoardRenderer:
+    """Draws the graph of a round, the node scores and the result path on a persistent figure.
+
+    Attributes:
+        fig: The matplotlib figure.
+        ax: The axes of the board.
+        game: The game currently drawn.
+        cache: The RenderCache of the rasterised static boards.
+
+    Methods:
+        render: Draw the game with the requested overlays, redrawing the board only when the game changed.
+        draw: Draw the figure on its canvas, compositing the overlays onto the cached bitmap of the board.
+        draw_board: Draw the nodes and edges of a new game.
+        show_scores: Show or hide the score labels above the nodes.
+        show_path: Show or hide the shortest path of the round and its edge labels.
+        node_at: Get the node drawn nearest to a point of the canvas, for selecting nodes by clicking.
+    """
+    def __init__(self, figsize: Tuple[float, float] = (3, 3), dpi: int = 200, cache_size: int = 8) -> None:
+        """Create the figure and the artists of the board and its overlays."""
+        self.fig = Figure(figsize=figsize, dpi=dpi)
+        self.ax = self.fig.add_subplot(111)
+        self.ax.set_axis_off()
+        self.game = None
+        self.cache = RenderCache(cache_size)
+        self._board_key = None
+        self._coords = np.empty((0, 2))
+        self._node_ids = []
+        self._node_tree = None
+        self._node_tree_scale = None
+
+        # The static artists of the board
+        self._edges = LineCollection([], colors=EDGE_COLOR, alpha=0.5, zorder=1)
+        self.ax.add_collection(self._edges)
+        self._nodes = self.ax.scatter([], [], color=NODE_COLOR, zorder=2)
+        self._node_labels = TextPool(self.ax, fontsize=10, ha='center', va='center', zorder=3)
+
+        # The overlays updated during the round
+        self._path = LineCollection([], linewidths=3, zorder=1)
+        self.ax.add_collection(self._path)
+        self._score_labels = TextPool(self.ax, fontsize=4, fontweight='bold', ha='center', va='center', zorder=4)
+        self._edge_labels = TextPool(self.ax, fontsize=4, ha='center', va='center', zorder=4,
+                                     bbox=dict(boxstyle='round', ec=(1.0, 1.0, 1.0), fc=(1.0, 1.0, 1.0)))
+
+    def draw(self, canvas) -> None:
+        """Draw the figure on its canvas, compositing the overlays onto the cached bitmap of the board.
+
+        Notes:
+            The bitmap holds the static artists at or below the lowest visible overlay, e.g. only the edges
+            under the result path, and is rasterised alone on a cache miss. The artists above it are drawn
+            onto a copy of the bitmap in the order of their z-order, so the image matches a full redraw.
+
+        Args:
+            canvas: The Agg based canvas of the figure, e.g. a FigureCanvasTkAgg or a FigureCanvasAgg.
+        """
+        overlays = [artist for artist in self.__overlays() if artist.get_visible()]
+        lowest = min((artist.get_zorder() for artist in overlays), default=float('inf'))
+        static = [artist for artist in self.__static() if artist.get_visible()]
+        above = [artist for artist in static if artist.get_zorder() > lowest]
+
+        # The board is cached once with every static artist and once without the artists above the result path
+        key = (self._board_key, canvas.get_width_height(), self.fig.dpi, len(above))
+        bitmap = self.cache.get(key)
+        if bitmap is None:
+            # Rasterise the static artists below the overlays alone
+            for artist in overlays + above:
+                artist.set_visible(False)
+            canvas.draw()
+            bitmap = canvas.copy_from_bbox(self.fig.bbox)
+            self.cache.put(key, bitmap)
+            for artist in overlays + above:
+                artist.set_visible(True)
+
+        # Draw the artists above the bitmap onto a copy of it
+        canvas.restore_region(bitmap)
+        for artist in sorted(above + overlays, key=lambda artist: artist.get_zorder()):
+            self.ax.draw_artist(artist)
+        canvas.blit(self.fig.bbox)
+
+    def render(self, game: GraphGame, with_node_scores: bool = False, result: bool = False) -> None:
+        """Draw the game with the requested overlays, redrawing the board only when the game changed.
+
+        Args:
+            game (GraphGame): The game of the round.
+            with_node_scores (bool): If True, the scores are shown above the nodes.
+            result (bool): If True, the shortest path of the round is highlighted.
+        """
+        if game is not self.game:
+            self.draw_board(game)
+        self.show_scores(with_node_scores)
+        self.show_path(result)
+
+    def draw_board(self, game: GraphGame) -> None:
+        """Draw the nodes and edges of a new game, with the edge widths proportional to their weights on detailed boards."""
+        self.game = game
+        detailed = self.__detailed()
+        positions = game.node_position
+        nodes = game.get_nodes()
+        coords = np.array([positions[node] for node in nodes], dtype=float).reshape(-1, 2)
+
+        # Collect each undirected edge once, from the node with the lower index
+        edges = [(idx, neighbour.get_index(), weight)
+                 for idx, node in game.node_map.items()
+                 for neighbour, weight in node.get_neighbours()
+                 if idx < neighbour.get_index()]
+        self._edges.set_segments([(positions[idx1], positions[idx2]) for idx1, idx2, _ in edges])
+        self._edges.set_linewidths([weight for _, _, weight in edges] if detailed else 0.1)
+
+        self._nodes.set_offsets(coords)
+        self._nodes.set_sizes([150 if detailed else 2])
+        self._node_labels.update((x, y, str(node)) for node, (x, y) in zip(nodes, coords) if detailed)
+
+        # Fit the axes to the nodes with a margin, expanded to accommodate the score labels shown later in the round,
+        # so the limits of the cached board do not change with the overlays
+        if len(coords):
+            low, high = coords.min(axis=0), coords.max(axis=0)
+            margin = np.maximum((high - low) * 0.1, 0.1)
+            self.ax.set_xlim(low[0] - margin[0], high[0] + margin[0])
+            expansion = (high[1] - low[1] + 2 * margin[1]) * 0.1
+            self.ax.set_ylim(low[1] - margin[1] - expansion, high[1] + margin[1] + expansion)
+
+        # Identify the board by its layout and edges
+        self._board_key = hash((coords.tobytes(), tuple(edges), detailed))
+
+        # Index the nodes for hit testing when the board is first clicked
+        self._coords = coords
+        self._node_ids = nodes
+        self._node_tree = None
+
+    def show_scores(self, visible: bool = True) -> None:
+        """Show or hide the scores above the nodes, only the starting and ending node on big boards.
+
+        Raises:
+            NameError: Error raised if the score_generator or the starting node have not been defined.
+        """
+        game = self.game
+        labels = {}
+        if visible:
+            if not game.starting_node or not game.score_generator:
+                raise NameError('The score_generator or the starting node have not been defined.')
+
+            scores = game.score_all_nodes()
+            if self.__detailed():
+                # Map each node, except the starting node, to its score
+                labels = {node: score for node, score in zip(game.get_nodes(), scores.tolist()) if node != game.starting_node}
+            else:
+                labels = {game.starting_node: 'start'}
+                if game.ending_node:
+                    labels[game.ending_node] = int(scores[game.node_index.position(game.ending_node)])
+
+        # Set the labels to be 0.135 units above the nodes
+        self._score_labels.update((game.node_position[node][0], game.node_position[node][1] + 0.135, str(label))
+                                  for node, label in labels.items())
+
+    def show_path(self, visible: bool = True) -> None:
+        """Show or hide the shortest path of the round in green for a win or red for a loss, with its edge labels.
+
+        Every edge is labelled on a detailed board, only the edges along the path on a big board.
+        """
+        game = self.game
+        path_edges = []
+        edge_labels: Dict[Tuple[int, int], int] = {}
+        if visible:
+            round_result = game.resolve_round()
+            path_edges = list(zip(round_result.path, round_result.path[1:]))
+            self._path.set_color('g' if round_result.won else 'r')
+
+            if self.__detailed():
+                edge_labels = {(idx, neighbour.get_index()): weight
+                               for idx, node in game.node_map.items()
+                               for neighbour, weight in node.get_neighbours()
+                               if idx < neighbour.get_index()}
+            else:
+                edge_labels = {(idx1, idx2): game.node_map[idx1].neighbours[game.node_map[idx2]] for idx1, idx2 in path_edges}
+
+        positions = game.node_position
+        self._path.set_segments([(positions[idx1], positions[idx2]) for idx1, idx2 in path_edges])
+        self._path.set_visible(bool(path_edges))
+        self._edge_labels.update(((positions[idx1][0] + positions[idx2][0]) / 2,
+                                  (positions[idx1][1] + positions[idx2][1]) / 2,
+                                  str(weight))
+                                 for (idx1, idx2), weight in edge_labels.items())
+
+    def __static(self) -> List:
+        """Get the artists of the board, drawn once per round."""
+        return [self._edges, self._nodes, *self._node_labels.texts]
+
+    def node_at(self, x: float, y: float, radius: float = HIT_RADIUS) -> int | None:
+        """Get the node drawn nearest to a point of the canvas with a search in a k-d tree of the nodes.
+
+        Notes:
+            The tree holds the positions of the nodes scaled to pixels, so the nearest node is the nearest one on
+            the screen even if the axes are stretched. It is rebuilt only for a new board or a resized canvas.
+
+        Args:
+            x (float): The horizontal position of the point in pixels, e.g. the x attribute of a matplotlib mouse event.
+            y (float): The vertical position of the point in pixels, from the bottom of the figure.
+            radius (float): The maximum distance in pixels between the point and the node (default = HIT_RADIUS).
+
+        Returns:
+            The index of the nearest node, or None if there is no node within the radius.
+        """
+        if not len(self._node_ids):
+            return None
+
+        # The axes are linear, so data coordinates are scaled to pixels by the diagonal of the affine transform
+        scale = np.abs(np.diag(self.ax.transData.get_affine().get_matrix())[:2])
+        if self._node_tree is None or not np.array_equal(scale, self._node_tree_scale):
+            self._node_tree = KDTree(self._coords * scale, ids=self._node_ids)
+            self._node_tree_scale = scale
+
+        point = self.ax.transData.inverted().transform((x, y)) * scale
+        node, distance = self._node_tree.nearest(point)
+        return node if distance <= radius else None
+
+    def __overlays(self) -> List:
+        """Get the artists updated during a round."""
+        return [self._path, *self._score_labels.texts, *self._edge_labels.texts]
+
+    def __detailed(self) -> bool:
+        """Check whether the board is small enough to be drawn with every label."""
+        return self.game.num_nodes <= DETAILED_DRAWING_MAX_NODES
@@ -0,0 +1,362 @@
+"""An asyncio HTTP/JSON front end of the game service, serving the rounds of many players from one process.
+
+Endpoints, with JSON request and response bodies; every endpoint but /login and /health takes the token
+returned by /login in an 'Authorization: Bearer <token>' header:
+    POST /login     {"username", "password"}        -> {"token", "balance"}
+    POST /rounds    {}                              -> {"nodes", "edges", "topped_up", "balance"}
+    POST /bet       {"bid", "starting_node"}        -> {"scores"}
+    POST /settle    {"ending_node"}                 -> {"won", "score", "distance", "path", "cutoff", "balance"}
+                                                       (distance is null and path empty for an unreachable node)
+    GET  /health                                    -> {"status", "sessions"}
+
+The event loop never blocks: the games are generated, their distances precomputed and the distances from the
+starting node of a big board computed in a process pool, and the calls of the service, which query the database
+and look the distances up, run in a thread pool. The sessions are kept in memory
+and evicted once their player has been idle for config.SESSION_TTL seconds.
+
+To start the server, enter 'python3 -m graph_game.server --port 8000' in terminal.
+"""
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import suppress
+from http import HTTPStatus
+import json
+import logging
+import signal
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+import numpy as np
+
+from . import config
+from .game.game_logic import GraphGame
+from .game.round_pool import RoundPool
+from .game.service import GameService, build_game, distances_from
+from .sessions import Session, SessionManager
+
+logger = logging.getLogger(__name__)
+
+# The largest request body accepted, in bytes
+MAX_BODY_SIZE = 64 * 1024
+
+
+class HTTPError(Exception):
+    """An error answered with an HTTP status and a JSON error message, closing the connection if close is True."""
+
+    def __init__(self, status: HTTPStatus, message: str, close: bool = False) -> None:
+        super().__init__(message)
+        self.status = status
+        self.message = message
+        self.close = close
+
+
+def to_json(value: Any) -> Any:
+    """Convert the numpy values of a response into JSON types."""
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+class GameServer:
+    """Serves the game service over HTTP/1.1 with keep-alive connections.
+
+    Attributes:
+        service: The GameService playing the rounds.
+        sessions: The SessionManager of the logged in players.
+        board_size: The number of nodes of the boards, None for the classic game of 8 to 10 nodes.
+        game_executor: The process pool generating the games, None to generate them on the thread pool.
+        db_executor: The thread pool running the calls of the service.
+
+    Methods:
+        start: Start listening for connections and evicting the idle sessions.
+        close: Stop evicting the sessions and shut the pools down.
+        handle_connection: Serve the requests of a connection until it is closed.
+        dispatch: Route a request to its endpoint.
+    """
+
+    def __init__(self,
+                 service: GameService | None = None,
+                 sessions: SessionManager | None = None,
+                 processes: int | None = None,
+                 threads: int | None = None,
+                 board_size: int | None = None) -> None:
+        """Construct the server of the service.
+
+        Args:
+            service (GameService): The service playing the rounds (default = a service of the configured backend).
+            sessions (SessionManager): The sessions of the players (default = a manager with config.SESSION_TTL).
+            processes (int): The number of processes generating the games, 0 generates them on the thread pool
+                             (default = config.SERVER_PROCESSES).
+            threads (int): The number of threads running the calls of the service (default = the ThreadPoolExecutor default).
+            board_size (int): The number of nodes of the boards (default = config.BOARD_SIZE).
+        """
+        # The server generates its own games, so the service keeps no round pool of its own
+        self.service = service if service is not None else GameService(round_pool=RoundPool(depth=0))
+        self.sessions = sessions if sessions is not None else SessionManager()
+        processes = config.SERVER_PROCESSES if processes is None else processes
+        board_size = config.BOARD_SIZE if board_size is None else board_size
+        self.board_size = board_size or None
+        self.game_executor = ProcessPoolExecutor(processes) if processes else None
+        self.db_executor = ThreadPoolExecutor(threads, thread_name_prefix='graph-game-db')
+        self._evictor = None
+        self.routes: Dict[Tuple[str, str], Callable[[Dict[str, str], dict], Awaitable[dict]]] = {
+            ('POST', '/login'): self.login,
+            ('POST', '/rounds'): self.start_round,
+            ('POST', '/bet'): self.place_bet,
+            ('POST', '/settle'): self.settle,
+            ('GET', '/health'): self.health,
+        }
+
+    async def start(self, host: str = '127.0.0.1', port: int = 8000) -> asyncio.AbstractServer:
+        """Start listening for connections, returning the asyncio server."""
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        self._evictor = asyncio.create_task(self.sessions.evict_periodically())
+        logger.info("Serving on %s", ', '.join(str(sock.getsockname()) for sock in server.sockets))
+        return server
+
+    async def close(self) -> None:
+        """Stop evicting the idle sessions and shut the pools down once their running calls have finished."""
+        if self._evictor is not None:
+            self._evictor.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._evictor
+        for executor in (self.game_executor, self.db_executor):
+            if executor is not None:
+                await asyncio.get_running_loop().run_in_executor(None, executor.shutdown)
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve the requests of a connection one after another until the client closes it."""
+        try:
+            while True:
+                try:
+                    request = await self.__read_request(reader)
+                    if request is None:
+                        break
+                    method, path, headers, body = request
+                    status, response = HTTPStatus.OK, await self.dispatch(method, path, headers, body)
+                    keep_alive = headers.get('connection', '').lower() != 'close'
+                except HTTPError as e:
+                    status, response, keep_alive = e.status, {'error': e.message}, e.status < 500 and not e.close
+                self.__write_response(writer, status, response, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def dispatch(self, method: str, path: str, headers: Dict[str, str], body: bytes) -> dict:
+        """Route a request to its endpoint and return the JSON response.
+
+        Raises:
+            HTTPError: Errors caused by an unknown endpoint, an invalid body or an invalid move of the player.
+        """
+        endpoint = self.routes.get((method, path))
+        if endpoint is None:
+            allowed = any(route_path == path for _, route_path in self.routes)
+            raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED if allowed else HTTPStatus.NOT_FOUND, f"{method} {path} is not supported")
+
+        try:
+            params = json.loads(body) if body else {}
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "The body is not valid JSON")
+        if not isinstance(params, dict):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "The body must be a JSON object")
+
+        try:
+            return await endpoint(headers, params)
+        except (KeyError, TypeError, ValueError) as e:
+            # Invalid moves and missing parameters are the client's errors
+            message = f"Missing parameter {e}" if isinstance(e, KeyError) else str(e)
+            raise HTTPError(HTTPStatus.BAD_REQUEST, message)
+        except HTTPError:
+            raise
+        except Exception:
+            logger.exception("Error serving %s %s", method, path)
+            raise HTTPError(HTTPStatus.INTERNAL_SERVER_ERROR, "Internal server error")
+
+    async def login(self, headers: Dict[str, str], params: dict) -> dict:
+        """Authenticate the player and open a session."""
+        user = await self.__run(self.db_executor, self.service.backend.authenticate, params['username'], params['password'])
+        if not user:
+            raise HTTPError(HTTPStatus.UNAUTHORIZED, "Invalid username or password")
+        username, balance = user
+        return {'token': self.sessions.create(username, balance), 'balance': balance}
+
+    async def start_round(self, headers: Dict[str, str], params: dict) -> dict:
+        """Deal a new board, generated in the process pool, to the player."""
+        session = self.__session(headers)
+        game = await self.__run(self.game_executor or self.db_executor, build_game, self.board_size)
+        async with session.lock:
+            session.round = await self.__run(self.db_executor, self.service.start_round, session.username, game)
+            if session.round.topped_up:
+                session.balance = GameService.TOP_UP_BALANCE
+        edges = [(idx, neighbour.get_index(), weight)
+                 for idx, node in game.node_map.items()
+                 for neighbour, weight in node.get_neighbours()
+                 if idx < neighbour.get_index()]
+        return {'nodes': game.get_nodes(), 'edges': edges, 'topped_up': session.round.topped_up, 'balance': session.balance}
+
+    async def place_bet(self, headers: Dict[str, str], params: dict) -> dict:
+        """Place the bid of the player's round on the starting node."""
+        session = self.__session(headers, playing=True)
+        async with session.lock:
+            round = session.round
+            await self.__compute_distances(round.game, params['starting_node'])
+            scores = await self.__run(self.db_executor, self.service.place_bet, round, params['bid'], params['starting_node'])
+        return {'scores': dict(zip(round.game.get_nodes(), scores.tolist()))}
+
+    async def settle(self, headers: Dict[str, str], params: dict) -> dict:
+        """Resolve the player's round for the ending node."""
+        session = self.__session(headers, playing=True)
+        async with session.lock:
+            if session.round.game.starting_node is not None:
+                await self.__compute_distances(session.round.game, session.round.game.starting_node)
+            result, balance = await self.__run(self.db_executor, self.service.settle, session.round, params['ending_node'])
+            if balance is not None:
+                session.balance = balance
+        return {'won': result.won,
+                'score': result.score,
+                # JSON has no infinity, the distance of an unreachable node is null
+                'distance': result.distance if result.distance != float('inf') else None,
+                'path': result.path,
+                'cutoff': result.cutoff,
+                'balance': balance}
+
+    async def health(self, headers: Dict[str, str], params: dict) -> dict:
+        """Report that the server is up and the number of open sessions."""
+        return {'status': 'ok', 'sessions': len(self.sessions)}
+
+    def __session(self, headers: Dict[str, str], playing: bool = False) -> Session:
+        """Get the session of the bearer token of the request.
+
+        Raises:
+            HTTPError: Errors caused by a missing or unknown token, or a session without a round if playing is True.
+        """
+        scheme, _, token = headers.get('authorization', '').partition(' ')
+        session = self.sessions.get(token) if scheme.lower() == 'bearer' else None
+        if session is None:
+            # The token is unknown or its session has expired
+            raise HTTPError(HTTPStatus.UNAUTHORIZED, "Log in to play")
+        if playing and session.round is None:
+            raise HTTPError(HTTPStatus.CONFLICT, "Start a round first")
+        return session
+
+    async def __compute_distances(self, game: GraphGame, starting_node: Any) -> None:
+        """Compute the distances from a node of the game in the process pool, unless they are computed already.
+
+        The service then looks the distances up on the thread pool, which never runs Dijkstra's algorithm
+        of a big board while holding the GIL. Invalid nodes are left to the validation of the service.
+        """
+        if (self.game_executor is None
+                or not isinstance(starting_node, int)
+                or starting_node not in game.node_map
+                or game.has_distances_from(starting_node)):
+            return
+        distances = await self.__run(self.game_executor, distances_from, game, starting_node)
+        game.set_distances_from(starting_node, distances)
+
+    async def __run(self, executor: Executor, function: Callable, *args: Any) -> Any:
+        """Run a blocking call in one of the pools of the server."""
+        return await asyncio.get_running_loop().run_in_executor(executor, function, *args)
+
+    async def __read_request(self, reader: asyncio.StreamReader) -> Tuple[str, str, Dict[str, str], bytes] | None:
+        """Read the method, the path, the lower-cased headers and the body of a request, or None at the end of the stream.
+
+        Raises:
+            HTTPError: Errors caused by a malformed request or a body which is too large.
+        """
+        request_line = await self.__read_line(reader)
+        if not request_line.strip():
+            return None
+        try:
+            method, target, _ = request_line.decode('latin-1').split()
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Malformed request line")
+
+        headers = {}
+        while (line := await self.__read_line(reader)) not in (b'\r\n', b'\n', b''):
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        try:
+            length = int(headers.get('content-length', 0))
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Invalid Content-Length")
+        if length > MAX_BODY_SIZE:
+            raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "The body is too large")
+        body = await reader.readexactly(length) if length > 0 else b''
+        return method, target.split('?', 1)[0], headers, body
+
+    @staticmethod
+    async def __read_line(reader: asyncio.StreamReader) -> bytes:
+        """Read a line of the request head.
+
+        Raises:
+            HTTPError: Error caused by a line longer than the limit of the stream, closing the connection
+                       as the rest of the line cannot be told apart from the next request.
+        """
+        try:
+            return await reader.readline()
+        except (asyncio.LimitOverrunError, ValueError):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "A line of the request is too long", close=True)
+
+    def __write_response(self, writer: asyncio.StreamWriter, status: HTTPStatus, response: dict, keep_alive: bool) -> None:
+        """Write a JSON response, or an internal server error if the response cannot be encoded."""
+        try:
+            body = json.dumps(response, default=to_json, allow_nan=False).encode()
+        except (TypeError, ValueError):
+            logger.exception("Error encoding the response %r", response)
+            status, keep_alive = HTTPStatus.INTERNAL_SERVER_ERROR, False
+            body = json.dumps({'error': "Internal server error"}).encode()
+        writer.write(f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                     f"Content-Type: application/json\r\n"
+                     f"Content-Length: {len(body)}\r\n"
+                     f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1') + body)
+
+
+async def serve(host: str,
+                port: int,
+                game_server: GameServer | None = None,
+                on_start: Callable[[asyncio.AbstractServer], None] | None = None) -> None:
+    """Serve the game service until the process receives SIGTERM or SIGINT, then close the server.
+
+    Notes:
+        Closing the server shuts its process pool down, so no worker process outlives the server.
+
+    Args:
+        host (str): The host to listen on.
+        port (int): The port to listen on, 0 for a free port.
+        game_server (GameServer): The server to run (default = a GameServer of the configured backend).
+        on_start (callable): A callable receiving the asyncio server once it listens (default = None).
+    """
+    game_server = game_server if game_server is not None else GameServer()
+    loop = asyncio.get_running_loop()
+    stopped = asyncio.Event()
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(signum, stopped.set)
+    try:
+        server = await game_server.start(host, port)
+        if on_start is not None:
+            on_start(server)
+        async with server:
+            await stopped.wait()
+        logger.info("Stopping the server")
+    finally:
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            loop.remove_signal_handler(signum)
+        await game_server.close()
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Serve the Graph Game over HTTP/JSON.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(serve(args.host, args.port))
@@ -0,0 +1,131 @@
+"""The sessions of the players logged in to the server, kept in memory and evicted after a period of inactivity.
+
+The sessions are only accessed from the event loop of the server, so the manager needs no thread lock.
+"""
+import asyncio
+from collections import OrderedDict
+from dataclasses import dataclass, field
+import logging
+import secrets
+import time
+from typing import Callable
+
+from . import config
+from .game.service import Round
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Session:
+    """The state of a logged in player.
+
+    Attributes:
+        username: The player of the session.
+        balance: The last known balance of the player.
+        round: The round the player is playing, None before the first round.
+        last_seen: The time of the last request of the player, on the clock of the SessionManager.
+        lock: The lock serialising the moves of the player, so concurrent requests cannot play the round twice.
+    """
+    username: str
+    balance: int
+    round: Round | None = None
+    last_seen: float = 0.0
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock, repr=False, compare=False)
+
+    @property
+    def pending_bet(self) -> int | None:
+        """The bid placed on the round which has not been settled yet, if any."""
+        if self.round is None or self.round.result is not None:
+            return None
+        return self.round.bid
+
+
+class SessionManager:
+    """Keeps the sessions of the players by token, evicting the ones idle for longer than the TTL.
+
+    The sessions are ordered from the least to the most recently used, so eviction stops at the first live session.
+
+    Attributes:
+        ttl: The seconds a session is kept after the last request of its player.
+        evicted: The number of sessions evicted so far.
+
+    Methods:
+        create: Open a session for a player and get its token.
+        get: Get the live session of a token, marking it as used.
+        remove: Close a session.
+        evict_expired: Evict the sessions idle for longer than the TTL.
+        evict_periodically: Evict the expired sessions at an interval until cancelled.
+    """
+
+    def __init__(self, ttl: float | None = None, clock: Callable[[], float] = time.monotonic) -> None:
+        """Construct an empty manager.
+
+        Args:
+            ttl (float): The seconds a session is kept after the last request (default = config.SESSION_TTL).
+            clock (callable): The clock of the last requests, in seconds (default = time.monotonic).
+
+        Raises:
+            ValueError: Error caused by a non-positive TTL.
+        """
+        ttl = config.SESSION_TTL if ttl is None else ttl
+        if ttl <= 0:
+            raise ValueError("Input parameter 'ttl' must be positive")
+
+        self.ttl = ttl
+        self.clock = clock
+        self.evicted = 0
+        self._sessions: OrderedDict[str, Session] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def create(self, username: str, balance: int) -> str:
+        """Open a session for a player.
+
+        Returns:
+            The token of the new session.
+        """
+        token = secrets.token_urlsafe(16)
+        self._sessions[token] = Session(username, balance, last_seen=self.clock())
+        return token
+
+    def get(self, token: str) -> Session | None:
+        """Get the session of a token and mark it as used, or None if it is unknown or has expired."""
+        self.evict_expired()
+        session = self._sessions.get(token)
+        if session is not None:
+            session.last_seen = self.clock()
+            self._sessions.move_to_end(token)
+        return session
+
+    def remove(self, token: str) -> None:
+        """Close the session of a token, if it is open."""
+        self._sessions.pop(token, None)
+
+    def evict_expired(self) -> int:
+        """Evict the sessions idle for longer than the TTL.
+
+        Returns:
+            The number of evicted sessions.
+        """
+        deadline = self.clock() - self.ttl
+        evicted = 0
+        while self._sessions:
+            token, session = next(iter(self._sessions.items()))
+            if session.last_seen > deadline:
+                break
+            del self._sessions[token]
+            evicted += 1
+
+        if evicted:
+            self.evicted += evicted
+            logger.debug("Evicted %d idle sessions, %d left", evicted, len(self._sessions))
+        return evicted
+
+    async def evict_periodically(self, interval: float | None = None) -> None:
+        """Evict the expired sessions at an interval, a tenth of the TTL by default, until the task is cancelled."""
+        interval = self.ttl / 10 if interval is None else interval
+        while True:
+            await asyncio.sleep(interval)
+            self.evict_expired()
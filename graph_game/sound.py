@@ -0,0 +1,147 @@
+"""A non-blocking audio service playing the soundtrack and the sound clips of the game.
+
+The mixer is initialised and the clips are decoded on a background thread, so neither pygame nor the audio
+files are loaded on the Tk startup path. Without pygame, an audio device or with GRAPH_GAME_AUDIO=0,
+every call is a no-op.
+"""
+import logging
+import os
+import threading
+from typing import Dict, Sequence
+
+logger = logging.getLogger(__name__)
+
+AUDIO_DIR = os.path.join(os.path.dirname(__file__), 'audio')
+
+# The music looped while the app is open
+SOUNDTRACK = 'Menu_Audio'
+
+# The clips decoded in advance, played when the player wins a round
+WIN_SOUNDS = ('Happy_Sound1', 'Happy_Sound2', 'Happy_Sound3')
+
+
+class AudioService:
+    """Loads the soundtrack and the clips in the background and plays them without blocking the caller.
+
+    Attributes:
+        audio_dir: The directory of the mp3 files.
+        clips: The names of the clips decoded in advance.
+        enabled: Whether the audio is enabled; a disabled service never imports pygame.
+        sounds: A hashmap mapping the name of a clip to its decoded pygame Sound.
+        available: Whether the mixer has been initialised.
+
+    Methods:
+        start: Initialise the mixer and decode the clips on a background thread.
+        wait: Wait until the background loading has finished.
+        play: Play a decoded clip, or do nothing if it is not loaded.
+        set_music: Play or pause the soundtrack.
+    """
+
+    def __init__(self,
+                 enabled: bool = True,
+                 audio_dir: str = AUDIO_DIR,
+                 clips: Sequence[str] = WIN_SOUNDS,
+                 soundtrack: str | None = SOUNDTRACK,
+                 volume: float = 0.5) -> None:
+        """Construct the service without loading anything."""
+        self.enabled = enabled
+        self.audio_dir = audio_dir
+        self.clips = tuple(clips)
+        self.soundtrack = soundtrack
+        self.volume = volume
+        self.sounds: Dict[str, object] = {}
+        self.available = False
+        self._music_on = True
+        self._mixer = None
+        self._lock = threading.Lock()
+        self._loaded = threading.Event()
+        self._thread = None
+
+    def start(self) -> None:
+        """Initialise the mixer, start the soundtrack and decode the clips on a background thread."""
+        if not self.enabled:
+            self._loaded.set()
+            return
+        if self._thread is None:
+            self._thread = threading.Thread(target=self.__load, name='audio-loader', daemon=True)
+            self._thread.start()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Wait until the background loading has finished, returning False if the timeout expired first."""
+        return self._loaded.wait(timeout)
+
+    def play(self, name: str) -> bool:
+        """Play a decoded clip on a free channel of the mixer, without waiting for it to finish.
+
+        Args:
+            name (str): The name of the clip, the file name without the .mp3 extension.
+
+        Returns:
+            True if the clip was played, False if the audio is unavailable or the clip is not loaded yet.
+        """
+        sound = self.sounds.get(name)
+        if sound is None:
+            return False
+        try:
+            sound.play()
+        except Exception as e:
+            logger.warning("Cannot play the sound %r: %s", name, e)
+            return False
+        return True
+
+    def set_music(self, on: bool) -> None:
+        """Play or pause the soundtrack, remembering the choice if the mixer is still loading."""
+        with self._lock:
+            self._music_on = on
+            if self.available:
+                self.__apply_music()
+
+    def __load(self) -> None:
+        """Initialise the mixer, start the soundtrack and decode the clips into the cache."""
+        try:
+            try:
+                import pygame
+
+                pygame.mixer.init()
+                if not pygame.mixer.get_init():
+                    raise RuntimeError("the mixer did not initialise")
+            except Exception as e:
+                # pygame is not installed or there is no audio device, e.g. on a headless machine
+                logger.info("Audio disabled: %s", e)
+                return
+
+            with self._lock:
+                self._mixer = pygame.mixer
+                if self.soundtrack:
+                    try:
+                        pygame.mixer.music.load(self.__path(self.soundtrack))
+                        pygame.mixer.music.set_volume(self.volume)
+                        pygame.mixer.music.play(-1)
+                    except Exception as e:
+                        logger.warning("Cannot play the soundtrack %r: %s", self.soundtrack, e)
+                self.available = True
+                # Keep the music paused if it was switched off while loading
+                self.__apply_music()
+
+            for name in self.clips:
+                try:
+                    self.sounds[name] = pygame.mixer.Sound(self.__path(name))
+                except Exception as e:
+                    logger.warning("Cannot load the sound %r: %s", name, e)
+        finally:
+            self._loaded.set()
+
+    def __apply_music(self) -> None:
+        """Pause or unpause the soundtrack according to the last choice of the player."""
+        try:
+            if self._music_on:
+                self._mixer.music.unpause()
+            else:
+                self._mixer.music.pause()
+        except Exception as e:
+            # The audio device was lost after the mixer started, keep the app running without music
+            logger.warning("Cannot switch the soundtrack: %s", e)
+
+    def __path(self, name: str) -> str:
+        """Get the path of the mp3 file of a sound."""
+        return os.path.join(self.audio_dir, name + '.mp3')
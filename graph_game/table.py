@@ -0,0 +1,143 @@
+"""A virtualised table widget, showing a window of the rows of a sequence in a fixed number of Treeview items.
+
+Only the visible rows are read from the sequence, so a PagedSequence of the game history is fetched from
+the storage page by page while scrolling, and only the items whose values changed are updated in Tk.
+"""
+from collections.abc import Sequence
+from typing import List, Tuple
+
+import tkinter as tk
+from tkinter import ttk
+
+
+class RowWindow:
+    """The window of visible rows of a sequence and the values shown in each slot of the table.
+
+    Attributes:
+        height: The number of visible rows.
+        rows: The sequence of the rows of the table.
+        first: The index of the first visible row.
+        shown: The values shown in each slot, None for an empty slot.
+
+    Methods:
+        set_rows: Replace the sequence of rows, keeping the scroll position if possible.
+        scroll_to: Scroll the window so the row is the first visible row.
+        scroll_by: Scroll the window by a number of rows.
+        changes: Get the slots whose shown values differ from the visible rows.
+        fractions: Get the fractions of the rows above and including the window, as expected by a scrollbar.
+    """
+
+    def __init__(self, height: int) -> None:
+        """Construct a window of empty slots.
+
+        Raises:
+            ValueError: Error caused by a non-positive height.
+        """
+        if height < 1:
+            raise ValueError("The height of the table must be positive")
+        self.height = height
+        self.rows: Sequence = []
+        self.first = 0
+        self.shown: List[tuple | None] = [None] * height
+
+    def set_rows(self, rows: Sequence) -> None:
+        """Replace the sequence of rows, keeping the scroll position if possible."""
+        self.rows = rows
+        self.scroll_to(self.first)
+
+    def scroll_to(self, first: int) -> None:
+        """Scroll the window so the row is the first visible row, clamped so the window stays within the rows."""
+        self.first = max(0, min(first, len(self.rows) - self.height))
+
+    def scroll_by(self, count: int) -> None:
+        """Scroll the window down by a number of rows, up if the number is negative."""
+        self.scroll_to(self.first + count)
+
+    def changes(self) -> List[Tuple[int, tuple | None]]:
+        """Get the slots whose shown values differ from the visible rows, and mark them as shown.
+
+        Returns:
+            A list of tuples of the slot index and its new values, None if the slot becomes empty.
+        """
+        visible = self.rows[self.first:self.first + self.height]
+        # Fetching the rows may find fewer rows than the sequence counted, scroll back within them
+        while len(visible) < self.height and self.first > max(0, len(self.rows) - self.height):
+            self.scroll_to(self.first)
+            visible = self.rows[self.first:self.first + self.height]
+        changed = []
+        for slot in range(self.height):
+            values = tuple(visible[slot]) if slot < len(visible) else None
+            if values != self.shown[slot]:
+                self.shown[slot] = values
+                changed.append((slot, values))
+        return changed
+
+    def fractions(self) -> Tuple[float, float]:
+        """Get the fractions of the rows above and including the window, as expected by a scrollbar."""
+        if len(self.rows) <= self.height:
+            return 0.0, 1.0
+        return self.first / len(self.rows), (self.first + self.height) / len(self.rows)
+
+
+class VirtualTable(ttk.Frame):
+    """A table with a vertical scrollbar, showing the rows of a sequence in a fixed number of Treeview items.
+
+    Attributes:
+        tree: The Treeview of the table, whose headings and columns are configured by the caller.
+        scrollbar: The vertical scrollbar of the table.
+        window: The RowWindow of the visible rows.
+
+    Methods:
+        set_rows: Show a new sequence of rows.
+        refresh: Update the items whose rows changed and the scrollbar.
+        yview: Scroll the table, called by the scrollbar.
+    """
+
+    def __init__(self, parent: tk.Misc, columns: Tuple[str, ...], height: int = 10, **tree_kwargs) -> None:
+        """Create the Treeview with one item per visible row and the scrollbar."""
+        super().__init__(parent)
+        self.window = RowWindow(height)
+
+        self.tree = ttk.Treeview(self, columns=columns, show='headings', height=height, **tree_kwargs)
+        self.scrollbar = ttk.Scrollbar(self, orient='vertical', command=self.yview)
+        self.tree.pack(side='left', fill='both', expand=True)
+        self.scrollbar.pack(side='right', fill='y')
+
+        # The items are created once and detached while their slot is empty
+        self.items = [self.tree.insert('', 'end') for _ in range(height)]
+        self.tree.detach(*self.items)
+
+        # Scroll with the mouse wheel on Windows and macOS, and with buttons 4 and 5 on X11
+        self.tree.bind('<MouseWheel>', lambda event: self.__scroll(-1 if event.delta > 0 else 1))
+        self.tree.bind('<Button-4>', lambda event: self.__scroll(-1))
+        self.tree.bind('<Button-5>', lambda event: self.__scroll(1))
+
+    def set_rows(self, rows: Sequence) -> None:
+        """Show a new sequence of rows, updating only the items whose rows changed."""
+        self.window.set_rows(rows)
+        self.refresh()
+
+    def refresh(self) -> None:
+        """Update the items whose rows changed and the scrollbar."""
+        for slot, values in self.window.changes():
+            item = self.items[slot]
+            if values is None:
+                self.tree.detach(item)
+            else:
+                self.tree.item(item, values=values)
+                self.tree.move(item, '', slot)
+        self.scrollbar.set(*self.window.fractions())
+
+    def yview(self, *args: str) -> None:
+        """Scroll the table with the 'moveto fraction' or 'scroll number units|pages' commands of the scrollbar."""
+        if args[0] == 'moveto':
+            self.window.scroll_to(round(float(args[1]) * len(self.window.rows)))
+        elif args[0] == 'scroll':
+            self.window.scroll_by(int(args[1]) * (self.window.height if args[2] == 'pages' else 1))
+        self.refresh()
+
+    def __scroll(self, count: int) -> str:
+        """Scroll the table by a number of rows on a mouse wheel event."""
+        self.window.scroll_by(count)
+        self.refresh()
+        return 'break'
@@ -0,0 +1,4 @@
+import os
+
+# Run the tests without audio, the config is read when the game is first imported
+os.environ.setdefault('GRAPH_GAME_AUDIO', '0')
@@ -0,0 +1,164 @@
+import os
+import subprocess
+import sys
+import tkinter as tk
+import unittest
+from unittest.mock import MagicMock, patch
+
+from graph_game import config
+from graph_game.app import FrameRegistry, GraphGameGUI, updated_leaders
+from graph_game.database import credentials
+from graph_game.database.backends import InMemoryBackend
+
+
+def display_available():
+    """Check whether the windows of the app can be created"""
+    try:
+        tk.Tk().destroy()
+    except tk.TclError:
+        return False
+    return True
+
+
+# The tests of the windows of the app are skipped without a display
+DISPLAY = display_available()
+
+
+class TestFrameRegistry(unittest.TestCase):
+    def test_frames_constructed_on_first_access(self):
+        """Test frames are constructed once, on their first access"""
+        parent = object()
+        menu, play = MagicMock(), MagicMock()
+        frames = FrameRegistry(parent, {'menu': menu, 'play': play})
+        self.assertEqual((list(frames), len(frames)), (['menu', 'play'], 2))
+        self.assertIsNone(frames.created('menu'))
+        menu.assert_not_called()
+
+        self.assertIs(frames['menu'], menu.return_value)
+        self.assertIs(frames['menu'], frames.created('menu'))
+        menu.assert_called_once_with(parent)
+        play.assert_not_called()
+        # The frame is stacked in the cell of the other frames, beneath the shown frame
+        menu.return_value.grid.assert_called_once_with(row=0, column=0, sticky='nsew')
+        menu.return_value.lower.assert_called_once_with()
+        with self.assertRaises(KeyError):
+            frames['settings']
+
+    def test_deferred_imports(self):
+        """Test importing the app does not import matplotlib, networkx, pygame or scipy"""
+        code = ('import sys, graph_game.app\n'
+                'sys.exit(any(name in sys.modules for name in ("matplotlib", "networkx", "pygame", "scipy")))')
+        project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        self.assertEqual(subprocess.run([sys.executable, '-c', code], cwd=project_root).returncode, 0)
+
+    def test_messagebox_imported(self):
+        """Test the app imports the message box itself rather than relying on matplotlib to import it"""
+        code = 'import sys, graph_game.app; sys.exit("tkinter.messagebox" not in sys.modules)'
+        project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        self.assertEqual(subprocess.run([sys.executable, '-c', code], cwd=project_root).returncode, 0)
+
+
+class AppTestCase(unittest.TestCase):
+    """Tests of the app running on an in-memory backend."""
+
+    def setUp(self):
+        """Start the app on an in-memory backend, without audio and with cheap hashing"""
+        for patcher in (patch('graph_game.app.get_backend', return_value=InMemoryBackend()),
+                        patch.object(config, 'AUDIO', False),
+                        patch.dict(credentials.HASH_PARAMS, scrypt_n=16, pbkdf2_iterations=10)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.app = GraphGameGUI()
+        self.addCleanup(self.app.destroy)
+        self.app.backend.register_player('Femi', 'password', 100)
+
+    def login(self, username, password):
+        """Fill in the login frame and press the login button"""
+        login = self.app.frames['login']
+        login.username_Entry.insert(0, username)
+        login.password_Entry.insert(0, password)
+        login.login()
+
+
+@unittest.skipUnless(DISPLAY, 'needs a display')
+class TestSwitchFrame(AppTestCase):
+    def test_switch_raises_frame(self):
+        """Test switching raises the new frame without changing the geometry of the window and records the latency"""
+        self.app.update()
+        geometry = self.app.geometry()
+        register = self.app.frames['register']
+        with patch.object(register, 'tkraise', wraps=register.tkraise) as mock_tkraise:
+            self.app.switch_frame('login', 'register')
+        mock_tkraise.assert_called_once_with()
+        self.app.update()
+        self.assertEqual(self.app.geometry(), geometry)
+        (current_frame, new_frame, latency), = self.app.switch_latencies
+        self.assertEqual((current_frame, new_frame), ('login', 'register'))
+        self.assertGreater(latency, 0)
+
+    def test_focus_restored(self):
+        """Test the widget focused when the player left a frame is focused again when the frame is shown"""
+        entry = self.app.frames['login'].password_Entry
+        with patch.object(self.app, 'focus_get', return_value=entry):
+            self.app.switch_frame('login', 'register')
+        self.assertEqual(self.app.frame_focus, {'login': entry})
+        with patch.object(entry, 'focus_set') as mock_focus_set:
+            self.app.switch_frame('register', 'login')
+        mock_focus_set.assert_called_once_with()
+
+
+@unittest.skipUnless(DISPLAY, 'needs a display')
+class TestLogin(AppTestCase):
+    def test_wrong_password(self):
+        """Test a wrong password shows an error and keeps the player logged out"""
+        with patch('graph_game.app.messagebox.showinfo') as mock_showinfo:
+            self.login('Femi', 'wrong')
+        mock_showinfo.assert_called_once_with("Error", "The player is not found.")
+        self.assertIsNone(self.app.current_player)
+
+    def test_service_started_by_login(self):
+        """Test the round pool is started by the first login rather than at launch"""
+        self.assertIsNone(self.app._service)
+        self.login('Femi', 'password')
+        self.addCleanup(self.app.service.round_pool.close)
+        self.assertEqual(self.app.current_player, 'Femi')
+        self.assertTrue(self.app.service.round_pool._worker.is_alive())
+
+
+@unittest.skipUnless(DISPLAY, 'needs a display')
+class TestPlay(AppTestCase):
+    def test_same_node_typed_differently(self):
+        """Test an ending node typed with a leading zero is rejected as the starting node without settling the round"""
+        self.login('Femi', 'password')
+        self.addCleanup(self.app.service.round_pool.close)
+        play = self.app.frames['play']
+        node = next(iter(play.game.node_map))
+        play.bid_scale.set(10)
+        play.starting_node_combobox.set(str(node))
+        play.update_starting_ending_node_combobox_state()
+        play.ending_node_combobox.set(f'0{node}')
+        with patch.object(self.app.service, 'settle') as mock_settle:
+            play.bet_start_game()
+        mock_settle.assert_not_called()
+        self.assertEqual(play.Ending_node_combobox_Label.cget('fg'), 'red')
+
+
+class TestUpdatedLeaders(unittest.TestCase):
+    def test_balances_applied(self):
+        """Test new balances reorder the leaders without querying the backend"""
+        get_leaders = MagicMock()
+        leaders = updated_leaders([('Femi', 100), ('Tom', 50), ('Alex', 30)], {'Alex': 120, 'Sam': 40, 'Kim': 10}, 3, get_leaders)
+        self.assertEqual(leaders, [('Alex', 120), ('Femi', 100), ('Tom', 50)])
+        get_leaders.assert_not_called()
+
+        self.assertEqual(updated_leaders([('Femi', 100)], {'Kim': 10}, 3, get_leaders), [('Femi', 100), ('Kim', 10)])
+
+    def test_leader_dropping_out(self):
+        """Test the leaders are queried again if a leader of a full table drops below the lowest balance"""
+        get_leaders = MagicMock(return_value='queried')
+        self.assertEqual(updated_leaders([('Femi', 100), ('Tom', 50), ('Alex', 30)], {'Femi': 20}, 3, get_leaders), 'queried')
+        get_leaders.assert_called_once_with(3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,131 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from graph_game import events
+from graph_game.database import backends
+from graph_game.database.backends import InMemoryBackend, SQLiteBackend
+from graph_game.database.database import DatabaseConnection
+
+
+class BackendTests:
+    """Tests shared by every storage backend."""
+
+    def setUp(self):
+        """Register two players in the backend"""
+        self.backend.initialize()
+        self.backend.register_player('Femi', 'password', 100)
+        self.backend.register_player('Tom', 'secret', 50)
+
+    def test_register_and_authenticate(self):
+        """Test registration and authentication"""
+        self.assertTrue(self.backend.registered('Femi'))
+        self.assertFalse(self.backend.registered('Alex'))
+        self.assertEqual(tuple(self.backend.authenticate('Femi', 'password')), ('Femi', 100))
+        self.assertFalse(self.backend.authenticate('Femi', 'wrong'))
+        self.assertFalse(self.backend.authenticate('Alex', 'password'))
+
+    def test_settle_round(self):
+        """Test settle_round updates the balance and the history"""
+        self.assertEqual(self.backend.settle_round('Tom', 10, 1, 2, 'win', 80), 130)
+        self.assertEqual(self.backend.get_balance('Tom'), 130)
+        self.assertEqual(tuple(self.backend.get_player_history('Tom')[0][:5]), (10, 1, 2, 'win', 80))
+        self.assertIsNone(self.backend.settle_round('Alex', 10, 1, 2, 'win', 80))
+
+    def test_player_history_pages(self):
+        """Test the history is returned newest first, in pages of limit records after offset records"""
+        for start in range(1, 6):
+            self.backend.log_game('Femi', 10, start, 6, 'win', 20)
+        self.assertEqual([record[1] for record in self.backend.get_player_history('Femi')], [5, 4, 3, 2, 1])
+        self.assertEqual([record[1] for record in self.backend.get_player_history('Femi', 2)], [5, 4])
+        self.assertEqual([record[1] for record in self.backend.get_player_history('Femi', 2, 2)], [3, 2])
+        self.assertEqual([record[1] for record in self.backend.get_player_history('Femi', 2, 4)], [1])
+        self.assertEqual([record[1] for record in self.backend.get_player_history('Femi', offset=3)], [2, 1])
+        self.assertEqual(self.backend.get_player_history('Femi', 2, 5), [])
+        self.assertEqual(self.backend.get_player_history('Tom', 2), [])
+
+    def test_events_published(self):
+        """Test registrations, balance changes and logged games are published to the event bus"""
+        published = []
+        for event in (events.BALANCE_CHANGED, events.GAME_LOGGED, events.PLAYER_REGISTERED):
+            callback = lambda event=event, **payload: published.append((event, payload))
+            events.bus.subscribe(event, callback)
+            self.addCleanup(events.bus.unsubscribe, event, callback)
+
+        self.backend.register_player('Alex', 'password', 100)
+        self.backend.update_balance('Alex', 90)
+        self.backend.settle_round('Alex', 10, 1, 2, 'win', 80)
+        self.assertEqual([event for event, _ in published],
+                         [events.PLAYER_REGISTERED, events.BALANCE_CHANGED, events.BALANCE_CHANGED, events.GAME_LOGGED])
+        self.assertEqual(published[2][1], {'username': 'Alex', 'balance': 170})
+        self.assertEqual(published[3][1]['record'][:5], (10, 1, 2, 'win', 80))
+        # The published record is the one stored in the history
+        self.assertEqual(published[3][1]['record'], tuple(self.backend.get_player_history('Alex')[0]))
+
+    def test_leaderboard(self):
+        """Test the leaders follow balance updates"""
+        self.assertEqual([tuple(row) for row in self.backend.get_leaders(2)], [('Femi', 100), ('Tom', 50)])
+        self.backend.update_balance('Tom', 150)
+        self.assertEqual([tuple(row) for row in self.backend.get_leaders(1)], [('Tom', 150)])
+
+    def test_get_players(self):
+        """Test get_players keeps the input order and skips unknown players"""
+        self.assertEqual(self.backend.get_players(['Tom', 'Alex', 'Femi']), [('Tom', 50), ('Femi', 100)])
+        self.assertEqual(sorted(self.backend.get_usernames()), ['Femi', 'Tom'])
+
+    def test_player_stats(self):
+        """Test the summary statistics are updated with every logged game and can be rebuilt"""
+        self.assertIsNone(self.backend.get_player_stats('Femi'))
+        self.backend.settle_round('Femi', 10, 1, 2, 'win', 80)
+        self.backend.settle_round('Femi', 30, 1, 3, 'loss', -30)
+        self.backend.log_game('Femi', 20, 2, 3, 'win', 70)
+        stats = self.backend.get_player_stats('Femi')
+        self.assertEqual(tuple(stats), (3, 2, 60, 120, 80))
+        self.assertAlmostEqual(stats.win_rate, 2 / 3)
+        self.assertAlmostEqual(stats.average_score, 40)
+        self.assertEqual(self.backend.backfill_player_stats(), 1)
+        self.assertEqual(self.backend.get_player_stats('Femi'), stats)
+
+
+class TestInMemoryBackend(BackendTests, unittest.TestCase):
+    def setUp(self):
+        """Create an empty in-memory backend"""
+        self.backend = InMemoryBackend()
+        super().setUp()
+
+
+class TestSQLiteBackend(BackendTests, unittest.TestCase):
+    def setUp(self):
+        """Point the SQLite backend at a temporary database file"""
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        db_path = os.path.join(tmp_dir.name, 'test_db')
+        patcher = patch('graph_game.database.database.DatabaseConnection',
+                        side_effect=lambda db_name: DatabaseConnection(db_path))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.backend = SQLiteBackend()
+        super().setUp()
+
+
+class TestBackendSelection(unittest.TestCase):
+    def test_create_backend(self):
+        """Test backends are created by their configured name"""
+        self.assertIsInstance(backends.create_backend('memory'), InMemoryBackend)
+        self.assertIsInstance(backends.create_backend('sqlite'), SQLiteBackend)
+        with self.assertRaises(ValueError):
+            backends.create_backend('postgres')
+
+    def test_get_backend(self):
+        """Test the configured backend is created once per process"""
+        self.addCleanup(backends.set_backend, backends._backend)
+        backends.set_backend(None)
+        with patch('graph_game.config.STORAGE_BACKEND', 'memory'):
+            backend = backends.get_backend()
+        self.assertIsInstance(backend, InMemoryBackend)
+        self.assertIs(backends.get_backend(), backend)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from graph_game.database import credentials, database
+from graph_game.database.credentials import SessionCache
+from graph_game.database.database import DatabaseConnection
+
+
+class TestCredentials(unittest.TestCase):
+    def setUp(self):
+        """Use cheap hashing parameters for the tests"""
+        patcher = patch.dict(credentials.HASH_PARAMS, scrypt_n=16, pbkdf2_iterations=10)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_hash_and_verify(self):
+        """Test hashed passwords are salted and verified with both methods"""
+        for method in credentials.HASH_METHODS:
+            credentials.configure(method=method)
+            stored = credentials.hash_password('password')
+            self.assertTrue(stored.startswith(method + '$'))
+            self.assertNotEqual(stored, credentials.hash_password('password'))
+            self.assertTrue(credentials.verify_password('password', stored))
+            self.assertFalse(credentials.verify_password('wrong', stored))
+            self.assertFalse(credentials.needs_rehash(stored))
+
+    def test_plaintext_and_outdated_hashes(self):
+        """Test legacy plaintext passwords verify and need rehashing, as do hashes with other costs"""
+        self.assertTrue(credentials.verify_password('password', 'password'))
+        self.assertTrue(credentials.needs_rehash('password'))
+        stored = credentials.hash_password('password')
+        credentials.configure(scrypt_n=32)
+        self.assertTrue(credentials.needs_rehash(stored))
+        self.assertTrue(credentials.verify_password('password', stored))
+
+    def test_configure_raises_value_error(self):
+        """Test configure rejects unknown parameters and methods"""
+        with self.assertRaises(ValueError):
+            credentials.configure(rounds=10)
+        with self.assertRaises(ValueError):
+            credentials.configure(method='md5')
+
+    def test_session_cache(self):
+        """Test tokens are issued, validated and invalidated"""
+        sessions = SessionCache(maxsize=2)
+        self.assertIsNone(sessions.lookup('Femi', 'password'))
+        token = sessions.issue('Femi', 'password')
+        self.assertEqual(sessions.lookup('Femi', 'password'), token)
+        self.assertIsNone(sessions.lookup('Femi', 'wrong'))
+        self.assertEqual(sessions.validate(token), 'Femi')
+        sessions.invalidate('Femi')
+        self.assertIsNone(sessions.validate(token))
+
+    def test_session_cache_eviction(self):
+        """Test the oldest session is evicted once the cache is full"""
+        sessions = SessionCache(maxsize=2)
+        token = sessions.issue('Femi', 'password')
+        sessions.issue('Tom', 'password')
+        sessions.issue('Alex', 'password')
+        self.assertIsNone(sessions.validate(token))
+        self.assertIsNone(sessions.lookup('Femi', 'password'))
+
+    def test_lazy_migration(self):
+        """Test a plaintext password is rehashed on the first login and the session is cached"""
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        db_path = os.path.join(tmp_dir.name, 'test_db')
+        with patch('graph_game.database.database.DatabaseConnection', side_effect=lambda db_name: DatabaseConnection(db_path)), \
+             patch.object(credentials, 'sessions', SessionCache()):
+            database.initialize_database()
+            with DatabaseConnection(db_path) as connection:
+                connection.execute("INSERT INTO players (balance, username, password) VALUES (100, 'Femi', 'plain')")
+
+            self.assertEqual(database.authenticate('Femi', 'plain'), ('Femi', 100))
+            with DatabaseConnection(db_path) as connection:
+                stored, = connection.execute("SELECT password FROM players").fetchone()
+            self.assertTrue(credentials.is_hashed(stored))
+            self.assertIsNotNone(credentials.sessions.lookup('Femi', 'plain'))
+
+            # A cached login skips the key derivation
+            with patch.object(credentials, 'verify_password') as mock_verify:
+                self.assertEqual(database.authenticate('Femi', 'plain'), ('Femi', 100))
+            mock_verify.assert_not_called()
+            self.assertFalse(database.authenticate('Femi', 'wrong'))
+
+    def test_cached_login_reads_balance(self):
+        """Test a cached login skips the key derivation but returns the balance changed behind the cache"""
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        db_path = os.path.join(tmp_dir.name, 'test_db')
+        with patch('graph_game.database.database.DatabaseConnection', side_effect=lambda db_name: DatabaseConnection(db_path)), \
+             patch.object(credentials, 'sessions', SessionCache()):
+            database.initialize_database()
+            database.register_player('Femi', 'password', 100)
+            self.assertEqual(database.authenticate('Femi', 'password'), ('Femi', 100))
+
+            # Another process sharing the database changes the balance
+            with DatabaseConnection(db_path) as connection:
+                connection.execute("UPDATE players SET balance = 130 WHERE username = 'Femi'")
+            with patch.object(credentials, 'verify_password') as mock_verify:
+                self.assertEqual(database.authenticate('Femi', 'password'), ('Femi', 130))
+            mock_verify.assert_not_called()
+
+            # A new account of the same name, e.g. in a replaced database, is verified again
+            with DatabaseConnection(db_path) as connection:
+                connection.execute("DELETE FROM players")
+            database.register_player('Femi', 'other', 20)
+            self.assertFalse(database.authenticate('Femi', 'password'))
+            self.assertEqual(database.authenticate('Femi', 'other'), ('Femi', 20))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from graph_game.database import credentials, database
+from graph_game.database.credentials import SessionCache
+from graph_game.database.database import DatabaseConnection
+
+
+class TestDatabase(unittest.TestCase):
+    def setUp(self):
+        """Point the database functions at a temporary database file"""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        db_path = os.path.join(self.tmp_dir.name, 'test_db')
+        patcher = patch('graph_game.database.database.DatabaseConnection',
+                        side_effect=lambda db_name: DatabaseConnection(db_path))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.tmp_dir.cleanup)
+        # Keep the sessions of the temporary players out of the sessions of the process
+        patcher = patch.object(credentials, 'sessions', SessionCache())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        database.initialize_database()
+        database.register_player('Femi', 'password', 100)
+
+    def test_settle_round_win(self):
+        """Test settle_round adds the score to the balance and logs the game"""
+        new_balance, entry_date = database.settle_round('Femi', 10, 1, 4, 'win', 60)
+        self.assertEqual(new_balance, 160)
+        self.assertEqual(database.authenticate('Femi', 'password'), ('Femi', 160))
+        history = database.get_player_history('Femi')
+        self.assertEqual(history, [(10, 1, 4, 'win', 60, entry_date)])
+
+    def test_settle_round_loss(self):
+        """Test settle_round deducts a negative score from the balance"""
+        database.settle_round('Femi', 30, 2, 3, 'loss', -30)
+        new_balance, _ = database.settle_round('Femi', 20, 2, 3, 'loss', -20)
+        self.assertEqual(new_balance, 50)
+        self.assertEqual(len(database.get_player_history('Femi')), 2)
+
+    def test_settle_round_unknown_player(self):
+        """Test settle_round does not log a game for an unregistered player"""
+        self.assertIsNone(database.settle_round('Tom', 10, 1, 2, 'win', 60))
+        self.assertEqual(database.get_player_history('Tom'), [])
+
+    def test_backfill_player_stats(self):
+        """Test the player statistics are rebuilt from games logged before the table existed"""
+        database.settle_round('Femi', 10, 1, 4, 'win', 60)
+        with DatabaseConnection(os.path.join(self.tmp_dir.name, 'test_db')) as connection:
+            connection.execute("INSERT INTO games (username, bid, start, end, outcome, score) VALUES ('Femi', 5, 1, 2, 'loss', -5)")
+        self.assertEqual(database.get_player_stats('Femi'), (1, 1, 10, 60, 60))
+        self.assertEqual(database.backfill_player_stats(), 1)
+        self.assertEqual(database.get_player_stats('Femi'), (2, 1, 15, 55, 60))
+
+    def test_stats_created_from_history(self):
+        """Test a database whose games were logged before the player statistics existed counts them when initialized"""
+        with DatabaseConnection(os.path.join(self.tmp_dir.name, 'test_db')) as connection:
+            connection.execute("DROP TABLE player_stats")
+            connection.executemany("INSERT INTO games (username, bid, start, end, outcome, score) VALUES ('Femi', 5, 1, 2, ?, ?)",
+                                   [('win', 20), ('loss', -5), ('loss', -5)])
+        database.initialize_database()
+        games_played, *_ = database.get_player_stats('Femi')
+        self.assertEqual(games_played, len(database.get_player_history('Femi')))
+        self.assertEqual(database.get_player_stats('Femi'), (3, 1, 15, 10, 20))
+
+        # An existing table is left to the games logged since
+        database.settle_round('Femi', 10, 1, 4, 'win', 60)
+        database.initialize_database()
+        self.assertEqual(database.get_player_stats('Femi')[0], 4)
+
+    def test_query_span_logging(self):
+        """Test queries are logged with their name and number of rows at debug level"""
+        with self.assertLogs('graph_game.database.database', level='DEBUG') as logs:
+            database.get_player_history('Femi')
+        self.assertIn('Query get_player_history', logs.output[0])
+        self.assertIn('0 rows', logs.output[0])
+
+    def test_slow_query_threshold(self):
+        """Test queries slower than the threshold are logged as warnings"""
+        self.addCleanup(database.set_slow_query_threshold, None)
+        database.set_slow_query_threshold(0)
+        with self.assertLogs('graph_game.database.database', level='WARNING') as logs:
+            database.registered('Femi')
+        self.assertIn('Slow query registered', logs.output[0])
+        with self.assertRaises(ValueError):
+            database.set_slow_query_threshold(-1)
+
+    def test_query_span_disabled(self):
+        """Test the timer is not started when logging and the slow query check are disabled"""
+        with database.QuerySpan('test') as span:
+            pass
+        self.assertIsNone(span.start)
+
+
+if __name__ == '__main__':
+    unittest.main()
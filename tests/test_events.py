@@ -0,0 +1,37 @@
+import unittest
+
+from graph_game.events import EventBus
+
+
+class TestEventBus(unittest.TestCase):
+    def setUp(self):
+        """Create an empty event bus"""
+        self.bus = EventBus()
+        self.received = []
+
+    def test_publish_to_subscribers(self):
+        """Test the subscribers of an event receive its keyword arguments, until they unsubscribe"""
+        callback = lambda **payload: self.received.append(payload)
+        self.bus.subscribe('balance_changed', callback)
+        self.bus.publish('balance_changed', username='Femi', balance=120)
+        self.bus.publish('game_logged', username='Femi', record=())
+        self.assertEqual(self.received, [{'username': 'Femi', 'balance': 120}])
+
+        self.bus.unsubscribe('balance_changed', callback)
+        self.bus.publish('balance_changed', username='Femi', balance=80)
+        self.assertEqual(len(self.received), 1)
+
+    def test_failing_subscriber(self):
+        """Test an exception raised by a subscriber is logged and the other subscribers are still called"""
+        def fail(**payload):
+            raise RuntimeError('failed')
+
+        self.bus.subscribe('balance_changed', fail)
+        self.bus.subscribe('balance_changed', lambda **payload: self.received.append(payload))
+        with self.assertLogs('graph_game.events', level='ERROR'):
+            self.bus.publish('balance_changed', username='Femi', balance=120)
+        self.assertEqual(len(self.received), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
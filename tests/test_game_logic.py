@@ -1,7 +1,10 @@
 import numpy as np
+import pickle
 import unittest
+from unittest.mock import patch
 
-from graph_game.game.game_logic import GraphGame
+from graph_game.data_structures.graph import Graph
+from graph_game.game.game_logic import GraphGame, RoundResult
 from graph_game.game.score_generation import RandomScoreGenerator
 
 
@@ -32,12 +35,141 @@ class TestGraphGame(unittest.TestCase):
         self.game.generate_cutoff()  # First generate the cutoff
         self.assertTrue(isinstance(self.game.check_player_wins(), bool))  # Check if the result is a boolean
 
+    def test_generate_cutoff_unreachable_nodes(self):
+        """Test the cutoff statistics exclude unreachable nodes and the starting node, and are reproducible"""
+        row = self.game.distances_from(1)
+        expected = np.delete(row, self.game.get_nodes().index(1))
+        self.game.generate_random_nodes(num=1)
+        mean_dist, sd_dist = self.game.distance_statistics(1)
+        self.assertAlmostEqual(mean_dist, np.mean(expected))
+        self.assertAlmostEqual(sd_dist, np.std(expected))
+        self.assertEqual(self.game.distance_statistics(self.game.num_nodes), (0.0, 0.0))
+
+        np.random.seed(5)
+        self.game.generate_cutoff()
+        cutoff = self.game.cutoff_distance
+        np.random.seed(5)
+        self.game.generate_cutoff()
+        self.assertEqual(self.game.cutoff_distance, cutoff)
+
     def test_player_score(self):
         """Test score calculation."""
         self.game.generate_cutoff()  # Ensure cutoff is generated
         score = self.game.get_player_score()
         self.assertIsInstance(score, int)  # The score should be an integer
 
+    def test_resolve_round(self):
+        """Test the round is resolved once along a shortest path and cached until the ending node changes"""
+        self.game.generate_cutoff()
+        result = self.game.resolve_round()
+        self.assertIsInstance(result, RoundResult)
+        self.assertIs(self.game.resolve_round(), result)
+        self.assertEqual(result.distance, Graph.shortest_path(self.game, 1, 4))
+        self.assertEqual((result.path[0], result.path[-1]), (1, 4))
+        path_length = sum(dict((n.get_index(), w) for n, w in self.game.node_map[a].get_neighbours())[b]
+                          for a, b in zip(result.path, result.path[1:]))
+        self.assertEqual(path_length, result.distance)
+        self.assertEqual(result.won, result.distance < self.game.cutoff_distance)
+        self.assertEqual(result.score, self.game.score_all_nodes()[self.game.get_nodes().index(4)] if result.won else -100)
+        # The payout of a win is the scalar score of the distance of the ending node
+        if result.won:
+            self.assertEqual(result.score, self.game.score_generator.calculate_score(result.distance))
+        self.assertEqual((self.game.check_player_wins(), self.game.get_player_score()), (result.won, result.score))
+
+        self.game.set_ending_node(2)
+        self.assertIsNot(self.game.resolve_round(), result)
+        with self.assertRaises(AttributeError):
+            result.score = 0
+
+    def test_score_all_nodes(self):
+        """Test the node scores are aligned with the nodes and cached for the round"""
+        self.game.generate_cutoff()
+        scores = self.game.score_all_nodes()
+        self.assertEqual(len(scores), len(self.game.get_nodes()))
+        node_to_dist = self.game.shortest_path(self.game.starting_node)
+        self.assertEqual(scores[self.game.get_nodes().index(4)], self.game.score_generator.calculate_score(node_to_dist[4]))
+        self.assertIs(self.game.score_all_nodes(), scores)
+        self.game.set_starting_node(2)
+        self.assertIsNot(self.game.score_all_nodes(), scores)
+
+    def test_distance_matrix(self):
+        """Test both all-pairs algorithms agree with Dijkstra's algorithm on the graph"""
+        nodes = self.game.get_nodes()
+        expected = [[0 if start == end else Graph.shortest_path(self.game, start, end) for end in nodes] for start in nodes]
+        self.assertEqual(self.game.distance_matrix().tolist(), expected)
+
+        with patch('graph_game.game.game_logic.FLOYD_WARSHALL_MAX_NODES', 0), \
+             patch('graph_game.game.game_logic.FLOYD_WARSHALL_MIN_DENSITY', 2):
+            game = GraphGame(init_num_nodes=12, init_num_edges=6)
+            nodes = game.get_nodes()
+            expected = [[0 if start == end else Graph.shortest_path(game, start, end) for end in nodes] for start in nodes]
+            self.assertEqual(game.distance_matrix().tolist(), expected)
+
+    def test_shortest_path_lookup(self):
+        """Test shortest_path reads the distance matrix and is invalidated when the graph changes"""
+        self.assertEqual(self.game.shortest_path(1, 4), Graph.shortest_path(self.game, 1, 4))
+        self.assertEqual(self.game.shortest_path(1), Graph.shortest_path(self.game, 1))
+        self.assertEqual(self.game.shortest_path(1, 1), 0)
+        self.game.generate_random_nodes(num=1)
+        self.assertEqual(self.game.distance_matrix().shape, (self.game.num_nodes,) * 2)
+        self.assertEqual(self.game.shortest_path(1, self.game.num_nodes), float('inf'))
+
+    def test_big_board(self):
+        """Test big boards compute the distances from a node on demand without the distance matrix"""
+        game = GraphGame.random_start(size=600)
+        self.assertEqual(game.num_nodes, 600)
+        game.prepare(layout=False)
+        game.set_base_score(10)
+        game.set_starting_node(1)
+        game.generate_cutoff()
+        self.assertEqual(len(game.score_all_nodes()), 600)
+        self.assertIsNone(game._distance_matrix)
+
+        self.assertEqual(game.shortest_path(1), Graph.shortest_path(game, 1))
+        mean_dist, sd_dist = game.distance_statistics(1)
+        distances = list(Graph.shortest_path(game, 1).values())
+        self.assertAlmostEqual(mean_dist, np.mean(distances))
+        self.assertAlmostEqual(sd_dist, np.std(distances))
+
+        game.set_ending_node(600)
+        result = game.resolve_round()
+        self.assertEqual((result.path[0], result.path[-1], result.distance), (1, 600, game.shortest_path(1, 600)))
+
+        with self.assertRaises(ValueError):
+            GraphGame.random_start(size=0)
+
+    def test_set_distances_from(self):
+        """Test the distances of a big board computed on a copy of the game are looked up by the game"""
+        game = GraphGame.random_start(size=300)
+        game.prepare(layout=False)
+        node = game.get_nodes()[0]
+        self.assertFalse(game.has_distances_from(node))
+        distances = pickle.loads(pickle.dumps(game)).distances_from(node)
+        game.set_distances_from(node, distances)
+        self.assertTrue(game.has_distances_from(node))
+        np.testing.assert_array_equal(game.distances_from(node), distances)
+        with self.assertRaises(ValueError):
+            game.set_distances_from(node, distances[1:])
+
+    def test_search_nodes(self):
+        """Test nodes are searched by the prefix of their index or by a range"""
+        game = GraphGame(init_num_nodes=300)
+        self.assertEqual(game.search_nodes('12'), [12] + list(range(120, 130)))
+        self.assertEqual(game.search_nodes(limit=3), [1, 2, 3])
+        self.assertEqual(game.search_nodes('x'), [])
+        self.assertEqual(game.search_nodes('150-155'), list(range(150, 156)))
+        self.assertEqual(game.search_nodes('290 - 400', limit=5), list(range(290, 295)))
+
+    def test_node_index_cached(self):
+        """Test the sorted node index is built once and rebuilt after nodes are added"""
+        game = GraphGame(init_num_nodes=20)
+        index = game.node_index
+        self.assertIs(game.node_index, index)
+        self.assertEqual(game.get_nodes(), list(range(1, 21)))
+        game.generate_random_nodes(num=2)
+        self.assertIsNot(game.node_index, index)
+        self.assertEqual(game.get_nodes(), list(range(1, 23)))
+
     def test_random_start(self):
         """Test starting a random game."""
         random_game = GraphGame.random_start()
@@ -1,3 +1,6 @@
+import os
+import pickle
+import tempfile
 import unittest
 from unittest.mock import patch
 
@@ -39,6 +42,52 @@ class TestGraph(unittest.TestCase):
         self.graph.generate_random_edges(num=1)
         self.assertGreaterEqual(self.graph.num_edges, 10)
 
+    def test_sparse_graph(self):
+        """Test big graphs sample edges by rejection and are laid out at random"""
+        graph = Graph(init_num_nodes=1000, add_num_edges=500)
+        self.assertTrue(graph.sparse)
+        self.assertIsNone(graph.unconnected_edges)
+        self.assertEqual(graph.num_edges, 1499)
+        self.assertEqual(graph.G.number_of_edges(), 1499)
+        self.assertEqual(len(graph.node_position), 1000)
+        self.assertTrue(all(-1 <= coord <= 1 for coords in graph.node_position.values() for coord in coords))
+        self.assertFalse(Graph(init_num_nodes=10).sparse)
+
+    def test_save_and_load(self):
+        """Test a saved graph is loaded with the same edges, distances and layout"""
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        path = os.path.join(tmp_dir.name, 'round.graph')
+        self.graph.node_position
+        self.graph.save(path)
+
+        loaded = Graph.load(path)
+        self.assertEqual(str(loaded), str(self.graph))
+        self.assertEqual(sorted(loaded.G.edges(data='weight')), sorted(self.graph.G.edges(data='weight')))
+        self.assertEqual(loaded.shortest_path(1), self.graph.shortest_path(1))
+        self.assertEqual(loaded.node_position[3].tolist(), self.graph.node_position[3].tolist())
+
+        # The loaded graph can still grow
+        loaded.generate_random_nodes(num=1)
+        loaded.generate_random_edges(num=2)
+        self.assertEqual((loaded.num_nodes, loaded.num_edges), (11, self.graph.num_edges + 2))
+
+    def test_pickle_without_networkx_graph(self):
+        """Test pickling drops the networkx graph, which is rebuilt on access"""
+        self.graph.G
+        copy = pickle.loads(pickle.dumps(self.graph))
+        self.assertIsNone(copy._nx_graph)
+        self.assertEqual(sorted(copy.G.edges(data='weight')), sorted(self.graph.G.edges(data='weight')))
+
+    def test_pickle_big_board(self):
+        """Test a big board is pickled without recursing along its edges, keeping the order of the neighbours"""
+        graph = Graph(5000, 2500)
+        copy = pickle.loads(pickle.dumps(graph))
+        self.assertEqual(copy.num_edges, graph.num_edges)
+        for idx in (1, 2500, 5000):
+            self.assertEqual([(neighbour.get_index(), weight) for neighbour, weight in copy.node_map[idx].get_neighbours()],
+                             [(neighbour.get_index(), weight) for neighbour, weight in graph.node_map[idx].get_neighbours()])
+
     def test_graph_str_repr(self):
         """Test graph string representation"""
         graph_str = str(self.graph)
@@ -0,0 +1,63 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from graph_game.data_structures import graph_io
+from graph_game.data_structures.graph_io import LazyNodeMap
+
+
+class TestGraphIO(unittest.TestCase):
+    def setUp(self):
+        """Create a temporary file path"""
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.path = os.path.join(tmp_dir.name, 'test.graph')
+        self.edges = np.array([[1, 2, 5], [2, 3, 1], [1, 4, 7]])
+
+    def test_round_trip(self):
+        """Test the edges and positions are written and memory-mapped back"""
+        positions = np.arange(8, dtype=float).reshape(4, 2)
+        graph_io.write_graph(self.path, 4, self.edges, 5, 2.5, positions)
+        for mmap in (True, False):
+            data = graph_io.read_graph(self.path, mmap=mmap)
+            self.assertEqual((data.num_nodes, data.edge_mean, data.edge_sd), (4, 5, 2.5))
+            self.assertEqual(data.edges.tolist(), self.edges.tolist())
+            self.assertEqual(data.positions.tolist(), positions.tolist())
+        self.assertIsInstance(graph_io.read_graph(self.path).edges, np.memmap)
+        self.assertEqual(os.path.getsize(self.path), graph_io.HEADER_SIZE + 3 * 12 + 4 + 8 * 8)
+
+    def test_without_edges_or_positions(self):
+        """Test graphs without edges or layout are stored"""
+        graph_io.write_graph(self.path, 2, np.empty((0, 3)), 5, 3)
+        data = graph_io.read_graph(self.path)
+        self.assertEqual(data.edges.shape, (0, 3))
+        self.assertIsNone(data.positions)
+
+    def test_invalid_file(self):
+        """Test files without the header are rejected"""
+        with open(self.path, 'wb') as file:
+            file.write(b'not a graph')
+        with self.assertRaises(ValueError):
+            graph_io.read_graph(self.path)
+
+    def test_lazy_node_map(self):
+        """Test nodes are created on first access with their neighbours from the edges"""
+        node_map = LazyNodeMap(5, self.edges)
+        self.assertEqual((len(node_map), list(node_map)), (5, [1, 2, 3, 4, 5]))
+        self.assertTrue(5 in node_map)
+        self.assertFalse(6 in node_map or 0 in node_map)
+        self.assertEqual(node_map._nodes, {})
+
+        node = node_map[2]
+        self.assertIs(node_map[2], node)
+        self.assertEqual({neighbour.get_index(): weight for neighbour, weight in node.get_neighbours()}, {1: 5, 3: 1})
+        self.assertIn(node, node_map[1].neighbours)
+        self.assertEqual(dict(node_map[5].get_neighbours()), {})
+        with self.assertRaises(KeyError):
+            node_map[6]
+
+
+if __name__ == '__main__':
+    unittest.main()
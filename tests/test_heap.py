@@ -1,3 +1,4 @@
+import random
 import unittest
 
 from graph_game.data_structures.heap import MinHeap
@@ -37,6 +38,20 @@ class TestHeap(unittest.TestCase):
             result.append(heap.pop()[0])
         self.assertEqual(result, sorted(values))
 
+    def test_random_push_pop(self):
+        """Test interleaved pushes and pops always return the smallest element"""
+        rng = random.Random(0)
+        heap = MinHeap()
+        pushed = []
+        for _ in range(500):
+            if pushed and rng.random() < 0.4:
+                pushed.sort()
+                self.assertEqual(heap.pop()[0], pushed.pop(0))
+            else:
+                value = rng.randint(0, 50)
+                pushed.append(value)
+                heap.push((value, Node(value)))
+
     def test_top(self):
         """Test the top element of the heap"""
         heap = MinHeap([(2, self.nodes[2]), (1, self.nodes[1]), (3, self.nodes[3])])
@@ -0,0 +1,54 @@
+import unittest
+
+import numpy as np
+
+from graph_game.data_structures.kd_tree import KDTree
+
+
+class TestKDTree(unittest.TestCase):
+    def setUp(self):
+        """Build a tree of random points"""
+        self.rng = np.random.default_rng(0)
+        self.points = self.rng.uniform(-1, 1, size=(1000, 2))
+        self.tree = KDTree(self.points)
+
+    def brute_force(self, points, query):
+        """Get the distance of the nearest point by scanning every point"""
+        return np.min(np.linalg.norm(points - query, axis=1))
+
+    def test_nearest(self):
+        """Test the nearest point matches a scan of every point"""
+        for query in self.rng.uniform(-1.5, 1.5, size=(200, 2)):
+            idx, distance = self.tree.nearest(query)
+            self.assertAlmostEqual(distance, self.brute_force(self.points, query))
+            self.assertAlmostEqual(np.linalg.norm(self.points[idx] - query), distance)
+
+    def test_nearest_3d(self):
+        """Test the tree splits any number of dimensions"""
+        points = self.rng.uniform(size=(300, 3))
+        tree = KDTree(points)
+        for query in self.rng.uniform(size=(50, 3)):
+            self.assertAlmostEqual(tree.nearest(query)[1], self.brute_force(points, query))
+
+    def test_ids(self):
+        """Test the nearest point is identified by its id"""
+        tree = KDTree([(0, 0), (5, 5), (5, 5), (10, 0)], ids=['a', 'b', 'c', 'd'])
+        self.assertEqual(tree.nearest((1, 1)), ('a', 2 ** 0.5))
+        self.assertIn(tree.nearest((5, 6))[0], ('b', 'c'))
+        self.assertEqual(tree.nearest((10, 0)), ('d', 0.0))
+        self.assertEqual(len(tree), 4)
+
+    def test_invalid_input(self):
+        """Test invalid points and queries raise ValueError"""
+        with self.assertRaises(ValueError):
+            KDTree(np.zeros((0, 2))).nearest((0, 0))
+        with self.assertRaises(ValueError):
+            KDTree([1, 2, 3])
+        with self.assertRaises(ValueError):
+            KDTree([(0, 0)], ids=[1, 2])
+        with self.assertRaises(ValueError):
+            self.tree.nearest((0, 0, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
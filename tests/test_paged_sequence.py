@@ -0,0 +1,77 @@
+import unittest
+
+from graph_game.data_structures.paged_sequence import PagedSequence
+
+
+class TestPagedSequence(unittest.TestCase):
+    def setUp(self):
+        """Create a sequence of 25 rows in pages of 10, recording the fetched pages"""
+        self.fetched = []
+        self.rows = list(range(25))
+        self.sequence = PagedSequence(self.fetch, length=25, page_size=10, max_pages=2)
+
+    def fetch(self, offset, limit):
+        """Return a page of the rows, recording its offset"""
+        self.fetched.append(offset)
+        return self.rows[offset:offset + limit]
+
+    def test_rows_fetched_by_page(self):
+        """Test each page is fetched once, when one of its rows is first accessed"""
+        self.assertEqual(len(self.sequence), 25)
+        self.assertEqual(self.fetched, [])
+        self.assertEqual(self.sequence[3], 3)
+        self.assertEqual(self.sequence[9], 9)
+        self.assertEqual(self.sequence[-1], 24)
+        self.assertEqual(self.fetched, [0, 20])
+        self.assertEqual(self.sequence[8:12], [8, 9, 10, 11])
+        self.assertEqual(list(self.sequence), self.rows)
+        with self.assertRaises(IndexError):
+            self.sequence[25]
+
+    def test_least_recently_used_page_evicted(self):
+        """Test the least recently used page is evicted when too many pages are fetched"""
+        self.sequence[0]
+        self.sequence[10]
+        self.sequence[0]
+        self.sequence[20]
+        self.assertEqual(list(self.sequence.pages), [0, 2])
+        self.sequence[5]
+        self.assertEqual(self.fetched, [0, 10, 20])
+
+    def test_prepend(self):
+        """Test prepended rows are read from the head and the pages are fetched shifted by the head"""
+        self.sequence[0]
+        self.rows[0:0] = [-2, -1]
+        self.sequence.prepend([-2, -1])
+        self.assertEqual(len(self.sequence), 27)
+        self.assertEqual(self.sequence[:4], [-2, -1, 0, 1])
+        self.assertEqual(self.sequence[-1], 24)
+        self.assertEqual(list(self.sequence), self.rows)
+        self.assertEqual(self.fetched, [0, 22, 12, 22])
+
+    def test_invalidate(self):
+        """Test invalidating the sequence fetches the changed rows again"""
+        self.sequence[0]
+        self.rows.insert(0, -1)
+        self.sequence.invalidate(26)
+        self.assertEqual((len(self.sequence), self.sequence[0]), (26, -1))
+        self.assertEqual(self.fetched, [0, 0])
+
+    def test_overcounted_length(self):
+        """Test the length is clamped to the rows of the storage when it was counted too high"""
+        sequence = PagedSequence(self.fetch, length=40, page_size=10)
+        self.assertEqual(sequence[30:40], [])
+        self.assertEqual(len(sequence), 30)
+        self.assertEqual(sequence[15:], list(range(15, 25)))
+        self.assertEqual(len(sequence), 25)
+        with self.assertRaises(IndexError):
+            sequence[25]
+
+    def test_invalid_page_size(self):
+        """Test non-positive page sizes raise an error"""
+        with self.assertRaises(ValueError):
+            PagedSequence(self.fetch, length=25, page_size=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
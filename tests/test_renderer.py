@@ -0,0 +1,123 @@
+import tracemalloc
+import unittest
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+import numpy as np
+
+from graph_game.game.game_logic import GraphGame
+from graph_game.renderer import BoardRenderer, RenderCache
+
+
+class TestBoardRenderer(unittest.TestCase):
+    def setUp(self):
+        """Setup for a renderer drawn on an Agg canvas and a few games"""
+        self.renderer = BoardRenderer()
+        self.canvas = FigureCanvasAgg(self.renderer.fig)
+        self.games = [GraphGame.random_start() for _ in range(5)]
+        for game in self.games:
+            game.set_base_score(10)
+
+    def play_round(self, game, round_number):
+        """Draw the three stages of a round as the Play frame does"""
+        nodes = game.get_nodes()
+        game.set_starting_node(nodes[round_number % len(nodes)])
+        game.set_ending_node(nodes[(round_number + 1) % len(nodes)])
+        game.generate_cutoff()
+        self.renderer.render(game)
+        self.renderer.render(game, with_node_scores=True)
+        self.renderer.render(game, with_node_scores=True, result=True)
+
+    def test_node_at(self):
+        """Test a click selects the node drawn nearest to it, and no node far from every node"""
+        game = self.games[0]
+        self.renderer.render(game)
+        self.canvas.draw()
+        for node in game.get_nodes():
+            x, y = self.renderer.ax.transData.transform(game.node_position[node])
+            self.assertEqual(self.renderer.node_at(x + 1, y - 1), node)
+        self.assertIsNone(self.renderer.node_at(-1000, -1000))
+
+        # The tree follows a new board
+        self.renderer.render(self.games[1])
+        node = self.games[1].get_nodes()[0]
+        x, y = self.renderer.ax.transData.transform(self.games[1].node_position[node])
+        self.assertEqual(self.renderer.node_at(x, y), node)
+
+    def test_artists_reused(self):
+        """Test the figure keeps the same artists across rounds, hiding the overlays of the previous round"""
+        self.play_round(self.games[0], 0)
+        self.canvas.draw()
+        artists = self.renderer.ax.get_children()
+        path = self.renderer.ax.collections[-1]
+        self.assertTrue(len(path.get_segments()) > 0)
+
+        self.play_round(self.games[1], 1)
+        self.renderer.render(self.games[1])
+        self.canvas.draw()
+        self.assertIs(self.renderer.ax, self.renderer.fig.axes[0])
+        self.assertEqual(len(self.renderer.fig.axes), 1)
+        self.assertEqual(len(path.get_segments()), 0)
+        self.assertTrue(set(self.renderer.ax.get_children()) <= set(artists) | set(self.renderer.ax.texts))
+        self.assertFalse(any(text.get_visible() for text in self.renderer.ax.texts if text.get_fontsize() == 4))
+
+    def test_scores_without_starting_node(self):
+        """Test showing the scores before a starting node is chosen raises an error"""
+        self.renderer.render(self.games[0])
+        with self.assertRaises(NameError):
+            self.renderer.render(self.games[0], with_node_scores=True)
+
+    def test_cached_board_matches_full_redraw(self):
+        """Test the overlays composited onto the cached board look the same as a full redraw"""
+        game = self.games[0]
+        game.set_starting_node(1)
+        game.set_ending_node(2)
+        game.generate_cutoff()
+        for with_node_scores, result in ((False, False), (True, False), (True, True)):
+            self.renderer.render(game, with_node_scores=with_node_scores, result=result)
+            self.renderer.draw(self.canvas)
+            composited = np.array(self.canvas.buffer_rgba())
+            self.canvas.draw()
+            np.testing.assert_array_equal(composited, np.asarray(self.canvas.buffer_rgba()))
+        # The board is cached with and without the static artists above the result path
+        self.assertEqual(len(self.renderer.cache), 2)
+
+        self.renderer.render(self.games[1])
+        self.renderer.draw(self.canvas)
+        self.assertEqual(len(self.renderer.cache), 3)
+
+    def test_memory_growth(self):
+        """Test the memory used by the figure does not grow over 1000 rounds"""
+        for round_number in range(20):
+            self.play_round(self.games[round_number % len(self.games)], round_number)
+        self.canvas.draw()
+
+        tracemalloc.start()
+        try:
+            baseline = tracemalloc.get_traced_memory()[0]
+            for round_number in range(1000):
+                self.play_round(self.games[round_number % len(self.games)], round_number)
+                if round_number % 100 == 0:
+                    self.canvas.draw()
+            self.canvas.draw()
+            growth = tracemalloc.get_traced_memory()[0] - baseline
+        finally:
+            tracemalloc.stop()
+
+        self.assertLess(growth, 1024 * 1024)
+        self.assertEqual(len(self.renderer.fig.axes), 1)
+
+
+class TestRenderCache(unittest.TestCase):
+    def test_least_recently_used_evicted(self):
+        """Test the least recently used bitmap is evicted when the cache is full"""
+        cache = RenderCache(maxsize=2)
+        cache.put('round1', 1)
+        cache.put('round2', 2)
+        self.assertEqual(cache.get('round1'), 1)
+        cache.put('round3', 3)
+        self.assertIsNone(cache.get('round2'))
+        self.assertEqual((cache.get('round1'), cache.get('round3'), len(cache)), (1, 3, 2))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from graph_game.game.game_logic import GraphGame
+from graph_game.game.round_pool import RoundPool
+
+
+class TestRoundPool(unittest.TestCase):
+    def wait_until_full(self, pool, timeout=5):
+        """Wait for the background worker to fill the pool"""
+        deadline = time.monotonic() + timeout
+        while pool.stats()['size'] < pool.depth and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def test_pool_hits(self):
+        """Test prepared games are taken from the pool and replaced"""
+        pool = RoundPool(depth=2)
+        self.addCleanup(pool.close)
+        self.wait_until_full(pool)
+        game = pool.get()
+        self.assertIsInstance(game, GraphGame)
+        self.assertIsNotNone(game.node_position)
+        self.assertIsNotNone(game._distance_matrix)
+        self.assertEqual(pool.stats()['hits'], 1)
+        self.wait_until_full(pool)
+        self.assertEqual(pool.stats()['size'], 2)
+
+    def test_pool_misses(self):
+        """Test games are built on demand when the pool is disabled"""
+        factory = MagicMock()
+        pool = RoundPool(depth=0, factory=factory)
+        pool.get()
+        factory.return_value.prepare.assert_called_once()
+        self.assertEqual(pool.stats(), {'depth': 0, 'size': 0, 'hits': 0, 'misses': 1})
+
+    def test_refill_after_error(self):
+        """Test the worker keeps refilling the pool after the factory fails"""
+        game = MagicMock()
+
+        def fail_once():
+            if factory.call_count == 1:
+                raise RuntimeError('failed')
+            return game
+
+        factory = MagicMock(side_effect=fail_once)
+        with patch.object(RoundPool, 'RETRY_DELAY', 0.01), self.assertLogs('graph_game.game.round_pool', 'ERROR'):
+            pool = RoundPool(depth=1, factory=factory)
+            self.addCleanup(pool.close)
+            self.wait_until_full(pool)
+        self.assertEqual(pool.stats()['size'], 1)
+        self.assertIs(pool.get(), game)
+        self.assertGreaterEqual(factory.call_count, 2)
+
+    def test_close(self):
+        """Test closing the pool stops the worker"""
+        pool = RoundPool(depth=1)
+        pool.close()
+        self.assertFalse(pool._worker.is_alive())
+
+    def test_invalid_depth(self):
+        """Test negative depths are rejected"""
+        with self.assertRaises(ValueError):
+            RoundPool(depth=-1)
+
+
+if __name__ == '__main__':
+    unittest.main()
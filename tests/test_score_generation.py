@@ -1,9 +1,13 @@
 import numpy as np
+import os
 import scipy.stats as stats
+import subprocess
+import sys
 import unittest
 from unittest.mock import patch
+import warnings
 
-from graph_game.game.score_generation import RandomScoreGenerator
+from graph_game.game.score_generation import MAX_SCORE, EdgeWeightSampler, RandomScoreGenerator
 
 
 class TestRandomScoreGenerator(unittest.TestCase):
@@ -76,6 +80,50 @@ class TestRandomScoreGenerator(unittest.TestCase):
         manual_score = int(np.exp(1 / prob) + self.generator.base_score / 2)
         self.assertEqual(expected_score, manual_score)
 
+    def test_calculate_score_matches_scipy(self):
+        """Test the closed-form scores match the scores of scipy's normal distribution"""
+        for mean, sd in [(0, 1), (5, 2.5), (12, 9.9), (30, 14)]:
+            self.generator.set_mean(mean)
+            self.generator.set_sd(sd)
+            norm_distribution = stats.norm(mean, sd)
+            for dist in range(0, mean + int(2 * sd)):
+                prob = 1 - norm_distribution.cdf(dist)
+                manual_score = int(np.exp(1 / prob) + self.generator.base_score / 2)
+                self.assertAlmostEqual(self.generator.calculate_score(dist) / manual_score, 1, places=12)
+
+    def test_calculate_scores(self):
+        """Test the vectorised scores equal calculate_score"""
+        for mean, sd in [(12, 9.9), (5, 2.5), (30, 14), (20, 0.7)]:
+            self.generator.set_mean(mean)
+            self.generator.set_sd(sd)
+            distances = np.arange(0, mean + int(2 * sd))
+            scores = self.generator.calculate_scores(distances)
+            self.assertEqual(scores.dtype, np.int64)
+            self.assertEqual(scores.tolist(), [self.generator.calculate_score(int(dist)) for dist in distances])
+
+    def test_calculate_scores_overflow(self):
+        """Test scores with a probability close to zero are capped without warnings"""
+        self.generator.set_mean(10)
+        self.generator.set_sd(1)
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            scores = self.generator.calculate_scores(np.array([0, 15, 100, np.inf]))
+        self.assertEqual(scores[0], self.generator.calculate_score(0))
+        self.assertEqual(scores[1:].tolist(), [MAX_SCORE] * 3)
+
+    def test_calculate_scores_raises_value_error(self):
+        """Test calculate_scores rejects negative distances"""
+        self.generator.set_mean(10)
+        self.generator.set_sd(1)
+        with self.assertRaises(ValueError):
+            self.generator.calculate_scores(np.array([1, -1]))
+
+    def test_scipy_not_imported(self):
+        """Test scoring does not import scipy"""
+        code = 'import sys, graph_game.game.score_generation; sys.exit("scipy" in sys.modules)'
+        project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        self.assertEqual(subprocess.run([sys.executable, '-c', code], cwd=project_root).returncode, 0)
+
     @patch('numpy.random.normal')
     def test_generate_random_edge(self, mock_normal):
         """Test generate_random_edge returns weights"""
@@ -93,5 +141,45 @@ class TestRandomScoreGenerator(unittest.TestCase):
             RandomScoreGenerator.generate_random_edge(10, "2")
 
 
+
+class TestEdgeWeightSampler(unittest.TestCase):
+    def test_weights(self):
+        """Test the sampler gives integer weights of at least 1, truncated like generate_random_edge"""
+        sampler = EdgeWeightSampler(2, 3, rng=np.random.default_rng(0), min_block=4)
+        weights = [sampler() for _ in range(1000)]
+        self.assertTrue(all(isinstance(weight, int) and weight >= 1 for weight in weights))
+
+        normal = np.random.default_rng(0).normal(2, 3, size=4)
+        self.assertEqual(weights[:4], [max(int(value), 1) for value in normal])
+
+    def test_seeded_rng(self):
+        """Test samplers with the same seed give the same weights"""
+        first = EdgeWeightSampler(rng=np.random.default_rng(1))
+        second = EdgeWeightSampler(rng=np.random.default_rng(1))
+        self.assertEqual([first() for _ in range(200)], [second() for _ in range(200)])
+
+    def test_global_random_state(self):
+        """Test the sampler uses the global numpy random state without a generator"""
+        np.random.seed(3)
+        weights = EdgeWeightSampler(5, 3).sample(100)
+        np.random.seed(3)
+        self.assertEqual(weights.tolist(), np.maximum(np.random.normal(5, 3, 100).astype(int), 1).tolist())
+
+    def test_sample(self):
+        """Test sample draws an int64 array with the mean of the weights"""
+        weights = EdgeWeightSampler(20, 2, rng=np.random.default_rng(2)).sample(10000)
+        self.assertEqual((weights.dtype, weights.shape), (np.int64, (10000,)))
+        self.assertAlmostEqual(weights.mean(), 19.5, delta=0.1)
+
+    def test_raises_value_error(self):
+        """Test invalid parameters are rejected once at construction"""
+        with self.assertRaises(ValueError):
+            EdgeWeightSampler(-1, 2)
+        with self.assertRaises(ValueError):
+            EdgeWeightSampler(5, '2')
+        with self.assertRaises(ValueError):
+            EdgeWeightSampler(5, 2, min_block=0)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,5 +1,5 @@
 import unittest
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock
 
 from graph_game.game.search_engine import SearchEngine
 
@@ -7,7 +7,9 @@ from graph_game.game.search_engine import SearchEngine
 class TestSearchEngine(unittest.TestCase):
     def setUp(self):
         """Set up test fixtures"""
-        self.search_engine = SearchEngine()
+        self.backend = MagicMock()
+        self.backend.get_usernames.return_value = []
+        self.search_engine = SearchEngine(backend=self.backend)
         self.search_engine.trie = MagicMock()
         self.search_engine.fetch_all_users_to_trie = MagicMock()
 
@@ -18,35 +20,29 @@ class TestSearchEngine(unittest.TestCase):
         self.assertEqual(result, ["Femi", "Femu", "Femo"])
         self.search_engine.trie.complete.assert_called_with("Fem")
 
-    @patch('graph_game.game.search_engine.DatabaseConnection')
-    def test_search_results(self, mock_db):
+    def test_search_results(self):
         """Test the search results method"""
-        mock_conn = mock_db.return_value.__enter__.return_value
-        mock_conn.cursor.return_value.execute.return_value.fetchone.return_value = ("Femi", 100)
-        mock_conn.cursor.return_value.execute.return_value.fetchall.return_value = [("Femi", 100)]
+        self.backend.get_players.return_value = [("Femi", 100)]
         self.search_engine.trie.fizzy_search = MagicMock(return_value=["Femi"])
 
         result = self.search_engine.search_results("Femi")
         self.assertEqual(result, [("Femi", 100)])
+        self.backend.get_players.assert_called_with(["Femi"])
 
-    @patch('graph_game.game.search_engine.DatabaseConnection')
-    def test_get_leaders(self, mock_db):
+    def test_get_leaders(self):
         """Test the get_leaders method"""
-        mock_conn = mock_db.return_value.__enter__.return_value
-        mock_conn.cursor.return_value.execute.return_value.fetchall.return_value = [("Femi", 100), ("Tom", 90)]
+        self.backend.get_leaders.return_value = [("Femi", 100), ("Tom", 90)]
         result = self.search_engine.get_leaders(2)
         self.assertEqual(result, [("Femi", 100), ("Tom", 90)])
         self.assertRaises(ValueError, self.search_engine.get_leaders, 0)
 
     def test_fetch_all_users_to_trie(self):
         """Test the fetch_all_users_to_trie method"""
-        self.search_engine.trie = None
-        self.trie = MagicMock()
-        with patch('graph_game.game.search_engine.DatabaseConnection') as mock_db:
-            mock_conn = mock_db.return_value.__enter__.return_value
-            mock_conn.cursor.return_value.execute.return_value.fetchall.return_value = [("Femi",), ("Tom",)]
-            self.search_engine.fetch_all_users_to_trie()
-            self.assertIsNotNone(self.search_engine)
+        search_engine = SearchEngine(backend=self.backend)
+        self.backend.get_usernames.return_value = ["Femi", "Tom"]
+        search_engine.fetch_all_users_to_trie()
+        self.assertTrue(search_engine.trie.find("Femi"))
+        self.assertTrue(search_engine.trie.find("Tom"))
 
 
 if __name__ == '__main__':
@@ -0,0 +1,172 @@
+import asyncio
+import json
+import signal
+import unittest
+from unittest.mock import ANY, patch
+
+from graph_game.database.backends import InMemoryBackend
+from graph_game.game.game_logic import GraphGame
+from graph_game.game.round_pool import RoundPool
+from graph_game.game.service import GameService
+from graph_game.server import GameServer, serve
+
+
+class TestGameServer(unittest.IsolatedAsyncioTestCase):
+    # Generate the games on the thread pool
+    processes = 0
+
+    async def asyncSetUp(self):
+        """Start a server on a free port and open a keep-alive connection to it"""
+        backend = InMemoryBackend()
+        backend.initialize()
+        backend.register_player('Femi', 'password', 100)
+        self.server = GameServer(GameService(backend, RoundPool(depth=0)), processes=self.processes)
+        self.listener = await self.server.start('127.0.0.1', 0)
+        port = self.listener.sockets[0].getsockname()[1]
+        self.reader, self.writer = await asyncio.open_connection('127.0.0.1', port)
+
+    async def asyncTearDown(self):
+        self.writer.close()
+        self.listener.close()
+        await self.listener.wait_closed()
+        await self.server.close()
+
+    async def request(self, method, path, body=None, token=None, raw=None):
+        """Send a request on the connection and return the status and the JSON body of the response"""
+        data = raw if raw is not None else (json.dumps(body).encode() if body is not None else b'')
+        headers = f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(data)}\r\n"
+        if token:
+            headers += f"Authorization: Bearer {token}\r\n"
+        self.writer.write(headers.encode() + b'\r\n' + data)
+        await self.writer.drain()
+
+        status = int((await self.reader.readline()).split()[1])
+        length = 0
+        while (line := await self.reader.readline()) != b'\r\n':
+            name, _, value = line.decode().partition(':')
+            if name.lower() == 'content-length':
+                length = int(value)
+        return status, json.loads(await self.reader.readexactly(length))
+
+    async def test_round(self):
+        """Test a round is played through the endpoints on one connection"""
+        status, login = await self.request('POST', '/login', {'username': 'Femi', 'password': 'password'})
+        self.assertEqual(status, 200)
+        self.assertEqual(login['balance'], 100)
+        token = login['token']
+
+        status, board = await self.request('POST', '/rounds', token=token)
+        self.assertEqual(status, 200)
+        nodes = board['nodes']
+        self.assertEqual(len(nodes), len(self.server.sessions.get(token).round.game.get_nodes()))
+        self.assertTrue(all(u in nodes and v in nodes and weight > 0 for u, v, weight in board['edges']))
+
+        status, bet = await self.request('POST', '/bet', {'bid': 10, 'starting_node': nodes[0]}, token)
+        self.assertEqual(status, 200)
+        self.assertEqual(sorted(map(int, bet['scores'])), nodes)
+
+        status, result = await self.request('POST', '/settle', {'ending_node': nodes[-1]}, token)
+        self.assertEqual(status, 200)
+        self.assertEqual(result['path'][0], nodes[0])
+        self.assertEqual(result['path'][-1], nodes[-1])
+        self.assertEqual(result['balance'], 100 + result['score'])
+
+        self.assertEqual(self.server.sessions.get(token).balance, result['balance'])
+
+        status, health = await self.request('GET', '/health')
+        self.assertEqual(health, {'status': 'ok', 'sessions': 1})
+
+    async def test_errors(self):
+        """Test the errors of the requests are answered with their status"""
+        status, _ = await self.request('POST', '/login', {'username': 'Femi', 'password': 'wrong'})
+        self.assertEqual(status, 401)
+        status, _ = await self.request('POST', '/rounds', token='unknown')
+        self.assertEqual(status, 401)
+        status, _ = await self.request('GET', '/login')
+        self.assertEqual(status, 405)
+        status, _ = await self.request('GET', '/unknown')
+        self.assertEqual(status, 404)
+        status, _ = await self.request('POST', '/login', raw=b'{not json')
+        self.assertEqual(status, 400)
+        status, _ = await self.request('POST', '/login', {'username': 'Femi'})
+        self.assertEqual(status, 400)
+
+        token = (await self.request('POST', '/login', {'username': 'Femi', 'password': 'password'}))[1]['token']
+        status, _ = await self.request('POST', '/bet', {'bid': 10, 'starting_node': 0}, token)
+        self.assertEqual(status, 409)
+        await self.request('POST', '/rounds', token=token)
+        status, error = await self.request('POST', '/bet', {'bid': 1000, 'starting_node': 0}, token)
+        self.assertEqual(status, 400)
+        self.assertIn('bid', error['error'])
+        status, _ = await self.request('POST', '/settle', {'ending_node': 1}, token)
+        self.assertEqual(status, 400)
+
+    async def test_unreachable_ending_node(self):
+        """Test a round settled on an unreachable node is answered with a null distance"""
+        token = (await self.request('POST', '/login', {'username': 'Femi', 'password': 'password'}))[1]['token']
+        nodes = (await self.request('POST', '/rounds', token=token))[1]['nodes']
+        # Add a node without edges to the board of the round
+        game = self.server.sessions.get(token).round.game
+        game.generate_random_nodes(num=1)
+        await self.request('POST', '/bet', {'bid': 10, 'starting_node': nodes[0]}, token)
+        status, result = await self.request('POST', '/settle', {'ending_node': max(game.get_nodes())}, token)
+        self.assertEqual(status, 200)
+        self.assertEqual((result['distance'], result['path'], result['won']), (None, [], False))
+
+    async def test_line_too_long(self):
+        """Test a header line longer than the limit of the stream is answered with a 400 and the connection is closed"""
+        self.writer.write(b'GET /health HTTP/1.1\r\nX-Padding: ' + b'a' * 2 ** 17 + b'\r\n\r\n')
+        await self.writer.drain()
+        self.assertEqual(int((await self.reader.readline()).split()[1]), 400)
+        headers = []
+        while (line := await self.reader.readline()) != b'\r\n':
+            headers.append(line.strip().lower())
+        self.assertIn(b'connection: close', headers)
+
+    async def test_expired_session(self):
+        """Test the token of an evicted session is rejected"""
+        token = (await self.request('POST', '/login', {'username': 'Femi', 'password': 'password'}))[1]['token']
+        self.server.sessions.ttl = 1e-9
+        status, _ = await self.request('POST', '/rounds', token=token)
+        self.assertEqual(status, 401)
+        self.assertEqual(len(self.server.sessions), 0)
+
+
+class TestGameServerProcessPool(TestGameServer):
+    # Generate the games in a worker process
+    processes = 1
+
+    async def test_big_board_distances(self):
+        """Test the distances from the starting node of a big board are computed in the process pool"""
+        self.server.board_size = 300
+        token = (await self.request('POST', '/login', {'username': 'Femi', 'password': 'password'}))[1]['token']
+        nodes = (await self.request('POST', '/rounds', token=token))[1]['nodes']
+        game = self.server.sessions.get(token).round.game
+        self.assertFalse(game.has_distances_from(nodes[0]))
+
+        with patch.object(GraphGame, 'set_distances_from', autospec=True, side_effect=GraphGame.set_distances_from) as mock_set:
+            status, _ = await self.request('POST', '/bet', {'bid': 10, 'starting_node': nodes[0]}, token)
+            self.assertEqual(status, 200)
+            await self.request('POST', '/settle', {'ending_node': nodes[-1]}, token)
+        mock_set.assert_called_once_with(game, nodes[0], ANY)
+        self.assertTrue(game.has_distances_from(nodes[0]))
+
+
+
+class TestServe(unittest.IsolatedAsyncioTestCase):
+    async def test_stops_on_sigterm(self):
+        """Test serve stops on SIGTERM and shuts the pools of the server down"""
+        backend = InMemoryBackend()
+        backend.initialize()
+        server = GameServer(GameService(backend, RoundPool(depth=0)), processes=1)
+        # Start a worker process, which has to be shut down with the server
+        await asyncio.get_running_loop().run_in_executor(server.game_executor, abs, -1)
+
+        await asyncio.wait_for(serve('127.0.0.1', 0, server, lambda listener: signal.raise_signal(signal.SIGTERM)), 30)
+        for executor in (server.game_executor, server.db_executor):
+            with self.assertRaises(RuntimeError):
+                executor.submit(abs, -1)
+
+
+if __name__ == '__main__':
+    unittest.main()
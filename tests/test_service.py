@@ -0,0 +1,67 @@
+import unittest
+
+from graph_game.database.backends import InMemoryBackend
+from graph_game.game.game_logic import GraphGame
+from graph_game.game.round_pool import RoundPool
+from graph_game.game.service import GameService
+
+
+class TestGameService(unittest.TestCase):
+    def setUp(self):
+        """Create a service storing the players in memory and building every game on demand"""
+        self.backend = InMemoryBackend()
+        self.backend.initialize()
+        self.backend.register_player('Femi', 'password', 100)
+        self.service = GameService(self.backend, RoundPool(depth=0))
+
+    def play(self, bid=10):
+        """Play a round of Femi from the first to the last node"""
+        round = self.service.start_round('Femi')
+        nodes = round.game.get_nodes()
+        scores = self.service.place_bet(round, bid, nodes[0])
+        return round, scores, self.service.settle(round, nodes[-1])
+
+    def test_round(self):
+        """Test a round is resolved, applied to the balance and logged"""
+        round, scores, (result, balance) = self.play()
+        self.assertEqual(len(scores), len(round.game.get_nodes()))
+        self.assertEqual(result, round.game.resolve_round())
+        self.assertEqual(result.score > 0, result.won)
+        self.assertEqual(balance, 100 + result.score)
+        self.assertEqual(self.backend.get_balance('Femi'), balance)
+        self.assertEqual(len(self.backend.get_player_history('Femi')), 1)
+
+    def test_invalid_moves(self):
+        """Test the invalid moves of a round are rejected"""
+        self.assertRaises(ValueError, self.service.start_round, 'Alex')
+        round = self.service.start_round('Femi')
+        start = round.game.get_nodes()[0]
+        self.assertRaises(ValueError, self.service.settle, round, start)
+        self.assertRaises(TypeError, self.service.place_bet, round, '10', start)
+        self.assertRaises(ValueError, self.service.place_bet, round, 0, start)
+        self.assertRaises(ValueError, self.service.place_bet, round, 101, start)
+        self.assertRaises(ValueError, self.service.place_bet, round, 10, -1)
+        self.service.place_bet(round, 10, start)
+        self.assertRaises(ValueError, self.service.place_bet, round, 10, start)
+        self.assertRaises(ValueError, self.service.settle, round, start)
+        self.service.settle(round, round.game.get_nodes()[-1])
+        self.assertRaises(ValueError, self.service.settle, round, round.game.get_nodes()[-1])
+        self.assertEqual(len(self.backend.get_player_history('Femi')), 1)
+
+    def test_top_up(self):
+        """Test a player without balance is topped up when a round starts"""
+        self.backend.update_balance('Femi', 0)
+        round = self.service.start_round('Femi')
+        self.assertTrue(round.topped_up)
+        self.assertEqual(self.backend.get_balance('Femi'), GameService.TOP_UP_BALANCE)
+        self.assertFalse(self.service.start_round('Femi').topped_up)
+
+    def test_games_from_pool(self):
+        """Test the rounds are played on the games of the round pool"""
+        game = GraphGame.random_start()
+        self.service.round_pool = RoundPool(depth=0, factory=lambda: game)
+        self.assertIs(self.service.start_round('Femi').game, game)
+
+
+if __name__ == '__main__':
+    unittest.main()
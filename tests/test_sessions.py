@@ -0,0 +1,81 @@
+import asyncio
+import unittest
+
+from graph_game.game.service import Round
+from graph_game.sessions import SessionManager
+
+
+class FakeClock:
+    """A clock advanced by hand"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestSessionManager(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.sessions = SessionManager(ttl=10, clock=self.clock)
+
+    def test_create_and_get(self):
+        """Test a session is found by its token"""
+        token = self.sessions.create('Femi', 100)
+        session = self.sessions.get(token)
+        self.assertEqual((session.username, session.balance), ('Femi', 100))
+        self.assertIsNone(self.sessions.get('unknown'))
+        self.assertNotEqual(self.sessions.create('Femi', 100), token)
+        self.assertEqual(len(self.sessions), 2)
+
+    def test_eviction(self):
+        """Test the sessions idle for longer than the TTL are evicted, the recently used ones are kept"""
+        idle = self.sessions.create('Femi', 100)
+        active = self.sessions.create('Tom', 50)
+        self.clock.now = 8
+        self.assertIsNotNone(self.sessions.get(active))
+        self.clock.now = 12
+        self.assertEqual(self.sessions.evict_expired(), 1)
+        self.assertIsNone(self.sessions.get(idle))
+        self.assertIsNotNone(self.sessions.get(active))
+        self.clock.now = 30
+        self.assertIsNone(self.sessions.get(active))
+        self.assertEqual((len(self.sessions), self.sessions.evicted), (0, 2))
+
+    def test_remove(self):
+        """Test a removed session is not found"""
+        token = self.sessions.create('Femi', 100)
+        self.sessions.remove(token)
+        self.sessions.remove(token)
+        self.assertIsNone(self.sessions.get(token))
+
+    def test_pending_bet(self):
+        """Test the pending bet is the bid of the round until it is settled"""
+        session = self.sessions.get(self.sessions.create('Femi', 100))
+        self.assertIsNone(session.pending_bet)
+        session.round = Round('Femi', game=None, bid=10)
+        self.assertEqual(session.pending_bet, 10)
+        session.round.result = object()
+        self.assertIsNone(session.pending_bet)
+
+    def test_evict_periodically(self):
+        """Test the background task evicts the expired sessions"""
+        async def run():
+            task = asyncio.create_task(self.sessions.evict_periodically(interval=0.001))
+            self.clock.now = 20
+            await asyncio.sleep(0.01)
+            task.cancel()
+
+        self.sessions.create('Femi', 100)
+        asyncio.run(run())
+        self.assertEqual(len(self.sessions), 0)
+
+    def test_invalid_ttl(self):
+        """Test a non-positive TTL raises ValueError"""
+        with self.assertRaises(ValueError):
+            SessionManager(ttl=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
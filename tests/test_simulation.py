@@ -0,0 +1,61 @@
+import os
+import subprocess
+import sys
+import unittest
+
+import numpy as np
+
+from graph_game.game import simulation
+from graph_game.game.simulation import SimulationConfig
+
+
+class TestSimulation(unittest.TestCase):
+    def test_report(self):
+        """Test the report aggregates the simulated rounds"""
+        report = simulation.simulate(SimulationConfig(rounds=50, chunk_size=20, workers=1))
+        self.assertEqual(report.rounds, 50)
+        self.assertEqual(report.total_bid, 500)
+        self.assertTrue(0 <= report.wins <= 50)
+        self.assertAlmostEqual(report.house_edge, -report.total_payout / 500)
+        self.assertEqual(list(report.score_percentiles), list(simulation.PERCENTILES))
+        self.assertGreaterEqual(report.score_percentiles[1], -10)
+
+    def test_seeded_workers(self):
+        """Test a seeded simulation gives the same report regardless of the number of workers"""
+        config = SimulationConfig(rounds=40, chunk_size=10, seed=7, workers=1)
+        report = simulation.simulate(config)
+        self.assertEqual(simulation.simulate(config), report)
+        self.assertEqual(simulation.simulate(config._replace(workers=2)), report)
+        self.assertNotEqual(simulation.simulate(config._replace(seed=8)), report)
+
+    def test_strategies(self):
+        """Test the strategies never choose the starting node"""
+        scores = np.array([5, 100, 20, 7])
+        distances = np.array([0., 9., 4., 1.])
+        rng = np.random.default_rng(0)
+        self.assertEqual(simulation.safest_strategy(scores, distances, 0, rng), 3)
+        self.assertEqual(simulation.riskiest_strategy(scores, distances, 0, rng), 1)
+        choices = {simulation.random_strategy(scores, distances, 2, rng) for _ in range(100)}
+        self.assertEqual(choices, {0, 1, 3})
+
+    def test_invalid_config(self):
+        """Test unknown strategies and non-positive sizes are rejected"""
+        with self.assertRaises(ValueError):
+            simulation.simulate(SimulationConfig(strategy='martingale'))
+        with self.assertRaises(ValueError):
+            simulation.simulate(SimulationConfig(rounds=0))
+        with self.assertRaises(ValueError):
+            simulation.simulate(SimulationConfig(workers=0))
+
+    def test_headless(self):
+        """Test the simulation does not import tkinter, matplotlib or networkx"""
+        code = ('import sys\n'
+                'from graph_game.game import simulation\n'
+                'simulation.simulate(simulation.SimulationConfig(rounds=5, workers=1))\n'
+                'sys.exit(any(name in sys.modules for name in ("tkinter", "matplotlib", "networkx")))')
+        project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        self.assertEqual(subprocess.run([sys.executable, '-c', code], cwd=project_root).returncode, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
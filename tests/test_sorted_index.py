@@ -0,0 +1,44 @@
+import unittest
+
+from graph_game.data_structures.sorted_index import SortedIndex
+
+
+class TestSortedIndex(unittest.TestCase):
+    def setUp(self):
+        """Index the integers from 1 to 1500 in random order"""
+        self.index = SortedIndex(reversed(range(1, 1501)))
+
+    def test_sequence(self):
+        """Test the index is a sorted sequence of its values"""
+        self.assertEqual(list(self.index), list(range(1, 1501)))
+        self.assertEqual((len(self.index), self.index[0], self.index[-1]), (1500, 1, 1500))
+        self.assertIn(700, self.index)
+        self.assertNotIn(0, self.index)
+        self.assertNotIn(1501, self.index)
+
+    def test_position(self):
+        """Test the position of a value, ValueError for a missing value"""
+        self.assertEqual(self.index.position(1), 0)
+        self.assertEqual(self.index.position(1500), 1499)
+        with self.assertRaises(ValueError):
+            self.index.position(2000)
+
+    def test_between(self):
+        """Test the values between two inclusive bounds"""
+        self.assertEqual(self.index.between(10, 15), list(range(10, 16)))
+        self.assertEqual(self.index.between(10, 15, limit=2), [10, 11])
+        self.assertEqual(self.index.between(1490, 2000), list(range(1490, 1501)))
+        self.assertEqual(self.index.between(20, 10), [])
+
+    def test_prefix(self):
+        """Test the prefix search matches a scan of the decimal strings"""
+        for prefix in ('', '1', '12', '149', '15', '1500', '2', '9', '0', 'x', ' 12 '):
+            expected = [value for value in range(1, 1501) if str(value).startswith(prefix.strip())]
+            self.assertEqual(self.index.prefix(prefix), expected)
+            self.assertEqual(self.index.prefix(prefix, limit=5), expected[:5])
+        self.assertEqual(SortedIndex([0, 5, 10]).prefix('0'), [0])
+        self.assertEqual(SortedIndex([]).prefix('1'), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
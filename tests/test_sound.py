@@ -0,0 +1,91 @@
+import sys
+import unittest
+from unittest.mock import MagicMock, patch
+
+from graph_game.sound import AudioService
+
+
+class TestAudioService(unittest.TestCase):
+    def test_disabled(self):
+        """Test a disabled service never imports pygame and every call is a no-op"""
+        with patch.dict(sys.modules, {'pygame': None}):
+            audio = AudioService(enabled=False)
+            audio.start()
+            self.assertTrue(audio.wait(0))
+            audio.set_music(False)
+            self.assertFalse(audio.play('Happy_Sound1'))
+        self.assertFalse(audio.available)
+
+    def test_without_pygame(self):
+        """Test the service degrades to a no-op if pygame cannot be imported"""
+        with patch.dict(sys.modules, {'pygame': None}):
+            audio = AudioService()
+            with self.assertLogs('graph_game.sound', level='INFO'):
+                audio.start()
+                self.assertTrue(audio.wait(5))
+        self.assertFalse(audio.available)
+        self.assertFalse(audio.play('Happy_Sound1'))
+
+    def test_sounds_decoded_in_background(self):
+        """Test the clips are decoded by the background thread and played from the cache"""
+        pygame = MagicMock()
+        with patch.dict(sys.modules, {'pygame': pygame}):
+            audio = AudioService(clips=('Happy_Sound1',))
+            audio.set_music(False)
+            audio.start()
+            self.assertTrue(audio.wait(5))
+
+        pygame.mixer.init.assert_called_once()
+        pygame.mixer.music.play.assert_called_once_with(-1)
+        # The music switched off while loading stays paused
+        pygame.mixer.music.pause.assert_called_once()
+        self.assertTrue(audio.play('Happy_Sound1'))
+        pygame.mixer.Sound.return_value.play.assert_called_once()
+        self.assertFalse(audio.play('Happy_Sound2'))
+
+        audio.set_music(True)
+        pygame.mixer.music.unpause.assert_called_once()
+
+    def test_mixer_init_fails(self):
+        """Test the service degrades to a no-op if the mixer cannot open an audio device"""
+        pygame = MagicMock()
+        pygame.mixer.init.side_effect = RuntimeError('No available audio device')
+        with patch.dict(sys.modules, {'pygame': pygame}):
+            audio = AudioService(clips=('Happy_Sound1',))
+            with self.assertLogs('graph_game.sound', level='INFO'):
+                audio.start()
+                self.assertTrue(audio.wait(5))
+            audio.set_music(False)
+        self.assertFalse(audio.available)
+        self.assertFalse(audio.play('Happy_Sound1'))
+        pygame.mixer.Sound.assert_not_called()
+        pygame.mixer.music.pause.assert_not_called()
+
+    def test_mixer_not_initialised(self):
+        """Test the service degrades to a no-op if the mixer returns without initialising"""
+        pygame = MagicMock()
+        pygame.mixer.get_init.return_value = None
+        with patch.dict(sys.modules, {'pygame': pygame}):
+            audio = AudioService()
+            with self.assertLogs('graph_game.sound', level='INFO'):
+                audio.start()
+                self.assertTrue(audio.wait(5))
+        self.assertFalse(audio.available)
+        pygame.mixer.music.play.assert_not_called()
+
+    def test_playback_fails(self):
+        """Test a failing clip or soundtrack is logged rather than raised to the caller"""
+        pygame = MagicMock()
+        pygame.mixer.Sound.return_value.play.side_effect = RuntimeError('mixer not initialized')
+        pygame.mixer.music.pause.side_effect = RuntimeError('mixer not initialized')
+        with patch.dict(sys.modules, {'pygame': pygame}):
+            audio = AudioService(clips=('Happy_Sound1',))
+            audio.start()
+            self.assertTrue(audio.wait(5))
+        with self.assertLogs('graph_game.sound', level='WARNING'):
+            self.assertFalse(audio.play('Happy_Sound1'))
+            audio.set_music(False)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+
+from graph_game.data_structures.paged_sequence import PagedSequence
+from graph_game.table import RowWindow
+
+
+class TestRowWindow(unittest.TestCase):
+    def setUp(self):
+        """Create a window of 3 rows over 10 rows"""
+        self.window = RowWindow(3)
+        self.rows = [(i, f'player{i}') for i in range(10)]
+        self.window.set_rows(self.rows)
+
+    def test_changes_only_changed_slots(self):
+        """Test only the slots whose rows changed are reported"""
+        self.assertEqual(self.window.changes(), [(0, (0, 'player0')), (1, (1, 'player1')), (2, (2, 'player2'))])
+        self.assertEqual(self.window.changes(), [])
+
+        self.rows[1] = (1, 'renamed')
+        self.window.set_rows(list(self.rows))
+        self.assertEqual(self.window.changes(), [(1, (1, 'renamed'))])
+
+        self.window.set_rows(self.rows[:1])
+        self.assertEqual(self.window.changes(), [(1, None), (2, None)])
+
+    def test_scrolling(self):
+        """Test the window is clamped within the rows and only the visible rows are read"""
+        read = []
+
+        class Rows(list):
+            def __getitem__(self, idx):
+                read.append(idx)
+                return super().__getitem__(idx)
+
+        self.window.set_rows(Rows(self.rows))
+        self.window.scroll_to(5)
+        self.assertEqual([values[0] for _, values in self.window.changes()], [5, 6, 7])
+        self.assertEqual(read, [slice(5, 8)])
+        self.assertEqual(self.window.fractions(), (0.5, 0.8))
+
+        self.window.scroll_by(100)
+        self.assertEqual(self.window.first, 7)
+        self.window.scroll_by(-100)
+        self.assertEqual(self.window.first, 0)
+
+        self.window.set_rows(self.rows[:2])
+        self.assertEqual(self.window.fractions(), (0.0, 1.0))
+
+    def test_overcounted_rows(self):
+        """Test a window beyond the rows found by a paged sequence scrolls back within them"""
+        rows = PagedSequence(lambda offset, limit: self.rows[offset:offset + limit], length=40, page_size=4)
+        self.window.set_rows(rows)
+        self.window.scroll_to(30)
+        self.assertEqual([values[0] for _, values in self.window.changes()], [7, 8, 9])
+        self.assertEqual((self.window.first, len(rows)), (7, 10))
+
+    def test_invalid_height(self):
+        """Test non-positive heights raise an error"""
+        with self.assertRaises(ValueError):
+            RowWindow(0)
+
+
+if __name__ == '__main__':
+    unittest.main()